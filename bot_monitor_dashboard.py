@@ -13,14 +13,45 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 from datetime import datetime, timedelta, date
+from concurrent.futures import wait
 import time
 import logging
 import gc
 import traceback
 from pathlib import Path
+from collections import OrderedDict
 from typing import Dict, List, Optional, Union, Any
-from data_processing.processors import process_data_for_dashboard, create_hourly_matrix
-from secure_db_connection import get_flow_data, test_connection
+from data_processing.processors import (
+    process_data_for_dashboard, create_hourly_matrix, expand_run_hours, runs_overlapping_day, normalize_filters,
+    filter_cache_key
+)
+from data_processing.incremental import update_hourly_matrix
+from data_processing.indexes import FilterIndex
+from data_processing.drilldown import CellRunIndex, DrillDownCache, format_run_details
+from data_processing.durations import DailyDurationSketches, build_duration_sketches, summarize_durations
+from data_processing.schedules import ScheduleTracker, find_schedule_gaps
+from data_processing.batch import DailyMatrixCache
+from data_processing.engines import get_engine
+from data_processing.concurrency import THROUGHPUT_WINDOW, summarize_owner_load
+from data_processing.success_rates import ROLLING_WINDOWS, SuccessCounters
+from data_processing.baselines import BASELINE_WINDOWS, HourlyBaselines, deviation_matrix
+from data_processing.memo import VersionedMemo
+from data_processing.sla import (
+    QUERY_ORIGINS, SLA_FILE, SLA_PERIODS, combine_schedules, compute_sla_outcomes, evaluation_time, infer_schedules,
+    load_declared_schedules, sla_report
+)
+from data_processing.aggregates import (
+    aggregate_filter_values, aggregate_status_counts, label_aggregates, matrix_from_aggregates
+)
+from data_storage.sources import SOURCE_COLUMN
+from data_storage.snapshots import BACKGROUND_LOADS, Snapshot, load_snapshot, save_snapshot
+from data_storage.freshness import (
+    FRESHNESS_CRITICAL_MINUTES, FRESHNESS_WARNING_MINUTES, data_version, derive_version, freshness_metrics,
+    get_freshness
+)
+from secure_db_connection import (
+    ODBC_AVAILABLE, get_cell_runs, get_flow_data, get_hourly_aggregates, get_source_status, test_connection
+)
 
 # Configure logging
 logging.basicConfig(
@@ -55,9 +86,21 @@ STATUS_EMOJIS = {
     "Suspended": "🔵",  # Blue circle for suspended
     "Skipped": "⚪",    # White circle for skipped (like No Run)
     "Error": "🔴",      # Same as Failed
-    "TimedOut": "🔴"    # Same as Failed
+    "TimedOut": "🔴",   # Same as Failed
+    "Unusual Failure": "🚨",  # Baseline comparison: failed where the hour usually succeeds
+    "Missing Run": "❓",      # Baseline comparison: no run where the hour usually has one
+    "Unusual Volume": "📈"    # Baseline comparison: far more or fewer runs than usual
 }
 
+# Sidebar indicator per data freshness level
+FRESHNESS_EMOJIS = {"fresh": "🟢", "warning": "🟠", "critical": "🔴", "unknown": "⚪"}
+
+# Seconds between reruns while a cold start shows the persisted snapshot
+WARM_START_POLL_SECONDS = 1.0
+
+# Number of filter combinations whose matrix is kept per data snapshot
+MATRIX_CACHE_SIZE = 32
+
 # Function to get emoji for status with case-insensitive matching
 def get_status_emoji(status):
     """Get emoji for a status value with fallback and case-insensitive matching"""
@@ -178,7 +221,7 @@ def safe_dashboard_reload() -> None:
         except:
             pass
         
-def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True):
+def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True, changed_cells=None):
     """
     Display the matrix as a styled table in Streamlit
     
@@ -188,6 +231,8 @@ def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True):
     - display_names: List of display names (flow identifiers) to show in the matrix
     - hours: List of hours (0-23) to display as columns in the matrix
     - enable_grouping: Whether to enable project grouping for visual organization (default: True)
+    - changed_cells: Optional set of (display_name, hour) cells to highlight as changed
+                     since the previous refresh
     
     Returns:
         None - Displays the matrix directly in the Streamlit interface
@@ -203,6 +248,7 @@ def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True):
         
         # Create the data rows with emojis - using list comprehension for better performance
         data_rows = []
+        row_names = []
         for display_name in sorted(display_names):
             try:
                 # Split the display name into its components
@@ -228,6 +274,7 @@ def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True):
                     row.append(emoji)
                 
                 data_rows.append(row)
+                row_names.append(display_name)
             except Exception as row_error:
                 logger.error(f"Error processing row {display_name}: {row_error}")
                 continue
@@ -294,9 +341,21 @@ def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True):
         </style>
         """, unsafe_allow_html=True)
         
+        # Highlight cells whose status changed since the previous refresh
+        matrix_data = matrix_df
+        if changed_cells:
+            highlight = pd.DataFrame('', index=matrix_df.index, columns=matrix_df.columns)
+            row_positions = {name: idx for idx, name in enumerate(row_names)}
+            hour_positions = {hour: 3 + idx for idx, hour in enumerate(hours)}
+            for display_name, hour in changed_cells:
+                if display_name in row_positions and hour in hour_positions:
+                    highlight.iat[row_positions[display_name], hour_positions[hour]] = 'background-color: #fff3cd'
+            matrix_data = matrix_df.style.apply(lambda _: highlight, axis=None)
+            st.caption(f"Highlighted: {len(changed_cells)} cells changed since the last refresh")
+        
         # Display the dataframe with settings
         st.dataframe(
-            matrix_df,
+            matrix_data,
             column_config=column_config,
             height=display_height,
             use_container_width=True,
@@ -319,7 +378,7 @@ def display_matrix(bot_hour_status, display_names, hours, enable_grouping=True):
         logger.error(f"Error displaying matrix: {e}", exc_info=True)
         st.error("Error displaying the matrix. Please check logs for details.")
 
-def load_data(use_csv=False):
+def load_data(use_csv=False, use_store=False, refresh=False):
     """Load data with proper error handling and status updates"""
     try:
         # Display loading status
@@ -328,7 +387,7 @@ def load_data(use_csv=False):
         status_placeholder.info("Loading data...")
         
         # Load data from database or CSV
-        df = get_flow_data(use_csv=use_csv)
+        df = get_flow_data(use_csv=use_csv, use_store=use_store, refresh=refresh)
         
         if df is None or df.empty:
             status_placeholder.error("No data available. Please check data source.")
@@ -347,6 +406,100 @@ def load_data(use_csv=False):
         st.error(f"Failed to load data: {str(e)}")
         return None
 
+def load_data_warm_start(selected_date, use_csv=False, use_store=False):
+    """
+    Load data for a new session, showing the persisted snapshot while it loads
+    
+    The fetch runs in a background thread shared by every session that
+    starts meanwhile. Until it finishes, the last saved snapshot of the
+    selected date is displayed, labelled with its age, and the page reruns
+    every WARM_START_POLL_SECONDS; without a snapshot the page waits as before.
+    
+    Parameters:
+    - selected_date: Date selected in the sidebar
+    - use_csv: Whether to use CSV data
+    - use_store: Whether to use the local run history store
+    
+    Returns:
+        DataFrame or None - The loaded data (reruns the page instead while the snapshot is shown)
+    """
+    key = ('flow_data', use_csv, use_store)
+    load = BACKGROUND_LOADS.submit(key, lambda: get_flow_data(use_csv=use_csv, use_store=use_store))
+    if not load.done():
+        if 'warm_snapshot' not in st.session_state:
+            st.session_state.warm_snapshot = load_snapshot(selected_date)
+        snapshot = st.session_state.warm_snapshot
+        if snapshot is not None and snapshot.selected_date == selected_date:
+            display_snapshot(snapshot)
+            time.sleep(WARM_START_POLL_SECONDS)
+            st.rerun()
+        with st.spinner("Loading data..."):
+            wait([load])
+    
+    BACKGROUND_LOADS.discard(key)
+    st.session_state.warm_started = True
+    st.session_state.pop('warm_snapshot', None)
+    try:
+        df = load.result()
+    except Exception as e:
+        logger.error(f"Background data load failed: {e}")
+        return load_data(use_csv=use_csv, use_store=use_store)
+    if df is None or df.empty:
+        st.error("No data available. Please check data source.")
+        return None
+    logger.info(f"Data loaded in the background with {len(df)} records")
+    return df
+
+def display_snapshot(snapshot):
+    """
+    Display a persisted snapshot, labelled as stale, while fresh data loads
+    
+    Parameters:
+    - snapshot: Snapshot loaded by load_snapshot
+    
+    Returns:
+        None - Displays the snapshot directly in the Streamlit interface
+    """
+    try:
+        newest = (snapshot.freshness or {}).get('max_started')
+        newest_label = f" (newest run {newest[:16].replace('T', ' ')})" if newest else ""
+        st.info(f"⏳ Showing data saved {format_lag(snapshot.age_seconds())} ago{newest_label} "
+                f"while fresh data loads. Filters are available once loading completes.")
+        st.markdown("### Bot Activity Matrix (snapshot)")
+        display_matrix(*snapshot.matrix)
+        display_data_summary(snapshot.summaries)
+    except Exception as e:
+        logger.error(f"Error displaying snapshot: {e}", exc_info=True)
+        st.warning("Snapshot unavailable. Please check logs for details.")
+
+def persist_snapshot(processed_df, matrix, selected_date, snapshot_key, freshness):
+    """
+    Save the unfiltered view of today for the next cold start, once per data snapshot
+    
+    Sessions skip snapshots they already saved; save_snapshot also skips
+    snapshots another session of the process persisted.
+    
+    Parameters:
+    - processed_df: Processed DataFrame of the selected date
+    - matrix: (bot_hour_status, display_names, hours) without filters
+    - selected_date: Date of the data
+    - snapshot_key: Key of the data snapshot (see get_snapshot_key)
+    - freshness: Freshness stamp of the loaded data
+    
+    Returns:
+        None
+    """
+    try:
+        if st.session_state.get('persisted_snapshot_key') == snapshot_key:
+            return
+        if freshness.get('origin') == 'sample':
+            return
+        snapshot = Snapshot(selected_date, processed_df, matrix, summarize_processed_data(processed_df), freshness)
+        if save_snapshot(snapshot, key=snapshot_key):
+            st.session_state.persisted_snapshot_key = snapshot_key
+    except Exception as e:
+        logger.warning(f"Could not persist snapshot: {e}")
+
 def filter_data_by_date(df, selected_date):
     """Filter data for specific date"""
     if df is None or df.empty:
@@ -382,6 +535,757 @@ def filter_data_by_date(df, selected_date):
         logger.error(f"Error filtering data by date: {e}")
         return pd.DataFrame()
 
+def get_snapshot_key(version, selected_date, bucketing='start'):
+    """
+    Key of the matrix input for a date, derived from the data version
+    
+    Parameters:
+        - version: data_version of the loaded data
+        - selected_date: Date the data belongs to
+        - bucketing: 'start' or 'interval' hour bucketing of the matrix input
+    
+    Returns:
+        tuple - Key that changes whenever the matrix or filter inputs change
+    """
+    return (version, selected_date, bucketing)
+
+def get_memo():
+    """
+    Return the session's memo of results derived from the loaded data
+    
+    Returns:
+        VersionedMemo - Results keyed on (data version, name, parameters)
+    """
+    if 'versioned_memo' not in st.session_state:
+        st.session_state.versioned_memo = VersionedMemo()
+    return st.session_state.versioned_memo
+
+def update_once_per_version(name, df, update):
+    """
+    Run an incremental update over df only when the data version changed since its last run
+    
+    Parameters:
+        - name: Session state name of the updated object
+        - df: Full loaded DataFrame
+        - update: Callable taking df
+    
+    Returns:
+        None
+    """
+    version = data_version(df)
+    if st.session_state.get(f"{name}_version") != version:
+        update(df)
+        st.session_state[f"{name}_version"] = version
+
+def get_filter_index(processed_df, snapshot_key):
+    """
+    Return the inverted filter index for the current data snapshot
+    
+    The index is cached in session state and rebuilt only when the snapshot
+    key changes.
+    
+    Parameters:
+        - processed_df: Processed data for the selected date
+        - snapshot_key: Result of get_snapshot_key for processed_df
+    
+    Returns:
+        FilterIndex - Index over processed_df
+    """
+    if st.session_state.get('filter_index_key') != snapshot_key:
+        st.session_state.filter_index = FilterIndex(processed_df)
+        st.session_state.filter_index_key = snapshot_key
+    return st.session_state.filter_index
+
+def get_cell_run_index(processed_df, snapshot_key):
+    """
+    Return the (flow, hour) cell run index for the current data snapshot
+    
+    Parameters:
+        - processed_df: Matrix input for the selected date
+        - snapshot_key: Result of get_snapshot_key for processed_df
+    
+    Returns:
+        CellRunIndex - Index over processed_df
+    """
+    if st.session_state.get('cell_index_key') != snapshot_key:
+        st.session_state.cell_index = CellRunIndex(processed_df)
+        st.session_state.cell_index_key = snapshot_key
+    return st.session_state.cell_index
+
+def display_cell_drilldown(bot_hour_status, display_names, cache_scope, fetch_runs, unfiltered_note=None):
+    """
+    Display the individual runs behind one (flow, hour) matrix cell
+    
+    Runs are fetched only when a cell is selected and kept in an LRU cache
+    of detail pages for the session.
+    
+    Parameters:
+    - bot_hour_status: Displayed matrix (display_name -> hour -> status)
+    - display_names: Flows shown in the matrix
+    - cache_scope: Hashable identifying the data and filters the pages come from
+    - fetch_runs: Callable (display_name, hour) returning the cell's runs
+    - unfiltered_note: Caption shown when the pages ignore some of the active filters
+    
+    Returns:
+        None - Displays the drill-down directly in the Streamlit interface
+    """
+    try:
+        if not display_names:
+            return
+        
+        with st.expander("Cell Drill-Down"):
+            flow = st.selectbox("Flow", sorted(display_names), key='drilldown_flow')
+            statuses = bot_hour_status.get(flow, {})
+            active_hours = [hour for hour, status in statuses.items() if status != "No Run"]
+            if not active_hours:
+                st.info("No runs for this flow on the selected date.")
+                return
+            hour = st.selectbox(
+                "Hour", active_hours, key='drilldown_hour',
+                format_func=lambda h: f"{h:02d}:00 {get_status_emoji(statuses[h])} {statuses[h]}"
+            )
+            
+            if 'drilldown_cache' not in st.session_state:
+                st.session_state.drilldown_cache = DrillDownCache()
+            page = st.session_state.drilldown_cache.get_or_fetch(
+                (cache_scope, flow, hour), lambda: fetch_runs(flow, hour)
+            )
+            st.dataframe(page, use_container_width=True)
+            st.caption(f"{len(page)} runs in {hour:02d}:00-{hour:02d}:59")
+            if unfiltered_note:
+                st.caption(unfiltered_note)
+    except Exception as e:
+        logger.error(f"Error displaying cell drill-down: {e}", exc_info=True)
+        st.warning("Cell drill-down unavailable. Please check logs for details.")
+
+def get_filtered_matrix(processed_df, selected_date, snapshot_key, filter_index, filters, bucketing='start'):
+    """
+    Return the hourly matrix for a filter combination, reusing earlier results
+    
+    The incremental matrix state is only updated when the data snapshot
+    changes; every filter combination seen for the snapshot is cached, so
+    repeating a combination costs nothing.
+    
+    Parameters:
+        - processed_df: Processed data for the selected date
+        - selected_date: Date the data belongs to
+        - snapshot_key: Result of get_snapshot_key for processed_df
+        - filter_index: FilterIndex over processed_df
+        - filters: Result of normalize_filters
+        - bucketing: 'start' or 'interval' (processed_df already expanded by expand_run_hours)
+    
+    Returns:
+        tuple - ((bot_hour_status, display_names, hours), changed_cells)
+    """
+    matrix_cache = st.session_state.get('matrix_cache')
+    if matrix_cache is None or matrix_cache['snapshot'] != snapshot_key:
+        # Update only the cells touched by new or changed runs
+        changed_cells = set()
+        try:
+            previous_state = None
+            if st.session_state.get('matrix_state_date') == (selected_date, bucketing):
+                previous_state = st.session_state.get('matrix_state')
+            matrix_state, changed_cells = update_hourly_matrix(previous_state, processed_df)
+            st.session_state.matrix_state = matrix_state
+            st.session_state.matrix_state_date = (selected_date, bucketing)
+        except Exception as state_error:
+            logger.warning(f"Incremental matrix update failed: {state_error}")
+            st.session_state.matrix_state = None
+        matrix_cache = {'snapshot': snapshot_key, 'entries': OrderedDict(), 'changed_cells': changed_cells}
+        st.session_state.matrix_cache = matrix_cache
+    
+    cache_key = filter_cache_key(filters)
+    entries = matrix_cache['entries']
+    if cache_key in entries:
+        entries.move_to_end(cache_key)
+        return entries[cache_key], matrix_cache['changed_cells']
+    
+    projects, statuses, owners, triggers = (
+        filters['automation_project'], filters['taskstatus'], filters['owner'], filters['trigger_group']
+    )
+    matrix = None
+    matrix_state = st.session_state.get('matrix_state')
+    if matrix_state is not None and triggers is None:
+        try:
+            matrix = matrix_state.to_matrix(projects, statuses, selected_owner=owners)
+        except Exception as matrix_error:
+            logger.warning(f"Incremental matrix render failed, rebuilding: {matrix_error}")
+    if matrix is None:
+        matrix = create_hourly_matrix(
+            processed_df,
+            projects,
+            statuses,
+            selected_owner=owners,
+            selected_trigger=triggers,
+            filter_index=filter_index
+        )
+    
+    entries[cache_key] = matrix
+    while len(entries) > MATRIX_CACHE_SIZE:
+        entries.popitem(last=False)
+    return matrix, matrix_cache['changed_cells']
+
+def display_aggregated_matrix(selected_date, refresh=False):
+    """
+    Display the matrix from hourly cells aggregated by the database
+    
+    Only flows x 24 per-status counts are transferred instead of every run;
+    sections that need individual runs are not shown in this mode.
+    
+    Parameters:
+    - selected_date: Date to display
+    - refresh: Bypass the query result cache
+    
+    Returns:
+        bool - True if the matrix was displayed, False if the caller should load raw runs instead
+    """
+    try:
+        aggregates = get_hourly_aggregates(selected_date, refresh=refresh)
+    except Exception as e:
+        logger.warning(f"Database aggregation unavailable: {e}")
+        st.info("Database aggregation unavailable - loading individual runs instead.")
+        return False
+    
+    try:
+        labeled = label_aggregates(aggregates)
+        if labeled.empty:
+            st.warning(f"No data available for selected date: {selected_date}")
+            return True
+        
+        # Filter controls (an empty selection shows everything)
+        values = aggregate_filter_values(labeled)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            selected_projects = st.multiselect("Projects", values['automation_project'],
+                                               help="Leave empty to show all projects")
+        with col2:
+            selected_owners = st.multiselect("Owners", values['owner'],
+                                             help="Leave empty to show all service accounts")
+        with col3:
+            selected_statuses = st.multiselect("Statuses", values['taskstatus'],
+                                               help="Leave empty to show all statuses")
+        with col4:
+            selected_triggers = st.multiselect("Trigger Types", values['trigger_group'],
+                                               help="Leave empty to show all trigger types")
+        
+        bot_hour_status, display_names, hours = matrix_from_aggregates(
+            labeled, selected_projects, selected_statuses, selected_owner=selected_owners,
+            selected_trigger=selected_triggers
+        )
+        
+        st.markdown("### Bot Activity Matrix")
+        st.caption(f"Aggregated in the database: {len(labeled)} cell rows for {labeled['display_name'].nunique()} flows")
+        display_matrix(bot_hour_status, display_names, hours)
+        
+        # Drill-downs run a narrow query per cell for the flow's database keys
+        flow_keys = labeled.dropna(subset=['display_name']).drop_duplicates(['display_name', 'flowowner', 'flowname'])
+        flow_keys = flow_keys.groupby('display_name')[['flowowner', 'flowname']].apply(lambda g: list(g.itertuples(index=False)))
+        
+        def fetch_runs(display_name, hour):
+            pages = [get_cell_runs(owner, name, selected_date, hour) for owner, name in flow_keys.get(display_name, [])]
+            return format_run_details(pd.concat(pages, ignore_index=True) if pages else None)
+        
+        display_cell_drilldown(
+            bot_hour_status, display_names,
+            ('database', selected_date, st.session_state.get('refresh_count', 0)), fetch_runs,
+            unfiltered_note="Runs are listed regardless of the Status and Trigger Type filters."
+            if selected_statuses or selected_triggers else None
+        )
+        
+        st.markdown("### Data Summary")
+        st.subheader("Status Distribution")
+        st.bar_chart(aggregate_status_counts(labeled))
+        return True
+    except Exception as e:
+        logger.error(f"Error displaying aggregated matrix: {e}", exc_info=True)
+        st.warning("Aggregated matrix unavailable. Please check logs for details.")
+        return True
+
+def summarize_processed_data(processed_df):
+    """
+    Compute the values shown in the data summary section
+    
+    Parameters:
+    - processed_df: Processed DataFrame of the selected date
+    
+    Returns:
+        dict - status_counts, project_counts (top 10) and success_rate (JSON serializable)
+    """
+    if 'success_rate' in processed_df.columns:
+        success_rate = processed_df['success_rate'].mean()
+    else:
+        success_rate = processed_df['wassuccessful'].mean() * 100
+    return {
+        'status_counts': {str(k): int(v) for k, v in processed_df['taskstatus'].value_counts().items()},
+        'project_counts': {str(k): int(v) for k, v in processed_df['automation_project'].value_counts().head(10).items()},
+        'success_rate': float(success_rate),
+    }
+
+def display_data_summary(summaries):
+    """
+    Display status distribution, top projects and overall success rate
+    
+    Parameters:
+    - summaries: Output of summarize_processed_data
+    
+    Returns:
+        None - Displays the summary directly in the Streamlit interface
+    """
+    st.markdown("### Data Summary")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("Status Distribution")
+        st.bar_chart(pd.Series(summaries['status_counts'], dtype='int64'))
+    
+    with col2:
+        st.subheader("Automation Projects")
+        st.bar_chart(pd.Series(summaries['project_counts'], dtype='int64'))
+    
+    with col3:
+        st.subheader("Success Rate")
+        st.metric("Overall Success Rate", f"{summaries['success_rate']:.1f}%")
+
+def display_daily_overview(df, bucketing='start'):
+    """
+    Display per-day run totals, failures and success rates for the loaded period
+    
+    Daily matrices and summaries are computed in one process-pool batch and
+    cached in session state; later reruns only recompute new days and today.
+    With PROCESSING_ENGINE=duckdb the daily totals are aggregated in DuckDB
+    over the loaded frame instead.
+    
+    Parameters:
+    - df: Full loaded DataFrame
+    - bucketing: 'start' or 'interval' hour bucketing for the daily matrices
+    
+    Returns:
+        None - Displays the overview directly in the Streamlit interface
+    """
+    try:
+        engine = get_engine()
+        if engine.name != 'pandas':
+            summaries = get_memo().get_or_compute(
+                data_version(df), 'daily_summaries', (engine.name, bucketing),
+                lambda: engine.daily_summaries(df, bucketing=bucketing)
+            )
+        else:
+            cache = st.session_state.get('daily_matrices')
+            if cache is None or cache.bucketing != bucketing:
+                cache = DailyMatrixCache(bucketing)
+                st.session_state.daily_matrices = cache
+                st.session_state.pop('daily_matrices_version', None)
+            update_once_per_version('daily_matrices', df, cache.update)
+            summaries = cache.summaries()
+        
+        if summaries.empty:
+            return
+        
+        with st.expander(f"Daily Overview ({len(summaries)} days)"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Success Rate by Day")
+                st.line_chart(summaries['success_rate'])
+            with col2:
+                st.subheader("Failed Runs by Day")
+                st.bar_chart(summaries['failed'])
+            st.dataframe(summaries.sort_index(ascending=False), use_container_width=True)
+    except Exception as e:
+        logger.error(f"Error displaying daily overview: {e}", exc_info=True)
+        st.warning("Daily overview unavailable. Please check logs for details.")
+
+def display_baseline_matrix(df, selected_date, window_days, bot_hour_status, display_names, hours, filters):
+    """
+    Display the matrix with cells that deviate from their same-hour baseline marked
+    
+    Per-day (flow, hour) counts are kept in session state and recounted
+    over the loaded window whenever the data version changes (a refresh,
+    another origin or environment set), so switching the baseline length
+    or date only regroups the compact counts.
+    
+    Parameters:
+    - df: Full loaded DataFrame (the history the baselines are counted from)
+    - selected_date: Date being displayed
+    - window_days: Number of preceding days that form the baseline
+    - bot_hour_status, display_names, hours: Matrix of the selected date
+    - filters: Normalized filters of the matrix
+    
+    Returns:
+        bool - True if the comparison was displayed, False to show the plain matrix
+    """
+    try:
+        # Recounted per data version; a single group-by over the loaded runs
+        if 'hourly_baselines' not in st.session_state:
+            st.session_state.hourly_baselines = HourlyBaselines()
+        baselines = st.session_state.hourly_baselines
+        update_once_per_version('hourly_baselines', df, baselines.rebuild)
+        
+        # Hours of today still to come are not compared, so the comparison also depends on the hour
+        now = datetime.now()
+        comparison = get_memo().get_or_compute(
+            data_version(df), 'baseline_comparison', (selected_date, window_days, now.date(), now.hour),
+            lambda: baselines.compare(selected_date, window_days, now)
+        )
+        if comparison.empty:
+            st.info(f"Not enough history loaded for a {window_days}-day baseline - showing statuses.")
+            return False
+        
+        matrix, names = deviation_matrix(bot_hour_status, display_names, comparison, filters)
+        st.markdown(f"### Bot Activity Matrix (vs. {window_days}-day same-hour baseline)")
+        anomalies = comparison[comparison['display_name'].isin(names) & comparison['anomaly'].notna()]
+        counts = anomalies['anomaly'].value_counts()
+        columns = st.columns(3)
+        for column, label in zip(columns, ["Unusual Failure", "Missing Run", "Unusual Volume"]):
+            with column:
+                st.metric(f"{STATUS_EMOJIS[label]} {label}", int(counts.get(label, 0)))
+        display_matrix(matrix, names, hours)
+        
+        if not anomalies.empty:
+            with st.expander("Anomalous cells"):
+                st.dataframe(anomalies.drop(columns=['owner', 'automation_project']).round(1).set_index('display_name'),
+                             use_container_width=True)
+        return True
+    except Exception as e:
+        logger.error(f"Error displaying baseline comparison: {e}", exc_info=True)
+        st.warning("Baseline comparison unavailable. Please check logs for details.")
+        return False
+
+def display_success_trends(df):
+    """
+    Display success rates over trailing 1h/24h/7d/30d windows
+    
+    Per-flow counters are kept in session state and only the most recent
+    hourly buckets are recounted on each rerun; window rates come from
+    prefix sums over those buckets.
+    
+    Parameters:
+    - df: Full loaded DataFrame
+    
+    Returns:
+        None - Displays the trends directly in the Streamlit interface
+    """
+    try:
+        if 'success_counters' not in st.session_state:
+            st.session_state.success_counters = SuccessCounters()
+        counters = st.session_state.success_counters
+        update_once_per_version('success_counters', df, counters.update)
+        
+        projects = counters.project_rates()
+        if projects.empty:
+            return
+        
+        st.markdown("### Success Rate Trends")
+        columns = st.columns(len(ROLLING_WINDOWS))
+        for column, window in zip(columns, ROLLING_WINDOWS):
+            runs = projects[f"runs_{window}"].sum()
+            successes = (projects[f"runs_{window}"] * projects[f"success_rate_{window}"].fillna(0) / 100).sum()
+            with column:
+                value = f"{successes / runs * 100:.1f}%" if runs else "n/a"
+                st.metric(f"Last {window}", value, help=f"{int(runs)} runs")
+        
+        with st.expander("Success rates by project"):
+            st.dataframe(projects.round(1), use_container_width=True)
+    except Exception as e:
+        logger.error(f"Error displaying success trends: {e}", exc_info=True)
+        st.warning("Success rate trends unavailable. Please check logs for details.")
+
+def display_duration_analytics(df, processed_df, selected_date, baseline_days=7):
+    """
+    Display run duration percentiles for the selected date against each flow's baseline
+    
+    Per-day duration sketches are kept in session state and only rebuilt for
+    new days and today, so reruns merge existing sketches instead of
+    re-sorting a month of durations.
+    
+    Parameters:
+    - df: Full loaded DataFrame (used to maintain the daily sketches)
+    - processed_df: Processed DataFrame for the selected date
+    - selected_date: Date being displayed
+    - baseline_days: Number of preceding days that form the baseline (default: 7)
+    
+    Returns:
+        None - Displays the analytics directly in the Streamlit interface
+    """
+    try:
+        if 'datetimecompleted' not in df.columns:
+            return
+        
+        if 'duration_sketches' not in st.session_state:
+            st.session_state.duration_sketches = DailyDurationSketches()
+        sketches = st.session_state.duration_sketches
+        update_once_per_version('duration_sketches', df, sketches.update)
+        
+        baseline_range = [selected_date - timedelta(days=d) for d in range(1, baseline_days + 1)]
+        summary = summarize_durations(sketches.merged([selected_date]), sketches.merged(baseline_range))
+        if summary.empty:
+            return
+        
+        st.markdown("### Run Durations")
+        regressed = int(summary['regressed'].sum())
+        if regressed:
+            st.warning(f"{regressed} flows are running slower than their {baseline_days}-day baseline")
+        
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.subheader("Per Flow (seconds)")
+            st.dataframe(summary.round(1), use_container_width=True)
+        with col2:
+            st.subheader("p95 by Hour (seconds)")
+            hourly = build_duration_sketches(processed_df, 'hour')
+            st.bar_chart(pd.Series({hour: sketch.quantile(0.95) for hour, sketch in sorted(hourly.items())}))
+    except Exception as e:
+        logger.error(f"Error displaying duration analytics: {e}", exc_info=True)
+        st.warning("Duration analytics unavailable. Please check logs for details.")
+
+def display_schedule_health(df, selected_date):
+    """
+    Display Recurrence flows that are late or have missed expected runs
+    
+    Cadences are inferred once and cached in session state; each rerun only
+    feeds runs newer than those already seen into the tracker.
+    
+    Parameters:
+    - df: Full loaded DataFrame (the month of history the cadences are inferred from)
+    - selected_date: Date whose historical gaps are listed
+    
+    Returns:
+        None - Displays the schedule health directly in the Streamlit interface
+    """
+    try:
+        if 'schedule_tracker' not in st.session_state:
+            st.session_state.schedule_tracker = ScheduleTracker()
+        tracker = st.session_state.schedule_tracker
+        update_once_per_version('schedule_tracker', df, tracker.update)
+        
+        schedules = tracker.evaluate()
+        if schedules.empty:
+            return
+        
+        st.markdown("### Schedule Health")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Scheduled Flows", len(schedules))
+        with col2:
+            st.metric("Late", int((schedules['schedule_status'] == 'late').sum()))
+        with col3:
+            st.metric("Missed", int((schedules['schedule_status'] == 'missed').sum()))
+        
+        overdue = schedules[schedules['schedule_status'] != 'on schedule']
+        if not overdue.empty:
+            st.dataframe(
+                overdue[['flowname', 'interval_minutes', 'last_run', 'next_expected', 'minutes_late', 'missed_runs', 'schedule_status']].round(1),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        day_runs = filter_data_by_date(df, selected_date)
+        gaps = find_schedule_gaps(day_runs, schedules)
+        if not gaps.empty:
+            with st.expander(f"Missed runs on {selected_date} ({int(gaps['missed_runs'].sum())})"):
+                st.dataframe(gaps, use_container_width=True, hide_index=True)
+    except Exception as e:
+        logger.error(f"Error displaying schedule health: {e}", exc_info=True)
+        st.warning("Schedule health unavailable. Please check logs for details.")
+
+def display_sla_report(df, selected_date):
+    """
+    Display per-flow SLA attainment for the day, week or month containing the selected date
+    
+    Flows follow their declared schedule from the SLA file, or else the
+    cadence inferred by the schedule tracker. Slot outcomes are computed once
+    per loaded snapshot and evaluated as of its fetch time (query results) or
+    its newest run watermark (exports, run store, sample), so they are
+    memoized on the data version and reruns only regroup them by period.
+    
+    Parameters:
+    - df: Full loaded DataFrame (the history slots are matched against)
+    - selected_date: Date whose day, week or month is reported
+    
+    Returns:
+        None - Displays the SLA report directly in the Streamlit interface
+    """
+    try:
+        if 'schedule_tracker' not in st.session_state:
+            st.session_state.schedule_tracker = ScheduleTracker()
+        tracker = st.session_state.schedule_tracker
+        update_once_per_version('schedule_tracker', df, tracker.update)
+        
+        version = data_version(df)
+        freshness = get_freshness(df)
+        as_of = evaluation_time(freshness)
+        # A query's fetch time is fixed per cached fetch; watermarks are already in the version
+        fetched_at = freshness.get('fetched_at') if freshness.get('origin') in QUERY_ORIGINS else None
+        sla_file_mtime = SLA_FILE.stat().st_mtime if SLA_FILE.exists() else None
+        memo = get_memo()
+        
+        def compute_outcomes():
+            schedules = combine_schedules(load_declared_schedules(), infer_schedules(tracker, df))
+            started = pd.to_datetime(df['datetimestarted'], errors='coerce')
+            return compute_sla_outcomes(df, schedules, started.min(), as_of, as_of)
+        
+        outcomes = memo.get_or_compute(version, 'sla_outcomes', (fetched_at, sla_file_mtime), compute_outcomes)
+        if outcomes.empty:
+            return
+        
+        st.markdown("### Schedule SLAs")
+        period = st.radio("SLA Period", list(SLA_PERIODS), index=1, horizontal=True,
+                          format_func=str.capitalize, key="sla_period")
+        report = memo.get_or_compute(version, 'sla_report', (fetched_at, sla_file_mtime, period),
+                                     lambda: sla_report(outcomes, period))
+        if report.empty:
+            return
+        
+        period_start = pd.Timestamp(selected_date).to_period(SLA_PERIODS[period]).start_time
+        current = report[report.index.get_level_values('period_start') == period_start].droplevel('period_start')
+        if current.empty:
+            st.info(f"No scheduled slots were due in the {period} of {selected_date}.")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Flows with an SLA", len(current))
+        with col2:
+            st.metric("Meeting Target", f"{int(current['met'].sum())} / {len(current)}")
+        with col3:
+            st.metric("Slots On Time", f"{current['on_time'].sum() / current['slots'].sum() * 100:.1f}%",
+                      help=f"{int(current['slots'].sum())} expected runs since {period_start.date()}")
+        
+        st.dataframe(current.sort_values('on_time_pct').round(1), use_container_width=True)
+        
+        with st.expander(f"On-time share by {period}"):
+            totals = report.groupby(level='period_start')[['on_time', 'slots']].sum()
+            st.line_chart(totals['on_time'] / totals['slots'] * 100)
+    except Exception as e:
+        logger.error(f"Error displaying SLA report: {e}", exc_info=True)
+        st.warning("SLA report unavailable. Please check logs for details.")
+
+def display_service_account_load(df, selected_date):
+    """
+    Display concurrent runs and start throughput per service account
+    
+    The sweep over the loaded history is cached in session state and only
+    recomputed when the data changes.
+    
+    Parameters:
+    - df: Full loaded DataFrame (a month of runs)
+    - selected_date: Date whose hourly load is charted
+    
+    Returns:
+        None - Displays the load analysis directly in the Streamlit interface
+    """
+    try:
+        data_key = data_version(df)
+        if st.session_state.get('owner_load_key') != data_key:
+            st.session_state.owner_load = summarize_owner_load(df)
+            st.session_state.owner_load_key = data_key
+        load = st.session_state.owner_load
+        if load.empty:
+            return
+        
+        st.markdown("### Service Account Load")
+        day_load = load[load['hour'].dt.date == selected_date]
+        if not day_load.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Peak Concurrent Runs by Hour")
+                st.line_chart(day_load.pivot_table(index=day_load['hour'].dt.hour, columns='owner',
+                                                   values='peak_concurrency', aggfunc='max', observed=True))
+            with col2:
+                st.subheader(f"Peak Runs Started per {THROUGHPUT_WINDOW}")
+                st.line_chart(day_load.pivot_table(index=day_load['hour'].dt.hour, columns='owner',
+                                                   values='peak_starts_per_window', aggfunc='max', observed=True))
+        
+        with st.expander("Capacity summary for the loaded period"):
+            summary = load.groupby('owner', observed=True).agg(
+                peak_concurrency=('peak_concurrency', 'max'),
+                peak_starts_per_window=('peak_starts_per_window', 'max'),
+                runs_started=('runs_started', 'sum'),
+                busiest_hour_runs=('runs_started', 'max')
+            ).sort_values('peak_concurrency', ascending=False)
+            st.dataframe(summary, use_container_width=True)
+    except Exception as e:
+        logger.error(f"Error displaying service account load: {e}", exc_info=True)
+        st.warning("Service account load unavailable. Please check logs for details.")
+
+def display_source_status(df):
+    """
+    Display per-source latency and failures of the fetch that produced the data in the sidebar
+    
+    Parameters:
+    - df: Loaded DataFrame (carries the statuses of its fetch)
+    
+    Returns:
+        None - Displays the source status directly in the Streamlit sidebar
+    """
+    try:
+        statuses = get_source_status(df)
+        if not statuses:
+            return
+        
+        failed = [status['source'] for status in statuses if not status['ok']]
+        with st.sidebar.expander(f"Data Sources ({len(statuses) - len(failed)}/{len(statuses)} OK)", expanded=bool(failed)):
+            status_df = pd.DataFrame(statuses)
+            status_df['status'] = status_df['ok'].map({True: "✅", False: "❌"})
+            status_df['latency_ms'] = (status_df['latency_seconds'] * 1000).round().astype(int)
+            st.dataframe(status_df[['status', 'source', 'rows', 'latency_ms']].set_index('source'),
+                         use_container_width=True)
+            for status in statuses:
+                if not status['ok']:
+                    st.caption(f"{status['source']}: {status['error']}")
+    except Exception as e:
+        logger.error(f"Error displaying source status: {e}", exc_info=True)
+        st.sidebar.warning("Source status unavailable. Please check logs for details.")
+
+def format_lag(seconds):
+    """Format a lag in seconds as a short human-readable string"""
+    if seconds is None:
+        return "n/a"
+    minutes = int(max(seconds, 0) // 60)
+    if minutes < 60:
+        return f"{minutes} min"
+    if minutes < 48 * 60:
+        return f"{minutes // 60} h {minutes % 60} min"
+    return f"{minutes // (24 * 60)} days"
+
+def display_data_freshness(df):
+    """
+    Display how fresh the loaded data is in the sidebar
+    
+    Uses the watermarks and timings recorded when the snapshot was fetched
+    (see data_storage.freshness), so it costs nothing on reruns and reports
+    the original fetch time for cached results.
+    
+    Parameters:
+    - df: Loaded DataFrame
+    
+    Returns:
+        None - Displays the freshness indicator directly in the Streamlit sidebar
+    """
+    try:
+        freshness = get_freshness(df)
+        metrics = freshness_metrics(freshness)
+        logger.info("Data freshness: " + ", ".join(f"{key}={value}" for key, value in metrics.items()))
+        
+        with st.sidebar:
+            st.markdown("### Data Freshness")
+            st.metric(f"{FRESHNESS_EMOJIS[metrics['level']]} Ingestion Lag", format_lag(metrics['ingestion_lag_seconds']),
+                      help=f"Time since the newest run start or modification in the data. "
+                           f"Warning after {FRESHNESS_WARNING_MINUTES:g} min, critical after {FRESHNESS_CRITICAL_MINUTES:g} min")
+            details = [f"Source: {metrics['origin']} ({metrics['rows']} runs)"]
+            if freshness.get('max_started'):
+                details.append(f"Newest run start: {freshness['max_started'][:16].replace('T', ' ')}")
+            if freshness.get('max_modified'):
+                details.append(f"Newest modification: {freshness['max_modified'][:16].replace('T', ' ')}")
+            if metrics['query_seconds'] is not None:
+                details.append(f"Query time: {metrics['query_seconds']:.1f}s")
+            details.append(f"Fetched: {format_lag(metrics['fetch_age_seconds'])} ago")
+            st.caption("  \n".join(details))
+            if metrics['level'] == 'critical':
+                st.error("Flow run data is stale - check the rpa_FlowRunHistory load.")
+    except Exception as e:
+        logger.error(f"Error displaying data freshness: {e}", exc_info=True)
+        st.sidebar.warning("Data freshness unavailable. Please check logs for details.")
+
 def initialize_session_state():
     """
     Initialize all session state variables needed for the dashboard
@@ -441,6 +1345,18 @@ def main():
             # Data source selection
             use_csv = st.checkbox("Use CSV Data", value=False, 
                                  help="Use CSV files instead of database")
+            use_store = st.checkbox("Use Local History", value=False,
+                                   help="Use the local run history store instead of querying the database")
+            show_run_span = st.checkbox("Show Full Run Duration", value=False,
+                                        help="Mark every hour of the day a run was active instead of only its start hour")
+            bucketing = 'interval' if show_run_span else 'start'
+            compare_baseline = st.checkbox("Compare to Baseline", value=False,
+                                           help="Mark cells that deviate from the same hour on previous days")
+            baseline_window = st.selectbox("Baseline Window (days)", BASELINE_WINDOWS,
+                                           disabled=not compare_baseline)
+            aggregate_in_db = st.checkbox("Aggregate in Database", value=False,
+                                          disabled=use_csv or use_store or not ODBC_AVAILABLE,
+                                          help="Transfer only per-hour status counts for the matrix instead of every run")
             
             # Date selection
             today = date.today()
@@ -459,6 +1375,7 @@ def main():
                     st.session_state.refresh_count += 1
                     st.session_state.last_refresh = datetime.now()
                     logger.info(f"Manual refresh triggered (refresh #{st.session_state.refresh_count})")
+                    st.session_state.force_refresh = True
                 except ValueError as val_error:
                     logger.warning(f"Value error updating session state: {val_error}")
                 except TypeError as type_error:
@@ -504,6 +1421,7 @@ def main():
                             st.session_state.last_refresh = current_time
                             st.session_state.refresh_count += 1
                             logger.info(f"Auto-refresh triggered after {refresh_interval} minutes")
+                            st.session_state.force_refresh = True
                             
                             # Perform the refresh
                             safe_dashboard_reload()
@@ -525,64 +1443,137 @@ def main():
                     st.warning("Error in refresh calculation. Try refreshing manually.")
         
         # Load data
-        df = load_data(use_csv=use_csv)
+        # A refresh request bypasses the shared query cache once
+        force_refresh = st.session_state.pop('force_refresh', False)
+        
+        # Matrix-only mode: the database reduces runs to hourly cells (start-hour bucketing)
+        if aggregate_in_db and not (use_csv or use_store or not ODBC_AVAILABLE):
+            if show_run_span:
+                st.info("Full run duration needs individual runs - showing start hours.")
+            if display_aggregated_matrix(selected_date, refresh=force_refresh):
+                return
+        
+        # New sessions see the persisted snapshot while the first load runs in the background
+        if not st.session_state.get('warm_started', False) and not force_refresh:
+            df = load_data_warm_start(selected_date, use_csv=use_csv, use_store=use_store)
+        else:
+            df = load_data(use_csv=use_csv, use_store=use_store, refresh=force_refresh)
+        display_source_status(df)
+        if df is not None and not df.empty:
+            display_data_freshness(df)
+        
+        # Environment filter when runs come from several sources
+        environment_filtered = False
+        if df is not None and SOURCE_COLUMN in df.columns and df[SOURCE_COLUMN].nunique() > 1:
+            selected_sources = st.sidebar.multiselect(
+                "Environments", sorted(df[SOURCE_COLUMN].dropna().unique().tolist()),
+                help="Leave empty to show runs from every source"
+            )
+            if selected_sources:
+                parent_version = data_version(df)
+                df = df[df[SOURCE_COLUMN].isin(selected_sources)]
+                derive_version(df, parent_version, 'sources', sorted(selected_sources))
+                environment_filtered = True
         
         if df is not None and not df.empty:
+            # Derived results are memoized on the data version, so reruns with unchanged data skip them
+            version = data_version(df)
+            memo = get_memo()
+            
             # Filter data for selected date
-            filtered_df = filter_data_by_date(df, selected_date)
+            filtered_df = memo.get_or_compute(version, 'filtered', (selected_date,),
+                                              lambda: filter_data_by_date(df, selected_date))
             
             if filtered_df.empty:
                 st.warning(f"No data available for selected date: {selected_date}")
                 return
                 
             # Process data for dashboard display
-            processed_df = process_data_for_dashboard(filtered_df)
+            processed_df = memo.get_or_compute(version, 'processed', (selected_date,),
+                                               lambda: process_data_for_dashboard(filtered_df))
             
             if processed_df is not None and not processed_df.empty:
-                # Filter controls
-                col1, col2 = st.columns(2)
+                # Matrix input: one row per run, or per run and active hour of the selected day
+                # (including runs carried over from the previous day)
+                matrix_df = memo.get_or_compute(
+                    version, 'matrix_input', (selected_date, bucketing),
+                    lambda: expand_run_hours(
+                        process_data_for_dashboard(runs_overlapping_day(df, selected_date)), day=selected_date
+                    ) if bucketing == 'interval' else processed_df
+                )
+                
+                # Inverted filter index, built once per data snapshot
+                snapshot_key = get_snapshot_key(version, selected_date, bucketing)
+                filter_index = get_filter_index(matrix_df, snapshot_key)
+                
+                # Filter controls (an empty selection shows everything)
+                col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    projects = ['All Projects'] + sorted(processed_df['automation_project'].unique().tolist())
-                    selected_project = st.selectbox("Select Project", projects)
+                    selected_projects = st.multiselect("Projects", filter_index.values('automation_project'),
+                                                       help="Leave empty to show all projects")
                 
                 with col2:
-                    statuses = ['All Statuses'] + sorted(processed_df['taskstatus'].unique().tolist())
-                    selected_status = st.selectbox("Select Status", statuses)
+                    selected_owners = st.multiselect("Owners", filter_index.values('owner'),
+                                                     help="Leave empty to show all service accounts")
+                
+                with col3:
+                    selected_statuses = st.multiselect("Statuses", filter_index.values('taskstatus'),
+                                                       help="Leave empty to show all statuses")
+                
+                with col4:
+                    selected_triggers = st.multiselect("Trigger Types", filter_index.values('trigger_group'),
+                                                       help="Leave empty to show all trigger types")
                 
-                # Create matrix data
-                bot_hour_status, display_names, hours = create_hourly_matrix(
-                    processed_df,
-                    selected_project,
-                    selected_status
+                # Create matrix data for the filter combination (cached per data snapshot)
+                filters = normalize_filters(selected_projects, selected_statuses, selected_owners, selected_triggers)
+                (bot_hour_status, display_names, hours), changed_cells = get_filtered_matrix(
+                    matrix_df, selected_date, snapshot_key, filter_index, filters, bucketing
                 )
                 
-                # Display matrix
-                st.markdown("### Bot Activity Matrix")
-                display_matrix(bot_hour_status, display_names, hours)
+                # Display matrix, optionally against the same hours on previous days
+                if not (compare_baseline and display_baseline_matrix(
+                        df, selected_date, baseline_window, bot_hour_status, display_names, hours, filters)):
+                    st.markdown("### Bot Activity Matrix")
+                    display_matrix(bot_hour_status, display_names, hours, changed_cells=changed_cells)
+                
+                # Runs behind a selected cell, from a row index over the loaded data,
+                # restricted to the rows matching the active filters
+                cell_index = get_cell_run_index(matrix_df, snapshot_key)
+                filtered_rows = (filter_index.select(**filters)
+                                 if any(values is not None for values in filters.values()) else None)
+                display_cell_drilldown(
+                    bot_hour_status, display_names, (snapshot_key, filter_cache_key(filters)),
+                    lambda flow, hour: cell_index.runs(flow, hour, filtered_rows)
+                )
                 
                 # Show summary statistics
-                st.markdown("### Data Summary")
-                col1, col2, col3 = st.columns(3)
+                display_data_summary(memo.get_or_compute(version, 'summary', (selected_date,),
+                                                         lambda: summarize_processed_data(processed_df)))
                 
-                with col1:
-                    st.subheader("Status Distribution")
-                    status_counts = processed_df['taskstatus'].value_counts()
-                    st.bar_chart(status_counts)
+                # Keep today's unfiltered view for the next cold start
+                if (selected_date == date.today() and bucketing == 'start' and not environment_filtered
+                        and all(values is None for values in filters.values())):
+                    persist_snapshot(processed_df, (bot_hour_status, display_names, hours),
+                                     selected_date, snapshot_key, get_freshness(df))
                 
-                with col2:
-                    st.subheader("Automation Projects")
-                    project_counts = processed_df['automation_project'].value_counts().head(10)
-                    st.bar_chart(project_counts)
+                # Show rolling success rate trends
+                display_success_trends(df)
                 
-                with col3:
-                    st.subheader("Success Rate")
-                    if 'success_rate' in processed_df.columns:
-                        avg_success = processed_df['success_rate'].mean()
-                        st.metric("Overall Success Rate", f"{avg_success:.1f}%")
-                    else:
-                        success_rate = processed_df['wassuccessful'].mean() * 100
-                        st.metric("Overall Success Rate", f"{success_rate:.1f}%")
+                # Show per-day totals for the loaded period
+                display_daily_overview(df, bucketing)
+                
+                # Show run duration analytics
+                display_duration_analytics(df, processed_df, selected_date)
+                
+                # Show schedule health for Recurrence-triggered flows
+                display_schedule_health(df, selected_date)
+                
+                # Show per-flow SLA attainment against declared or inferred schedules
+                display_sla_report(df, selected_date)
+                
+                # Show concurrency and throughput per service account
+                display_service_account_load(df, selected_date)
             else:
                 st.warning("Error processing data. Please check logs.")
         else:
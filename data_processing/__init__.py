@@ -3,6 +3,22 @@ Data processing module for Bot Monitoring Dashboard
 Contains functions to process and validate data
 """
 
-from data_processing.processors import process_data_for_dashboard, extract_project_name, create_hourly_matrix
+from data_processing.processors import (
+    process_data_for_dashboard, extract_project_name, create_hourly_matrix,
+    expand_run_hours, normalize_filters
+)
 from data_processing.validators import validate_raw_data, validate_processed_data, validate_matrix_data
 
+from data_processing.incremental import HourlyMatrixState, update_hourly_matrix
+from data_processing.durations import DurationSketch, DailyDurationSketches, build_duration_sketches, summarize_durations
+from data_processing.schedules import ScheduleTracker, find_schedule_gaps
+from data_processing.success_rates import SuccessCounters
+from data_processing.indexes import FilterIndex
+from data_processing.concurrency import concurrency_timeline, peak_concurrency_by_hour, start_throughput, summarize_owner_load
+from data_processing.batch import DailyMatrixCache, compute_daily_results
+from data_processing.engines import PandasEngine, DuckDBEngine, get_engine, compare_engines
+from data_processing.aggregates import label_aggregates, matrix_from_aggregates
+from data_processing.drilldown import CellRunIndex, DrillDownCache
+from data_processing.baselines import HourlyBaselines, deviation_matrix
+from data_processing.memo import VersionedMemo
+from data_processing.sla import load_declared_schedules, infer_schedules, combine_schedules, compute_sla_outcomes, sla_report
@@ -0,0 +1,140 @@
+"""
+Aggregate matrix module for Bot Monitoring Dashboard
+Builds the hourly matrix from per-status cell counts aggregated by the database
+"""
+
+import logging
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from data_processing.processors import FilterSelection, label_flows, normalize_filters
+from data_processing.indexes import INDEX_COLUMNS
+from data_processing.validators import validate_matrix_data
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('aggregate_matrix')
+
+def label_aggregates(aggregates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add owner, automation_project and display_name to aggregated cells.
+
+    Labels are derived once per distinct (flowowner, flowname) pair and
+    joined back, exactly as process_data_for_dashboard derives them per run.
+
+    Args:
+        aggregates: Rows returned by the hourly aggregate query
+
+    Returns:
+        pd.DataFrame: Aggregates with the label columns
+    """
+    if aggregates is None or aggregates.empty:
+        return pd.DataFrame(columns=list(aggregates.columns if aggregates is not None else [])
+                            + ['owner', 'automation_project', 'display_name'])
+    flows = label_flows(aggregates[['flowowner', 'flowname']].drop_duplicates())
+    return aggregates.merge(flows, on=['flowowner', 'flowname'], how='left')
+
+def aggregate_filter_values(labeled: pd.DataFrame) -> Dict[str, List[Any]]:
+    """Sorted distinct values of every filter column (see FilterIndex.values)"""
+    return {
+        column: sorted(labeled[column].dropna().unique().tolist()) if column in labeled.columns else []
+        for column in INDEX_COLUMNS
+    }
+
+def aggregate_status_counts(labeled: pd.DataFrame) -> pd.Series:
+    """Runs per status, most frequent first"""
+    if labeled is None or labeled.empty:
+        return pd.Series(dtype='int64')
+    return labeled.groupby('taskstatus')['runs'].sum().sort_values(ascending=False)
+
+def matrix_from_aggregates(
+    labeled: pd.DataFrame,
+    selected_project: FilterSelection = 'All Projects',
+    selected_status: FilterSelection = 'All Statuses',
+    max_rows: int = 300,
+    selected_owner: FilterSelection = 'All Owners',
+    selected_trigger: FilterSelection = 'All Triggers'
+) -> tuple:
+    """
+    Hourly matrix from aggregated cells, matching create_hourly_matrix on the same runs.
+
+    Without a status or trigger filter every cell takes the status the
+    database marked as its top priority one; otherwise the top status is
+    re-ranked over the remaining per-status rows. Rows are ordered by each
+    flow's first run of the day, and max_rows keeps the flows with the most
+    failures, then running runs, then runs, as create_hourly_matrix does.
+
+    Args:
+        labeled: Output of label_aggregates
+        selected_project: Project filter(s) (or 'All Projects')
+        selected_status: Status filter(s) (or 'All Statuses')
+        max_rows: Maximum number of rows to display
+        selected_owner: Owner filter(s) (or 'All Owners')
+        selected_trigger: Trigger group filter(s) (or 'All Triggers')
+
+    Returns:
+        tuple: (bot_hour_status, display_names, hours)
+    """
+    hours = list(range(24))
+    try:
+        if labeled is None or labeled.empty:
+            logger.warning("No aggregated data available for matrix creation")
+            return {}, [], hours
+
+        filters = normalize_filters(selected_project, selected_status, selected_owner, selected_trigger)
+        mask = labeled['display_name'].notna()
+        for column, values in filters.items():
+            if values is not None:
+                mask &= labeled[column].isin(values)
+        cells = labeled[mask]
+        if cells.empty:
+            logger.warning("No data after filtering")
+            return {}, [], hours
+
+        # Rank flows by first appearance, then pick the most active ones if there are too many
+        statuses = cells['taskstatus']
+        flows = pd.DataFrame({
+            'display_name': cells['display_name'].to_numpy(),
+            'first_started': pd.to_datetime(cells['first_started']).to_numpy(),
+            'runs': cells['runs'].to_numpy(),
+            'failed': cells['runs'].where(statuses == 'Failed', 0).to_numpy(),
+            'running': cells['runs'].where(statuses == 'Running', 0).to_numpy(),
+        }).groupby('display_name').agg(
+            first_started=('first_started', 'min'), failed=('failed', 'sum'),
+            running=('running', 'sum'), total=('runs', 'sum')
+        ).sort_values('first_started', kind='stable')
+        if len(flows) > max_rows:
+            logger.warning(f"Too many display names ({len(flows)}), using intelligent selection")
+            flows['score'] = flows['failed'] * 100 + flows['running'] * 10 + flows['total']
+            flows = flows.sort_values('score', ascending=False, kind='stable').head(max_rows)
+        display_names = flows.index.tolist()
+
+        # Status filters can remove a cell's top status; re-rank the rows that remain
+        rerank = filters['taskstatus'] is not None or filters['trigger_group'] is not None
+        candidates = cells if rerank else cells[cells['is_top'] == 1]
+        candidates = candidates.assign(missing_status=candidates['taskstatus'].isna()).sort_values(
+            ['display_name', 'hour', 'priority', 'missing_status', 'taskstatus'],
+            ascending=[True, True, False, True, True]
+        ).drop_duplicates(['display_name', 'hour'])
+
+        bot_hour_status = {name: {hour: "No Run" for hour in hours} for name in display_names}
+        for name, hour, status in zip(candidates['display_name'], candidates['hour'], candidates['taskstatus']):
+            if name in bot_hour_status and 0 <= int(hour) <= 23:
+                bot_hour_status[name][int(hour)] = status
+
+        is_valid, message, validated_data = validate_matrix_data(bot_hour_status, display_names, hours)
+        if not is_valid:
+            logger.warning(f"Matrix validation warning: {message}")
+        logger.info(f"Aggregate matrix created with {len(display_names)} rows from {len(cells)} cell rows")
+        return validated_data
+
+    except Exception as e:
+        logger.error(f"Error creating matrix from aggregates: {e}")
+        return {}, [], hours
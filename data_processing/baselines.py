@@ -0,0 +1,251 @@
+"""
+Baseline module for Bot Monitoring Dashboard
+Compares each (flow, hour) cell of a day with the same hour over the preceding days
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.processors import STATUS_PRIORITY, label_flows
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('hourly_baselines')
+
+# Constants
+BASELINE_WINDOWS = (7, 14, 28)      # Selectable baseline lengths in days
+MIN_BASELINE_DAYS = 3               # Fewer loaded baseline days than this cannot flag anomalies
+NORMAL_FAILURE_RATE = 0.1           # A failure is unusual where at most this share of baseline runs failed
+EXPECTED_RUN_SHARE = 0.75           # A cell is expected to run where it ran on this share of baseline days
+VOLUME_RATIO = 3.0                  # Runs this many times above (or below) the baseline mean are unusual
+MIN_VOLUME_DEVIATION = 3            # ...and differ from it by at least this many runs
+FAILURE_STATUSES = tuple(status for status, priority in STATUS_PRIORITY.items()
+                         if priority == STATUS_PRIORITY['Failed'])
+
+# Anomaly labels, most important first
+ANOMALY_LABELS = ('Unusual Failure', 'Missing Run', 'Unusual Volume')
+
+COUNT_COLUMNS = ['day', 'display_name', 'owner', 'automation_project', 'hour', 'runs', 'failed']
+
+class HourlyBaselines:
+    """
+    Per-day run and failure counts of every (flow, hour) cell.
+
+    Like DailyDurationSketches, update only recounts days that are new or
+    still changing (today by default); rebuild recounts the whole loaded
+    window when the data itself changed (a new version, origin or source
+    set), so late status changes and removed runs are reflected. A
+    baseline over any number of days is a group-by over these compact
+    counts, never over raw runs.
+    """
+
+    def __init__(self):
+        self.counts = pd.DataFrame(columns=COUNT_COLUMNS)
+        self.days: set = set()
+
+    def update(self, df: pd.DataFrame, refresh_days: Optional[Iterable[date]] = None) -> List[date]:
+        """
+        Count any day in df that is missing or listed in refresh_days.
+
+        Args:
+            df: Raw runs with flowowner, flowname, datetimestarted and taskstatus
+            refresh_days: Days to recount even if already counted (default: today)
+
+        Returns:
+            List of days that were (re)counted
+        """
+        required = {'flowowner', 'flowname', 'datetimestarted', 'taskstatus'}
+        if df is None or df.empty or not required.issubset(df.columns):
+            return []
+
+        refresh = set(refresh_days) if refresh_days is not None else {date.today()}
+        started = pd.to_datetime(df['datetimestarted'], errors='coerce')
+        run_days = started.dt.date
+        pending = [d for d in run_days.dropna().unique() if d not in self.days or d in refresh]
+        if not pending:
+            return []
+
+        mask = run_days.isin(pending).to_numpy()
+        runs = pd.DataFrame({
+            'flowowner': df['flowowner'].to_numpy()[mask],
+            'flowname': df['flowname'].to_numpy()[mask],
+            'day': run_days.to_numpy()[mask],
+            'hour': started.dt.hour.to_numpy()[mask],
+            'failed': df['taskstatus'].isin(FAILURE_STATUSES).to_numpy()[mask].astype(np.int64),
+        })
+
+        # Labels are derived once per distinct flow, as in process_data_for_dashboard
+        flows = label_flows(runs[['flowowner', 'flowname']].drop_duplicates())
+        recounted = runs.merge(flows, on=['flowowner', 'flowname'], how='left')
+        recounted = recounted[recounted['display_name'].notna()].groupby(
+            ['day', 'display_name', 'owner', 'automation_project', 'hour'], as_index=False
+        ).agg(runs=('failed', 'size'), failed=('failed', 'sum'))
+
+        kept = self.counts[~self.counts['day'].isin(pending)]
+        self.counts = pd.concat([kept, recounted], ignore_index=True) if not kept.empty else recounted
+        self.days.update(pending)
+        logger.info(f"Counted hourly baseline cells for {len(pending)} days")
+        return sorted(pending)
+
+    def rebuild(self, df: pd.DataFrame) -> List[date]:
+        """
+        Replace all counts with those of the days in df.
+
+        Args:
+            df: Raw runs with flowowner, flowname, datetimestarted and taskstatus
+
+        Returns:
+            List of days that were counted
+        """
+        self.counts = pd.DataFrame(columns=COUNT_COLUMNS)
+        self.days = set()
+        return self.update(df, refresh_days=())
+
+    def baseline(self, selected_date: date, window_days: int) -> Tuple[pd.DataFrame, int]:
+        """
+        Same-hour totals over the window_days before selected_date.
+
+        Args:
+            selected_date: Day being compared
+            window_days: Length of the baseline in days
+
+        Returns:
+            tuple: (DataFrame indexed by (display_name, hour) with runs, failed
+            and run_days, number of baseline days with loaded data)
+        """
+        window = {selected_date - timedelta(days=d) for d in range(1, window_days + 1)}
+        loaded = len(window & self.days)
+        cells = self.counts[self.counts['day'].isin(window)]
+        totals = cells.groupby(['display_name', 'hour']).agg(
+            runs=('runs', 'sum'), failed=('failed', 'sum'), run_days=('day', 'nunique')
+        )
+        return totals, loaded
+
+    def compare(self, selected_date: date, window_days: int = 7, now: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Compare every cell of selected_date with its same-hour baseline.
+
+        A cell is flagged as
+          - 'Unusual Failure' when it has failures but its baseline runs
+            rarely failed (at most NORMAL_FAILURE_RATE),
+          - 'Missing Run' when an hour that has passed has no runs but the
+            cell ran on at least EXPECTED_RUN_SHARE of the baseline days,
+          - 'Unusual Volume' when its runs are VOLUME_RATIO times above or
+            below the baseline mean and differ by MIN_VOLUME_DEVIATION runs,
+        taking the first that applies.
+
+        Args:
+            selected_date: Day to compare
+            window_days: Length of the baseline in days (see BASELINE_WINDOWS)
+            now: Current time, to skip hours of today that have not passed (default: datetime.now())
+
+        Returns:
+            pd.DataFrame with display_name, owner, automation_project, hour,
+            runs, failed, baseline_runs_per_day, baseline_failure_rate,
+            run_share and anomaly (None for normal cells); empty when fewer
+            than MIN_BASELINE_DAYS baseline days are loaded
+        """
+        totals, loaded_days = self.baseline(selected_date, window_days)
+        if loaded_days < MIN_BASELINE_DAYS:
+            logger.info(f"Only {loaded_days} of {window_days} baseline days loaded for {selected_date}")
+            return pd.DataFrame()
+
+        today = self.counts[self.counts['day'] == selected_date].set_index(['display_name', 'hour'])
+        cells = today[['runs', 'failed']].join(totals.add_prefix('baseline_'), how='outer').fillna(0)
+        if cells.empty:
+            return pd.DataFrame()
+
+        # Owner and project of cells that only appear in the baseline
+        labels = self.counts.drop_duplicates('display_name').set_index('display_name')[['owner', 'automation_project']]
+        cells = cells.reset_index().join(labels, on='display_name')
+
+        runs = cells['runs'].to_numpy(dtype=float)
+        failed = cells['failed'].to_numpy(dtype=float)
+        base_runs = cells['baseline_runs'].to_numpy(dtype=float)
+        mean_runs = base_runs / loaded_days
+        with np.errstate(divide='ignore', invalid='ignore'):
+            failure_rate = np.where(base_runs > 0, cells['baseline_failed'].to_numpy(dtype=float) / base_runs, np.nan)
+        run_share = cells['baseline_run_days'].to_numpy(dtype=float) / loaded_days
+
+        now = now or datetime.now()
+        if selected_date < now.date():
+            elapsed = np.ones(len(cells), dtype=bool)
+        elif selected_date == now.date():
+            elapsed = cells['hour'].to_numpy() < now.hour
+        else:
+            elapsed = np.zeros(len(cells), dtype=bool)
+
+        unusual_failure = (failed > 0) & ~(failure_rate > NORMAL_FAILURE_RATE)
+        missing_run = (runs == 0) & (run_share >= EXPECTED_RUN_SHARE) & elapsed
+        deviation = np.abs(runs - mean_runs) >= MIN_VOLUME_DEVIATION
+        unusual_volume = (runs > 0) & deviation & ((runs >= mean_runs * VOLUME_RATIO) | (runs * VOLUME_RATIO <= mean_runs))
+
+        comparison = pd.DataFrame({
+            'display_name': cells['display_name'],
+            'owner': cells['owner'],
+            'automation_project': cells['automation_project'],
+            'hour': cells['hour'].astype(int),
+            'runs': runs.astype(int),
+            'failed': failed.astype(int),
+            'baseline_runs_per_day': mean_runs,
+            'baseline_failure_rate': failure_rate * 100,
+            'run_share': run_share * 100,
+            'anomaly': np.select([unusual_failure, missing_run, unusual_volume], ANOMALY_LABELS, default=None),
+        })
+        flagged = comparison['anomaly'].notna().sum()
+        logger.info(f"Compared {len(comparison)} cells of {selected_date} with a {window_days}-day baseline: {flagged} anomalies")
+        return comparison
+
+def deviation_matrix(
+    bot_hour_status: Dict[str, Dict[int, str]],
+    display_names: List[str],
+    comparison: pd.DataFrame,
+    filters: Optional[Dict[str, Optional[Tuple[str, ...]]]] = None
+) -> Tuple[Dict[str, Dict[int, str]], List[str]]:
+    """
+    Overlay baseline anomalies on an hourly matrix.
+
+    Anomalous cells show their anomaly label instead of their status. Flows
+    with missing runs but no run on the day get a row of their own unless a
+    status or trigger filter is active (such rows have no runs to match);
+    owner and project filters still apply to them.
+
+    Args:
+        bot_hour_status: Matrix from create_hourly_matrix
+        display_names: Rows of the matrix
+        comparison: Output of HourlyBaselines.compare
+        filters: Output of normalize_filters used for the matrix (optional)
+
+    Returns:
+        tuple: (bot_hour_status, display_names) with the anomalies applied
+    """
+    matrix = {name: dict(hours) for name, hours in bot_hour_status.items()}
+    names = list(display_names)
+    if comparison is None or comparison.empty:
+        return matrix, names
+
+    anomalies = comparison[comparison['anomaly'].notna()]
+    filters = filters or {}
+    add_rows = filters.get('taskstatus') is None and filters.get('trigger_group') is None
+    for column in ('owner', 'automation_project'):
+        if filters.get(column) is not None:
+            anomalies = anomalies[anomalies[column].isin(filters[column])]
+
+    for name, hour, anomaly in zip(anomalies['display_name'], anomalies['hour'], anomalies['anomaly']):
+        if name not in matrix:
+            if not add_rows or anomaly != 'Missing Run':
+                continue
+            matrix[name] = {h: "No Run" for h in range(24)}
+            names.append(name)
+        matrix[name][int(hour)] = anomaly
+    return matrix, names
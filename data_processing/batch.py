@@ -0,0 +1,255 @@
+"""
+Batch processing module for Bot Monitoring Dashboard
+Computes per-day matrices and summaries for many days in a process pool
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.processors import process_data_for_dashboard, create_hourly_matrix
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('batch_processor')
+
+# Constants
+BATCH_COLUMNS = [
+    'flowguid', 'flowname', 'flowowner', 'datetimestarted', 'datetimecompleted',
+    'taskstatus', 'wassuccessful', 'triggertype'
+]
+
+DayResult = Dict[str, Any]
+
+def summarize_day(processed_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Headline numbers for one day of processed runs.
+
+    Args:
+        processed_df: Output of process_data_for_dashboard for the day
+
+    Returns:
+        dict with total_runs, flows, failed, success_rate and status_counts
+    """
+    if processed_df is None or processed_df.empty:
+        return {'total_runs': 0, 'flows': 0, 'failed': 0, 'success_rate': None, 'status_counts': {}}
+
+    # Interval bucketing repeats a run once per hour; count each run once
+    if 'bucket_offset' in processed_df.columns:
+        processed_df = processed_df[processed_df['bucket_offset'] == 0]
+
+    statuses = processed_df['taskstatus'].astype(str)
+    return {
+        'total_runs': int(len(processed_df)),
+        'flows': int(processed_df['flowname'].nunique()),
+        'failed': int((statuses == 'Failed').sum()),
+        'success_rate': round(float(pd.to_numeric(processed_df['wassuccessful'], errors='coerce').mean() * 100), 1),
+        'status_counts': {str(k): int(v) for k, v in statuses.value_counts().items()},
+    }
+
+def _compute_day_frame(day_df: pd.DataFrame, day: str, bucketing: str) -> DayResult:
+    """Matrix and summary for one day of raw runs"""
+    processed_df = process_data_for_dashboard(day_df, day_filter=day, bucketing=bucketing)
+    return {
+        'matrix': create_hourly_matrix(processed_df),
+        'summary': summarize_day(processed_df),
+    }
+
+def _compute_day_shared(task: Tuple[str, int, int, int, str, str]) -> Tuple[str, Optional[DayResult], Optional[str]]:
+    """
+    Worker: compute one day from a row range of the shared Arrow buffer.
+
+    Args:
+        task: (shared memory name, buffer size, first row, end row, ISO day, bucketing)
+
+    Returns:
+        tuple: (ISO day, result or None, error message or None)
+    """
+    shm_name, size, start, stop, day, bucketing = task
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        view = shm.buf[:size]
+        try:
+            # Zero-copy read of the shared buffer; take() copies only this day's rows
+            # out of it, so no reference to shared memory outlives the mapping
+            table = pa.ipc.open_stream(pa.py_buffer(view)).read_all()
+            day_df = table.take(pa.array(np.arange(start, stop))).to_pandas()
+            del table
+        finally:
+            view.release()
+            shm.close()
+        return day, _compute_day_frame(day_df, day, bucketing), None
+    except Exception as e:
+        return day, None, str(e)
+
+def _compute_day_pickled(task: Tuple[pd.DataFrame, str, str]) -> Tuple[str, Optional[DayResult], Optional[str]]:
+    """Worker fallback when shared memory is unavailable: the day's rows are pickled"""
+    day_df, day, bucketing = task
+    try:
+        return day, _compute_day_frame(day_df, day, bucketing), None
+    except Exception as e:
+        return day, None, str(e)
+
+def compute_daily_results(
+    df: pd.DataFrame,
+    days: Optional[Iterable[date]] = None,
+    bucketing: str = 'start',
+    max_workers: Optional[int] = None
+) -> Dict[date, DayResult]:
+    """
+    Compute the hourly matrix and summary of many days in parallel.
+
+    The frame is sorted by start time and partitioned into contiguous day
+    ranges. With pyarrow available it is written once to shared memory as
+    an Arrow IPC stream and every worker maps it zero-copy, converting only
+    its own day to pandas, so the full frame is never pickled per task.
+
+    Args:
+        df: Raw runs covering the days (e.g. the loaded month)
+        days: Days to compute (default: every day present in df)
+        bucketing: 'start' or 'interval' (see process_data_for_dashboard)
+        max_workers: Maximum number of worker processes (default: CPU count)
+
+    Returns:
+        Dictionary of day to {'matrix': (bot_hour_status, display_names, hours), 'summary': dict}
+    """
+    if df is None or df.empty or 'datetimestarted' not in df.columns:
+        return {}
+
+    columns = [col for col in BATCH_COLUMNS if col in df.columns]
+    runs = df[columns].copy()
+    runs['datetimestarted'] = pd.to_datetime(runs['datetimestarted'], errors='coerce')
+    runs = runs.dropna(subset=['datetimestarted']).sort_values('datetimestarted', kind='stable').reset_index(drop=True)
+    if runs.empty:
+        return {}
+
+    # Contiguous row range of every day
+    day_starts = runs['datetimestarted'].dt.normalize().to_numpy()
+    unique_days = np.unique(day_starts)
+    bounds = np.searchsorted(day_starts, np.append(unique_days, unique_days[-1] + np.timedelta64(1, 'D')))
+    ranges = {pd.Timestamp(d).date(): (int(bounds[i]), int(bounds[i + 1])) for i, d in enumerate(unique_days)}
+    if bucketing == 'interval':
+        # A day's range also covers the previous day, whose late runs may carry over into it
+        ranges = {d: (ranges.get(d - timedelta(days=1), (first, end))[0], end) for d, (first, end) in ranges.items()}
+    wanted = [d for d in (days if days is not None else ranges) if d in ranges]
+    if not wanted:
+        return {}
+
+    workers = min(len(wanted), max_workers or os.cpu_count() or 1)
+    results: List[Tuple[str, Optional[DayResult], Optional[str]]] = []
+
+    if workers <= 1:
+        results = [_compute_day_pickled((runs.iloc[slice(*ranges[d])], d.isoformat(), bucketing)) for d in wanted]
+    elif ARROW_AVAILABLE:
+        shm = None
+        try:
+            sink = pa.BufferOutputStream()
+            table = pa.Table.from_pandas(runs, preserve_index=False)
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            buffer = sink.getvalue()
+            del table
+
+            shm = shared_memory.SharedMemory(create=True, size=max(buffer.size, 1))
+            shm.buf[:buffer.size] = memoryview(buffer).cast('B')
+            tasks = [(shm.name, buffer.size, *ranges[d], d.isoformat(), bucketing) for d in wanted]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_compute_day_shared, tasks))
+        except Exception as e:
+            logger.warning(f"Shared-memory batch unavailable ({e}) - pickling day partitions")
+            results = []
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    if not results:
+        tasks = [(runs.iloc[slice(*ranges[d])], d.isoformat(), bucketing) for d in wanted]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_compute_day_pickled, tasks))
+        except Exception as e:
+            logger.warning(f"Process pool unavailable ({e}) - computing days serially")
+            results = [_compute_day_pickled(task) for task in tasks]
+
+    computed: Dict[date, DayResult] = {}
+    for day, result, error in results:
+        if error:
+            logger.error(f"Error computing matrix for {day}: {error}")
+        else:
+            computed[date.fromisoformat(day)] = result
+
+    logger.info(f"Computed {len(computed)} daily matrices with {workers} workers")
+    return computed
+
+class DailyMatrixCache:
+    """
+    Per-day matrices and summaries computed in batches.
+
+    Days are computed once and kept; on each update only days that are new,
+    or listed as still changing (today by default), are recomputed, all of
+    them together in one process-pool batch.
+    """
+
+    def __init__(self, bucketing: str = 'start'):
+        self.bucketing = bucketing
+        self.days: Dict[date, DayResult] = {}
+
+    def update(
+        self,
+        df: pd.DataFrame,
+        refresh_days: Optional[Iterable[date]] = None,
+        max_workers: Optional[int] = None
+    ) -> List[date]:
+        """
+        Compute any day in df that is missing or listed in refresh_days.
+
+        Args:
+            df: Raw runs covering one or more days
+            refresh_days: Days to recompute even if already cached (default: today)
+            max_workers: Maximum number of worker processes (default: CPU count)
+
+        Returns:
+            List of days that were (re)computed
+        """
+        if df is None or df.empty or 'datetimestarted' not in df.columns:
+            return []
+
+        refresh = set(refresh_days) if refresh_days is not None else {date.today()}
+        run_days = pd.to_datetime(df['datetimestarted'], errors='coerce').dt.date.dropna().unique()
+        pending = [d for d in run_days if d not in self.days or d in refresh]
+        if not pending:
+            return []
+
+        self.days.update(compute_daily_results(df, pending, self.bucketing, max_workers))
+        return sorted(pending)
+
+    def get(self, day: date) -> Optional[DayResult]:
+        """Cached result for a day, or None"""
+        return self.days.get(day)
+
+    def summaries(self) -> pd.DataFrame:
+        """Per-day summary table (total_runs, flows, failed, success_rate) indexed by date"""
+        if not self.days:
+            return pd.DataFrame(columns=['total_runs', 'flows', 'failed', 'success_rate'])
+        rows = {day: {k: v for k, v in result['summary'].items() if k != 'status_counts'}
+                for day, result in sorted(self.days.items())}
+        return pd.DataFrame.from_dict(rows, orient='index')
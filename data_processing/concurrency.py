@@ -0,0 +1,235 @@
+"""
+Concurrency module for Bot Monitoring Dashboard
+Service-account load analysis: concurrent runs, peak concurrency per hour and start throughput
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data_processing.processors import RUNNING_STATUSES
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('concurrency')
+
+# Constants
+THROUGHPUT_WINDOW = '5min'  # Sliding window for runs started per owner
+LOAD_COLUMNS = ['owner', 'hour', 'peak_concurrency', 'runs_started', 'peak_starts_per_window']
+
+def _run_intervals(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Owner, start and end of every run.
+
+    Runs still in progress end at now; runs without a usable end time are
+    treated as instantaneous so they still count towards throughput.
+    """
+    # Derive owner names once per distinct account rather than once per row
+    if 'owner' in df.columns:
+        codes, accounts = pd.factorize(df['owner'])
+        names = pd.Series(accounts, dtype=object).astype(str)
+    else:
+        codes, accounts = pd.factorize(df['flowowner'])
+        names = pd.Series(accounts, dtype=object).astype(str).str.replace(' serviceaccount', '').str.title()
+    name_codes, owner_names = pd.factorize(names)
+    owners = pd.Categorical.from_codes(np.where(codes >= 0, name_codes[np.maximum(codes, 0)], -1), owner_names)
+
+    started = pd.to_datetime(df['datetimestarted'], errors='coerce')
+    if 'datetimecompleted' in df.columns:
+        completed = pd.to_datetime(df['datetimecompleted'], errors='coerce')
+    else:
+        completed = pd.Series(pd.NaT, index=df.index)
+    if 'taskstatus' in df.columns:
+        in_progress = df['taskstatus'].isin(RUNNING_STATUSES) & completed.isna()
+        completed = completed.mask(in_progress, pd.Timestamp(now or datetime.now()))
+    completed = completed.where(completed >= started, started)
+
+    runs = pd.DataFrame({
+        'owner': owners,
+        'start': started.to_numpy(),
+        'end': completed.to_numpy(),
+    })
+    return runs.dropna(subset=['start'])
+
+def concurrency_timeline(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Concurrent runs per owner after every start and end event.
+
+    Builds +1 start and -1 end events, sorts them once by (owner, time) with
+    ends before starts at the same instant (back-to-back runs do not
+    overlap), and takes a running sum per owner.
+
+    Args:
+        df: Raw or processed runs with an owner (or flowowner), datetimestarted and datetimecompleted
+        now: End time for runs still in progress (default: datetime.now())
+
+    Returns:
+        pd.DataFrame with owner, time and concurrent (runs active just after the event)
+    """
+    columns = ['owner', 'time', 'concurrent']
+    if df is None or df.empty or 'datetimestarted' not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    return _sweep(_run_intervals(df, now))
+
+def _sweep(runs: pd.DataFrame) -> pd.DataFrame:
+    """Concurrency timeline from the output of _run_intervals"""
+    columns = ['owner', 'time', 'concurrent']
+    runs = runs.dropna(subset=['owner'])
+    if runs.empty:
+        return pd.DataFrame(columns=columns)
+
+    n = len(runs)
+    codes, owners = pd.factorize(runs['owner'], sort=True)
+    event_codes = np.concatenate([codes, codes])
+    times = np.concatenate([runs['start'].to_numpy(), runs['end'].to_numpy()]).astype('datetime64[ns]')
+    deltas = np.concatenate([np.ones(n, dtype=np.int64), -np.ones(n, dtype=np.int64)])
+
+    order = np.lexsort((deltas, times, event_codes))
+    event_codes, times, deltas = event_codes[order], times[order], deltas[order]
+
+    # Running sum per owner: global cumsum minus the total before each owner's first event
+    running = np.cumsum(deltas)
+    owner_starts = np.searchsorted(event_codes, np.arange(len(owners)))
+    offsets = np.where(owner_starts > 0, running[np.maximum(owner_starts - 1, 0)], 0)
+    concurrent = running - offsets[event_codes]
+
+    return pd.DataFrame({
+        'owner': pd.Categorical.from_codes(event_codes, owners),
+        'time': times,
+        'concurrent': concurrent,
+    })
+
+def peak_concurrency_by_hour(timeline: pd.DataFrame) -> pd.DataFrame:
+    """
+    Peak concurrent runs per owner per hour.
+
+    The level carried into each hour from earlier events is included, so an
+    hour covered by a long run without any events of its own still counts.
+
+    Args:
+        timeline: Output of concurrency_timeline
+
+    Returns:
+        pd.DataFrame with owner, hour (start of the hour) and peak_concurrency
+    """
+    columns = ['owner', 'hour', 'peak_concurrency']
+    if timeline is None or timeline.empty:
+        return pd.DataFrame(columns=columns)
+
+    timeline = timeline.assign(hour=timeline['time'].dt.floor('h'))
+    grouped = timeline.groupby(['owner', 'hour'], observed=True)['concurrent']
+    peaks = grouped.max()
+    closing = grouped.last()
+
+    # Fill hours without events with the level carried in from the previous event
+    frames = []
+    for owner, owner_closing in closing.groupby(level=0, observed=True):
+        hours = owner_closing.index.get_level_values(1)
+        full_range = pd.date_range(hours.min(), hours.max(), freq='h')
+        carried = owner_closing.droplevel(0).reindex(full_range).ffill().shift(1).fillna(0)
+        owner_peaks = peaks.loc[owner].reindex(full_range)
+        frames.append(pd.DataFrame({
+            'owner': owner,
+            'hour': full_range,
+            'peak_concurrency': np.fmax(owner_peaks.to_numpy(dtype=float), carried.to_numpy(dtype=float)),
+        }))
+
+    result = pd.concat(frames, ignore_index=True)
+    result['peak_concurrency'] = result['peak_concurrency'].astype(int)
+    return result[columns]
+
+def start_throughput(df: pd.DataFrame, window: str = THROUGHPUT_WINDOW) -> pd.DataFrame:
+    """
+    Runs started per owner in the sliding window ending at each start.
+
+    Starts are sorted once by (owner, time); the number of starts in
+    (t - window, t] is a pair of searchsorted lookups per start.
+
+    Args:
+        df: Raw or processed runs with an owner (or flowowner) and datetimestarted
+        window: Sliding window length (pandas offset string, default '5min')
+
+    Returns:
+        pd.DataFrame with owner, time and runs_in_window
+    """
+    columns = ['owner', 'time', 'runs_in_window']
+    if df is None or df.empty or 'datetimestarted' not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    return _throughput(_run_intervals(df), window)
+
+def _throughput(runs: pd.DataFrame, window: str) -> pd.DataFrame:
+    """Sliding-window start counts from the output of _run_intervals"""
+    columns = ['owner', 'time', 'runs_in_window']
+    runs = runs.dropna(subset=['owner'])
+    if runs.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, owners = pd.factorize(runs['owner'], sort=True)
+    starts = runs['start'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    order = np.lexsort((starts, codes))
+    codes, starts = codes[order], starts[order]
+
+    # Offset each owner's timestamps so (owner, time) sorts as one int64 key
+    span = int(starts.max() - starts.min()) + 2 * pd.Timedelta(window).value + 1
+    keys = codes.astype(np.int64) * span + (starts - starts.min())
+    window_start = keys - pd.Timedelta(window).value
+    counts = np.searchsorted(keys, keys, side='right') - np.searchsorted(keys, window_start, side='right')
+
+    return pd.DataFrame({
+        'owner': pd.Categorical.from_codes(codes, owners),
+        'time': starts.astype('datetime64[ns]'),
+        'runs_in_window': counts,
+    })
+
+def summarize_owner_load(
+    df: pd.DataFrame,
+    now: Optional[datetime] = None,
+    window: str = THROUGHPUT_WINDOW
+) -> pd.DataFrame:
+    """
+    Hourly load per owner for capacity planning.
+
+    Args:
+        df: Raw or processed runs (a month of data is fine)
+        now: End time for runs still in progress (default: datetime.now())
+        window: Sliding window for start throughput (default: '5min')
+
+    Returns:
+        pd.DataFrame with LOAD_COLUMNS: peak concurrent runs, runs started and
+        the most runs started within any sliding window, per owner and hour
+    """
+    if df is None or df.empty or 'datetimestarted' not in df.columns:
+        return pd.DataFrame(columns=LOAD_COLUMNS)
+
+    try:
+        runs = _run_intervals(df, now)
+        load = peak_concurrency_by_hour(_sweep(runs))
+        throughput = _throughput(runs, window)
+        if load.empty:
+            return pd.DataFrame(columns=LOAD_COLUMNS)
+
+        throughput['hour'] = throughput['time'].dt.floor('h')
+        starts = throughput.groupby(['owner', 'hour'], observed=True).agg(
+            runs_started=('runs_in_window', 'size'),
+            peak_starts_per_window=('runs_in_window', 'max')
+        ).reset_index()
+
+        starts['owner'] = starts['owner'].astype(str)
+        load = load.merge(starts, on=['owner', 'hour'], how='left')
+        load[['runs_started', 'peak_starts_per_window']] = load[['runs_started', 'peak_starts_per_window']].fillna(0).astype(int)
+        logger.info(f"Computed load for {load['owner'].nunique()} owners over {load['hour'].nunique()} hours")
+        return load[LOAD_COLUMNS]
+    except Exception as e:
+        logger.error(f"Error summarizing owner load: {e}")
+        return pd.DataFrame(columns=LOAD_COLUMNS)
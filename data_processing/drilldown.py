@@ -0,0 +1,146 @@
+"""
+Drill-down module for Bot Monitoring Dashboard
+Fetches the individual runs behind a (flow, hour) matrix cell on demand, with an LRU cache of detail pages
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('drilldown')
+
+# Constants
+DETAIL_COLUMNS = ['datetimestarted', 'datetimecompleted', 'taskstatus', 'triggertype', 'duration_seconds', 'flowguid']
+DETAIL_CACHE_SIZE = 64  # Detail pages kept per session
+
+def format_run_details(runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shape raw or processed runs as a drill-down page.
+
+    Args:
+        runs: Runs of one cell with at least datetimestarted and taskstatus
+
+    Returns:
+        pd.DataFrame with DETAIL_COLUMNS (those available), oldest run first
+    """
+    if runs is None or runs.empty:
+        return pd.DataFrame(columns=DETAIL_COLUMNS)
+
+    details = runs.copy()
+    details['datetimestarted'] = pd.to_datetime(details['datetimestarted'], errors='coerce')
+    if 'datetimecompleted' in details.columns:
+        details['datetimecompleted'] = pd.to_datetime(details['datetimecompleted'], errors='coerce')
+        details['duration_seconds'] = (details['datetimecompleted'] - details['datetimestarted']).dt.total_seconds()
+
+    columns = [col for col in DETAIL_COLUMNS if col in details.columns]
+    return details.sort_values('datetimestarted', kind='stable')[columns].reset_index(drop=True)
+
+class CellRunIndex:
+    """
+    Row index from (display_name, hour) matrix cells to the runs behind them.
+
+    Built once per data snapshot with one factorize + argsort over the cell
+    key, so every drill-down is a slice of precomputed positions instead of
+    a scan of the day's runs. Built over interval-bucketed data, a cell
+    lists every run active in that hour.
+    """
+
+    def __init__(self, processed_df: pd.DataFrame):
+        self.df = processed_df
+        names = processed_df['display_name']
+        hours = pd.to_numeric(processed_df['hour'], errors='coerce').fillna(-1).astype(np.int64).to_numpy()
+
+        name_codes, self.names = pd.factorize(names)
+        keys = np.where(name_codes >= 0, name_codes.astype(np.int64) * 24 + hours, -1)
+        keys[(hours < 0) | (hours > 23)] = -1
+
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+        self.name_codes = {name: code for code, name in enumerate(self.names)}
+        logger.info(f"Built cell run index over {len(processed_df)} rows and {len(self.names)} flows")
+
+    def positions(self, display_name: str, hour: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Row positions of the runs in one cell, in original row order.
+
+        Args:
+            display_name: Flow of the cell
+            hour: Hour of the cell
+            rows: Sorted row positions to restrict the cell to (e.g. FilterIndex.select); None keeps all
+
+        Returns:
+            Array of row positions
+        """
+        code = self.name_codes.get(display_name)
+        if code is None:
+            return np.array([], dtype=np.intp)
+        key = code * 24 + int(hour)
+        start, stop = np.searchsorted(self.sorted_keys, [key, key + 1])
+        positions = self.order[start:stop]
+        if rows is not None:
+            if len(rows) == 0:
+                return rows[:0]
+            # Membership in the sorted selection by binary search
+            found = np.searchsorted(rows, positions)
+            positions = positions[(found < len(rows)) & (rows[np.minimum(found, len(rows) - 1)] == positions)]
+        return positions
+
+    def runs(self, display_name: str, hour: int, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Drill-down page of one cell, optionally restricted to selected rows (see format_run_details)"""
+        return format_run_details(self.df.iloc[self.positions(display_name, hour, rows)])
+
+class DrillDownCache:
+    """
+    LRU cache of drill-down pages.
+
+    Keys identify the data snapshot and the cell, so a new snapshot never
+    serves stale pages; the least recently viewed pages are evicted first.
+    """
+
+    def __init__(self, max_entries: int = DETAIL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[Hashable, pd.DataFrame]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Cached page for key, fetching and caching it on a miss.
+
+        Args:
+            key: Snapshot and cell identifier
+            fetch: Callable returning the page
+
+        Returns:
+            pd.DataFrame: The drill-down page
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        page = fetch()
+        self.entries[key] = page
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        """Drop every cached page"""
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        """Entry count, hits and misses"""
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
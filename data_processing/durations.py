@@ -0,0 +1,272 @@
+"""
+Run duration analytics for Bot Monitoring Dashboard
+Computes per-flow duration percentiles with mergeable quantile sketches
+"""
+
+import math
+import logging
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('duration_analytics')
+
+# Constants
+RELATIVE_ACCURACY = 0.01        # Quantiles are within 1% of the true value
+MIN_DURATION = 1e-3             # Durations below this (seconds) share the zero bucket
+REGRESSION_RATIO = 1.5          # p95 this many times the baseline p95 is a regression
+MIN_BASELINE_RUNS = 5           # Fewer baseline runs than this cannot flag a regression
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+def _bucket_indices(values: np.ndarray) -> np.ndarray:
+    """Logarithmic bucket index per value; values below MIN_DURATION map to the zero bucket"""
+    indices = np.full(values.shape, np.iinfo(np.int64).min, dtype=np.int64)
+    positive = values > MIN_DURATION
+    indices[positive] = np.ceil(np.log(values[positive]) / _LOG_GAMMA).astype(np.int64)
+    return indices
+
+class DurationSketch:
+    """
+    DDSketch-style quantile sketch of run durations in seconds.
+
+    Durations are counted in logarithmically sized buckets, which bounds the
+    relative error of every quantile by RELATIVE_ACCURACY. Sketches only hold
+    bucket counts, so they can be built once per day, merged across days and
+    serialized, without ever sorting raw durations again.
+    """
+
+    ZERO_BUCKET = int(np.iinfo(np.int64).min)
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.max = float('-inf')
+        self.min = float('inf')
+
+    def add(self, durations: Union[Sequence[float], np.ndarray]) -> 'DurationSketch':
+        """Add an array of durations (seconds); NaN and negative values are ignored"""
+        values = np.asarray(durations, dtype=float)
+        values = values[~np.isnan(values) & (values >= 0)]
+        if values.size == 0:
+            return self
+
+        buckets, counts = np.unique(_bucket_indices(values), return_counts=True)
+        self._add_buckets(buckets, counts, float(values.min()), float(values.max()))
+        return self
+
+    def _add_buckets(self, buckets: Iterable[int], counts: Iterable[int], low: float, high: float) -> None:
+        """Add pre-bucketed counts along with the exact extremes they came from"""
+        for bucket, count in zip(buckets, counts):
+            bucket = int(bucket)
+            self.counts[bucket] = self.counts.get(bucket, 0) + int(count)
+            self.count += int(count)
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def merge(self, other: 'DurationSketch') -> 'DurationSketch':
+        """Merge another sketch into this one in place"""
+        if other.count:
+            self._add_buckets(other.counts.keys(), other.counts.values(), other.min, other.max)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-th quantile of the added durations.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated duration in seconds (NaN if the sketch is empty)
+        """
+        if self.count == 0:
+            return float('nan')
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        buckets = sorted(self.counts)
+        cumulative = np.cumsum([self.counts[b] for b in buckets])
+        position = int(np.searchsorted(cumulative, q * (self.count - 1), side='right'))
+        bucket = buckets[min(position, len(buckets) - 1)]
+        if bucket == self.ZERO_BUCKET:
+            return 0.0
+
+        estimate = 2 * _GAMMA ** bucket / (_GAMMA + 1)
+        return min(max(estimate, self.min), self.max)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serializable representation of the sketch"""
+        return {
+            'counts': {str(k): v for k, v in self.counts.items()},
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'DurationSketch':
+        """Rebuild a sketch from to_dict output"""
+        sketch = cls()
+        sketch.counts = {int(k): int(v) for k, v in data.get('counts', {}).items()}
+        sketch.count = int(data.get('count', 0))
+        sketch.min = float(data.get('min', float('inf')))
+        sketch.max = float(data.get('max', float('-inf')))
+        return sketch
+
+def compute_run_durations(df: pd.DataFrame) -> pd.Series:
+    """
+    Compute run durations in seconds from datetimestarted and datetimecompleted.
+
+    Args:
+        df: DataFrame with run start and completion times
+
+    Returns:
+        Series of durations aligned to df (NaN for running or invalid runs)
+    """
+    if df is None or df.empty or 'datetimecompleted' not in df.columns:
+        return pd.Series(np.nan, index=df.index if df is not None else None, dtype=float)
+
+    started = pd.to_datetime(df['datetimestarted'], errors='coerce')
+    completed = pd.to_datetime(df['datetimecompleted'], errors='coerce')
+    durations = (completed - started).dt.total_seconds()
+    return durations.where(durations >= 0)
+
+def build_duration_sketches(df: pd.DataFrame, by: Union[str, List[str]] = 'flowname') -> Dict[Hashable, DurationSketch]:
+    """
+    Build one sketch per group with a single vectorized pass.
+
+    Durations are bucketed for all rows at once and counted per
+    (group, bucket), so no group's durations are ever sorted.
+
+    Args:
+        df: DataFrame with run start/completion times and the grouping columns
+        by: Column or columns to group by (e.g. 'flowname' or ['flowname', 'hour'])
+
+    Returns:
+        Dictionary of group key to DurationSketch
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    if df is None or df.empty or any(col not in df.columns for col in keys):
+        return {}
+
+    durations = compute_run_durations(df)
+    valid = durations.notna()
+    if not valid.any():
+        return {}
+
+    frame = df.loc[valid, keys].copy()
+    frame['_duration'] = durations[valid].to_numpy()
+    frame['_bucket'] = _bucket_indices(frame['_duration'].to_numpy())
+
+    group_key = keys[0] if len(keys) == 1 else keys
+    extremes = frame.groupby(group_key, observed=True)['_duration'].agg(['min', 'max'])
+    bucket_counts = frame.groupby(keys + ['_bucket'], observed=True).size()
+
+    sketches: Dict[Hashable, DurationSketch] = {}
+    group_levels = list(range(len(keys))) if len(keys) > 1 else 0
+    for group, counts in bucket_counts.groupby(level=group_levels, observed=True):
+        sketch = DurationSketch()
+        low, high = extremes.loc[group]
+        sketch._add_buckets(counts.index.get_level_values('_bucket'), counts.to_numpy(), low, high)
+        sketches[group] = sketch
+
+    return sketches
+
+class DailyDurationSketches:
+    """
+    Per-day, per-flow duration sketches maintained incrementally.
+
+    Days are sketched once and kept; on each update only days that are new,
+    or listed as still changing (today by default), are rebuilt. Any range of
+    days is summarized by merging the stored daily sketches.
+    """
+
+    def __init__(self):
+        self.days: Dict[date, Dict[Hashable, DurationSketch]] = {}
+
+    def update(self, df: pd.DataFrame, refresh_days: Optional[Iterable[date]] = None) -> List[date]:
+        """
+        Sketch any day in df that is missing or listed in refresh_days.
+
+        Args:
+            df: Raw or processed run data covering one or more days
+            refresh_days: Days to rebuild even if already sketched (default: today)
+
+        Returns:
+            List of days that were (re)built
+        """
+        if df is None or df.empty or 'datetimestarted' not in df.columns:
+            return []
+
+        refresh = set(refresh_days) if refresh_days is not None else {date.today()}
+        run_days = pd.to_datetime(df['datetimestarted'], errors='coerce').dt.date
+        pending = [d for d in run_days.dropna().unique() if d not in self.days or d in refresh]
+
+        for day in pending:
+            self.days[day] = build_duration_sketches(df[run_days == day], 'flowname')
+
+        if pending:
+            logger.info(f"Built duration sketches for {len(pending)} days")
+        return sorted(pending)
+
+    def merged(self, days: Iterable[date]) -> Dict[Hashable, DurationSketch]:
+        """Merge the per-flow sketches of the given days"""
+        result: Dict[Hashable, DurationSketch] = {}
+        for day in days:
+            for flow, sketch in self.days.get(day, {}).items():
+                result.setdefault(flow, DurationSketch()).merge(sketch)
+        return result
+
+def summarize_durations(
+    sketches: Dict[Hashable, DurationSketch],
+    baseline: Optional[Dict[Hashable, DurationSketch]] = None,
+    regression_ratio: float = REGRESSION_RATIO
+) -> pd.DataFrame:
+    """
+    Summarize sketches into a percentile table with regression flags.
+
+    Args:
+        sketches: Group key to sketch for the period being inspected
+        baseline: Group key to sketch for the comparison period (optional)
+        regression_ratio: p95 / baseline p95 ratio at which a flow is flagged
+
+    Returns:
+        pd.DataFrame indexed by group with runs, p50/p95/p99/max (seconds) and,
+        when a baseline is given, baseline_p95, p95_ratio and regressed columns
+    """
+    rows = []
+    for key, sketch in sketches.items():
+        row = {'group': key, 'runs': sketch.count}
+        for q in SUMMARY_QUANTILES:
+            row[f"p{int(q * 100)}"] = sketch.quantile(q)
+        row['max'] = sketch.max
+        if baseline is not None:
+            base = baseline.get(key)
+            base_p95 = base.quantile(0.95) if base is not None and base.count >= MIN_BASELINE_RUNS else np.nan
+            row['baseline_p95'] = base_p95
+            row['p95_ratio'] = row['p95'] / base_p95 if base_p95 and not np.isnan(base_p95) else np.nan
+        rows.append(row)
+
+    if not rows:
+        return pd.DataFrame()
+
+    summary = pd.DataFrame(rows).set_index('group')
+    if baseline is not None:
+        summary['regressed'] = summary['p95_ratio'] >= regression_ratio
+        summary = summary.sort_values('p95_ratio', ascending=False)
+    return summary
@@ -0,0 +1,526 @@
+"""
+Execution engine module for Bot Monitoring Dashboard
+Pluggable pandas and DuckDB backends for the hourly matrix and run summaries, in memory or over local Parquet/CSV files
+"""
+
+import os
+import glob
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from data_processing.processors import (
+    RUNNING_STATUSES, BUCKETING_MODES, FilterSelection, label_flows, normalize_filters,
+    process_data_for_dashboard, create_hourly_matrix, status_priority_sql
+)
+from data_processing.validators import validate_matrix_data
+from data_processing.batch import summarize_day
+from data_storage.csv_ingest import read_flow_csv
+
+# DuckDB is optional - without it only the pandas engine is available
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('execution_engine')
+
+# Constants
+ENGINE_NAMES = ('pandas', 'duckdb')
+DEFAULT_ENGINE = os.getenv('PROCESSING_ENGINE', 'pandas')
+ENGINE_THREADS = int(os.getenv('ENGINE_THREADS', '0'))  # 0 lets DuckDB use every core
+SUMMARY_COLUMNS = ['total_runs', 'flows', 'failed', 'success_rate']
+
+# A run source is an in-memory frame or Parquet/CSV files (paths, directories or globs)
+RunSource = Union[pd.DataFrame, str, Path, Sequence[Union[str, Path]]]
+
+Matrix = Tuple[Dict[str, Dict[int, str]], List[str], List[int]]
+
+def resolve_source_files(source: Union[str, Path, Sequence[Union[str, Path]]]) -> Tuple[List[str], str]:
+    """
+    Expand paths, directories and globs into a sorted list of run files.
+
+    Directories are searched recursively for Parquet files, then for CSV
+    files if they hold no Parquet.
+
+    Args:
+        source: A path, directory or glob, or a list of them
+
+    Returns:
+        tuple: (sorted file paths, 'parquet' or 'csv')
+
+    Raises:
+        FileNotFoundError: If nothing matches
+        ValueError: If Parquet and CSV files are mixed
+    """
+    patterns = [source] if isinstance(source, (str, Path)) else list(source)
+    files = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            found = sorted(path.rglob('*.parquet')) or sorted(path.rglob('*.csv'))
+            files.update(str(p) for p in found)
+        elif path.is_file():
+            files.add(str(path))
+        else:
+            files.update(glob.glob(str(pattern), recursive=True))
+
+    if not files:
+        raise FileNotFoundError(f"No run files found for {source}")
+
+    suffixes = {Path(f).suffix.lower() for f in files}
+    if suffixes == {'.parquet'}:
+        return sorted(files), 'parquet'
+    if suffixes == {'.csv'}:
+        return sorted(files), 'csv'
+    raise ValueError(f"Run files must be all Parquet or all CSV, got {sorted(suffixes)}")
+
+def _day_bounds(day: Any) -> Tuple[datetime, datetime]:
+    """Start and end (exclusive) of a day given as a date, datetime or string"""
+    start = pd.Timestamp(pd.to_datetime(day).date()).to_pydatetime()
+    return start, start + timedelta(days=1)
+
+class PandasEngine:
+    """
+    Reference engine: loads runs into pandas and runs the processors pipeline.
+
+    Every engine exposes the same methods (hourly_matrix, summarize,
+    daily_summaries); this one defines the expected output of the others.
+    """
+
+    name = 'pandas'
+
+    def load(self, source: RunSource) -> pd.DataFrame:
+        """Raw runs of a source as one DataFrame (files are read in sorted order)"""
+        if isinstance(source, pd.DataFrame):
+            return source
+        files, file_format = resolve_source_files(source)
+        reader = pd.read_parquet if file_format == 'parquet' else read_flow_csv
+        return pd.concat([reader(f) for f in files], ignore_index=True)
+
+    def hourly_matrix(
+        self,
+        source: RunSource,
+        day: Any,
+        selected_project: FilterSelection = 'All Projects',
+        selected_status: FilterSelection = 'All Statuses',
+        max_rows: int = 300,
+        selected_owner: FilterSelection = 'All Owners',
+        selected_trigger: FilterSelection = 'All Triggers',
+        bucketing: str = 'start',
+        now: Optional[datetime] = None
+    ) -> Matrix:
+        """
+        Hourly matrix of one day (see create_hourly_matrix).
+
+        Args:
+            source: Runs as a DataFrame or Parquet/CSV files
+            day: Day to build the matrix for
+            selected_project, selected_status, selected_owner, selected_trigger: Filters (single value or list)
+            max_rows: Maximum number of rows to display
+            bucketing: 'start' or 'interval' (see process_data_for_dashboard)
+            now: End time for runs still in progress in 'interval' mode
+
+        Returns:
+            tuple: (bot_hour_status, display_names, hours)
+        """
+        processed_df = process_data_for_dashboard(self.load(source), day_filter=day, bucketing=bucketing, now=now)
+        return create_hourly_matrix(
+            processed_df, selected_project, selected_status, max_rows, selected_owner, selected_trigger
+        )
+
+    def summarize(self, source: RunSource, day: Any, bucketing: str = 'start') -> Dict[str, Any]:
+        """Headline numbers of one day (see summarize_day; runs count once in either bucketing mode)"""
+        return summarize_day(process_data_for_dashboard(self.load(source), day_filter=day, bucketing=bucketing))
+
+    def daily_summaries(
+        self,
+        source: RunSource,
+        start: Any = None,
+        end: Any = None,
+        bucketing: str = 'start'
+    ) -> pd.DataFrame:
+        """
+        Per-day summary table over a date range.
+
+        Args:
+            source: Runs as a DataFrame or Parquet/CSV files
+            start: First day to include (default: earliest)
+            end: Last day to include (default: latest)
+            bucketing: 'start' or 'interval'; runs are counted once on their start day in either mode
+
+        Returns:
+            pd.DataFrame indexed by date with SUMMARY_COLUMNS
+        """
+        processed_df = process_data_for_dashboard(self.load(source), bucketing=bucketing)
+        if processed_df.empty:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        days = pd.to_datetime(processed_df['datetimestarted'], errors='coerce').dt.date
+        in_range = days.notna()
+        if start is not None:
+            in_range &= days >= _day_bounds(start)[0].date()
+        if end is not None:
+            in_range &= days <= _day_bounds(end)[0].date()
+        processed_df, days = processed_df[in_range], days[in_range]
+        rows = {
+            day: {k: v for k, v in summarize_day(day_df).items() if k != 'status_counts'}
+            for day, day_df in processed_df.groupby(days, sort=True)
+        }
+        if not rows:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        return pd.DataFrame.from_dict(rows, orient='index')[SUMMARY_COLUMNS]
+
+class DuckDBEngine:
+    """
+    DuckDB engine: filtering and aggregation run as multi-threaded SQL.
+
+    Runs are scanned in place, whether a registered DataFrame or Parquet/CSV
+    files, and only flows x 24 cells and per-day totals come back to Python.
+    Owner names, projects and display names are derived in Python once per
+    distinct (flowowner, flowname) pair with the same functions as the
+    pandas path, then joined back in SQL, so outputs match the pandas engine
+    (checked by compare_engines). Ties at the max_rows cut-off follow source
+    row order; for CSV files that relies on DuckDB preserving insertion order.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, threads: int = ENGINE_THREADS):
+        if not DUCKDB_AVAILABLE:
+            raise ImportError("duckdb is not installed - install it or use the pandas engine")
+        self.threads = threads
+
+    def _connect(self, source: RunSource) -> 'duckdb.DuckDBPyConnection':
+        """Connection with a normalized `runs` view over the source"""
+        con = duckdb.connect()
+        if self.threads:
+            con.execute(f"SET threads = {int(self.threads)}")
+
+        if isinstance(source, pd.DataFrame):
+            # _row keeps the frame's row order for first-appearance ordering
+            con.register('source_runs', source.assign(_row=np.arange(len(source))))
+            scan, row_expr = 'source_runs', '_row'
+        else:
+            files, file_format = resolve_source_files(source)
+            file_list = '[' + ', '.join("'" + f.replace("'", "''") + "'" for f in files) + ']'
+            if file_format == 'parquet':
+                scan = f"read_parquet({file_list}, filename = true, file_row_number = true, union_by_name = true)"
+                row_expr = 'struct_pack(f := filename, r := file_row_number)'
+            else:
+                scan = f"read_csv({file_list}, filename = true, union_by_name = true)"
+                row_expr = 'struct_pack(f := filename, r := row_number() OVER (PARTITION BY filename))'
+
+        columns = set(con.execute(f"SELECT * FROM {scan} LIMIT 0").df().columns)
+
+        def text(column: str, default: str = 'NULL') -> str:
+            return f"CAST({column} AS VARCHAR)" if column in columns else default
+
+        success_expr = (
+            "TRY_CAST(wassuccessful AS DOUBLE)" if 'wassuccessful' in columns
+            else "CASE WHEN CAST(taskstatus AS VARCHAR) = 'Succeeded' THEN 1 ELSE 0 END"
+        )
+        con.execute(f"""
+            CREATE TEMP VIEW runs AS
+            SELECT
+                {text('flowname')} AS flowname,
+                {text('flowowner')} AS flowowner,
+                {text('taskstatus')} AS taskstatus,
+                {'TRY_CAST(datetimestarted AS TIMESTAMP)' if 'datetimestarted' in columns else 'NULL::TIMESTAMP'} AS started,
+                {'TRY_CAST(datetimecompleted AS TIMESTAMP)' if 'datetimecompleted' in columns else 'NULL::TIMESTAMP'} AS completed,
+                {success_expr} AS wassuccessful,
+                {text('triggertype', "'unknown'")} AS triggertype,
+                {row_expr} AS _row
+            FROM {scan}
+        """)
+        return con
+
+    def hourly_matrix(
+        self,
+        source: RunSource,
+        day: Any,
+        selected_project: FilterSelection = 'All Projects',
+        selected_status: FilterSelection = 'All Statuses',
+        max_rows: int = 300,
+        selected_owner: FilterSelection = 'All Owners',
+        selected_trigger: FilterSelection = 'All Triggers',
+        bucketing: str = 'start',
+        now: Optional[datetime] = None
+    ) -> Matrix:
+        """Hourly matrix of one day; same arguments and output as PandasEngine.hourly_matrix"""
+        hours = list(range(24))
+        start, end = _day_bounds(day)
+        filters = normalize_filters(selected_project, selected_status, selected_owner, selected_trigger)
+        if bucketing not in BUCKETING_MODES:
+            logger.warning(f"Unknown bucketing mode '{bucketing}' - using start hour")
+            bucketing = 'start'
+
+        if bucketing == 'interval':
+            # Runs still in progress extend to now; runs carried over from earlier days count from hour 0
+            running = ', '.join(f"'{status}'" for status in sorted(RUNNING_STATUSES))
+            ended = f"CASE WHEN r.taskstatus IN ({running}) AND r.completed IS NULL THEN ? ELSE r.completed END"
+            now_value = pd.Timestamp(now or datetime.now()).to_pydatetime()
+            window = f"r.started < ? AND (r.started >= ? OR {ended} >= ?)"
+            window_params: List[Any] = [end, start, now_value, start]
+            first_hour = "CASE WHEN r.started < ? THEN 0 ELSE hour(r.started) END"
+            hour_expr = (
+                f"UNNEST(range({first_hour}, least(greatest(coalesce(date_diff('hour', ?, "
+                f"date_trunc('hour', {ended})), {first_hour}), {first_hour}), 23) + 1))"
+            )
+            hour_params: List[Any] = [start, start, now_value, start, start]
+        else:
+            window = "r.started >= ? AND r.started < ?"
+            window_params = [start, end]
+            hour_expr = "hour(r.started)"
+            hour_params = []
+
+        con = self._connect(source)
+        try:
+            # Labels for every distinct flow of the day, derived once per flow
+            labels = label_flows(con.execute(
+                f"SELECT DISTINCT r.flowowner, r.flowname FROM runs r "
+                f"WHERE {window} AND r.flowowner IS NOT NULL AND r.flowname IS NOT NULL",
+                window_params
+            ).df())
+            for column in ('owner', 'automation_project'):
+                if filters[column] is not None:
+                    labels = labels[labels[column].isin(filters[column])]
+            if labels.empty:
+                logger.warning("No data after filtering")
+                return {}, [], hours
+            con.register('labels', labels[['flowowner', 'flowname', 'display_name']])
+
+            conditions = [window]
+            params: List[Any] = hour_params + window_params
+            if filters['taskstatus'] is not None:
+                conditions.append("list_contains(?, r.taskstatus)")
+                params.append(list(filters['taskstatus']))
+            if filters['trigger_group'] is not None:
+                conditions.append(
+                    "list_contains(?, CASE WHEN r.triggertype = 'manual' THEN 'Manual' "
+                    "WHEN r.triggertype = 'Recurrence' THEN 'Recurrence' ELSE 'OtherTrigger' END)"
+                )
+                params.append(list(filters['trigger_group']))
+
+            con.execute(f"""
+                CREATE TEMP TABLE filtered AS
+                SELECT l.display_name, r._row, r.taskstatus, {status_priority_sql('r.taskstatus')} AS priority,
+                       {hour_expr} AS hour
+                FROM runs r JOIN labels l ON r.flowowner = l.flowowner AND r.flowname = l.flowname
+                WHERE {' AND '.join(conditions)}
+            """, params)
+
+            # Flows in first-appearance order, scored like create_hourly_matrix
+            names = con.execute("""
+                SELECT display_name,
+                       count(*) FILTER (WHERE taskstatus = 'Failed') * 100
+                       + count(*) FILTER (WHERE taskstatus = 'Running') * 10 + count(*) AS score
+                FROM filtered GROUP BY display_name ORDER BY min(_row)
+            """).df()
+            if names.empty:
+                logger.warning("No data after filtering")
+                return {}, [], hours
+            if len(names) > max_rows:
+                logger.warning(f"Too many display names ({len(names)}), using intelligent selection")
+                names = names.sort_values('score', ascending=False, kind='stable').head(max_rows)
+            display_names = names['display_name'].tolist()
+
+            # Highest priority status per cell; ties resolve to the alphabetically first status
+            cells = con.execute("""
+                SELECT display_name, hour, first(taskstatus ORDER BY priority DESC, taskstatus ASC NULLS LAST) AS status
+                FROM filtered WHERE hour BETWEEN 0 AND 23 GROUP BY display_name, hour
+            """).df()
+        finally:
+            con.close()
+
+        bot_hour_status = {name: {hour: "No Run" for hour in hours} for name in display_names}
+        for name, hour, status in zip(cells['display_name'], cells['hour'], cells['status']):
+            if name in bot_hour_status:
+                bot_hour_status[name][int(hour)] = status
+
+        is_valid, message, validated_data = validate_matrix_data(bot_hour_status, display_names, hours)
+        if not is_valid:
+            logger.warning(f"Matrix validation warning: {message}")
+        return validated_data
+
+    def _summary_rows(self, source: RunSource, start: Optional[datetime], end: Optional[datetime]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Per-day totals and per-day status counts"""
+        conditions = ["started IS NOT NULL"]
+        params: List[Any] = []
+        if start is not None:
+            conditions.append("started >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("started < ?")
+            params.append(end)
+        where = ' AND '.join(conditions)
+
+        con = self._connect(source)
+        try:
+            totals = con.execute(f"""
+                SELECT CAST(started AS DATE) AS day, count(*) AS total_runs, count(DISTINCT flowname) AS flows,
+                       count(*) FILTER (WHERE taskstatus = 'Failed') AS failed,
+                       sum(wassuccessful) AS successes, count(wassuccessful) AS rated
+                FROM runs WHERE {where} GROUP BY 1 ORDER BY 1
+            """, params).df()
+            statuses = con.execute(f"""
+                SELECT CAST(started AS DATE) AS day, taskstatus, count(*) AS runs
+                FROM runs WHERE {where} AND taskstatus IS NOT NULL GROUP BY 1, 2
+            """, params).df()
+        finally:
+            con.close()
+
+        if not totals.empty:
+            # Rates are rounded in Python so they match the pandas path exactly
+            totals['success_rate'] = [
+                round(float(s / n * 100), 1) if n else float('nan')
+                for s, n in zip(totals['successes'], totals['rated'])
+            ]
+            totals['day'] = pd.to_datetime(totals['day']).dt.date
+            statuses['day'] = pd.to_datetime(statuses['day']).dt.date
+        return totals, statuses
+
+    def summarize(self, source: RunSource, day: Any, bucketing: str = 'start') -> Dict[str, Any]:
+        """
+        Headline numbers of one day; same output as PandasEngine.summarize.
+
+        Summaries count every run once on its start day, so they are the same
+        for both bucketing modes and are aggregated from start times here.
+        """
+        totals, statuses = self._summary_rows(source, *_day_bounds(day))
+        if totals.empty:
+            return {'total_runs': 0, 'flows': 0, 'failed': 0, 'success_rate': None, 'status_counts': {}}
+        row = totals.iloc[0]
+        statuses = statuses.sort_values(['runs', 'taskstatus'], ascending=[False, True])
+        return {
+            'total_runs': int(row['total_runs']),
+            'flows': int(row['flows']),
+            'failed': int(row['failed']),
+            'success_rate': row['success_rate'],
+            'status_counts': {str(k): int(v) for k, v in zip(statuses['taskstatus'], statuses['runs'])},
+        }
+
+    def daily_summaries(
+        self,
+        source: RunSource,
+        start: Any = None,
+        end: Any = None,
+        bucketing: str = 'start'
+    ) -> pd.DataFrame:
+        """Per-day summary table over a date range; same output as PandasEngine.daily_summaries in both bucketing modes"""
+        totals, _ = self._summary_rows(
+            source,
+            _day_bounds(start)[0] if start is not None else None,
+            _day_bounds(end)[1] if end is not None else None
+        )
+        if totals.empty:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        return totals.set_index('day').rename_axis(None)[SUMMARY_COLUMNS]
+
+def get_engine(name: Optional[str] = None) -> Union[PandasEngine, DuckDBEngine]:
+    """
+    Engine by name, falling back to pandas when DuckDB is unavailable.
+
+    Args:
+        name: 'pandas' or 'duckdb' (default: PROCESSING_ENGINE environment variable, else 'pandas')
+
+    Returns:
+        Engine instance
+    """
+    name = (name or DEFAULT_ENGINE).lower()
+    if name not in ENGINE_NAMES:
+        logger.warning(f"Unknown engine '{name}' - using pandas")
+        return PandasEngine()
+    if name == 'duckdb':
+        if DUCKDB_AVAILABLE:
+            return DuckDBEngine()
+        logger.warning("duckdb is not installed - using pandas engine")
+    return PandasEngine()
+
+def compare_engines(
+    source: RunSource,
+    day: Any,
+    filter_sets: Optional[Sequence[Dict[str, Any]]] = None,
+    bucketing: str = 'start',
+    now: Optional[datetime] = None,
+    engine: Optional[DuckDBEngine] = None
+) -> List[str]:
+    """
+    Check an engine's outputs against the pandas path on the same runs.
+
+    Compares the hourly matrix for each filter set (default: unfiltered,
+    a small max_rows cut-off, and the day's first project and status), the
+    day's summary and the per-day summaries of the whole source.
+
+    Args:
+        source: Runs as a DataFrame or Parquet/CSV files
+        day: Day to compare matrices and summary for
+        filter_sets: hourly_matrix keyword arguments to compare
+        bucketing: 'start' or 'interval'
+        now: End time for runs still in progress (default: datetime.now(), shared by both engines)
+        engine: Engine under test (default: DuckDBEngine())
+
+    Returns:
+        List of differences (empty when the engines agree)
+    """
+    reference = PandasEngine()
+    engine = engine or DuckDBEngine()
+    now = now or datetime.now()
+    differences = []
+
+    if filter_sets is None:
+        processed_df = process_data_for_dashboard(reference.load(source), day_filter=day)
+        filter_sets = [{}, {'max_rows': 5}]
+        if not processed_df.empty:
+            filter_sets.append({
+                'selected_project': processed_df['automation_project'].dropna().iloc[:1].tolist(),
+                'selected_status': processed_df['taskstatus'].dropna().astype(str).iloc[:1].tolist(),
+            })
+
+    for kwargs in filter_sets:
+        expected = reference.hourly_matrix(source, day, bucketing=bucketing, now=now, **kwargs)
+        actual = engine.hourly_matrix(source, day, bucketing=bucketing, now=now, **kwargs)
+        if actual[1] != expected[1]:
+            differences.append(f"matrix {kwargs}: display names differ ({len(actual[1])} vs {len(expected[1])})")
+        elif actual[0] != expected[0]:
+            cells = [
+                (name, hour) for name in expected[0] for hour in expected[2]
+                if actual[0].get(name, {}).get(hour) != expected[0][name][hour]
+            ]
+            differences.append(f"matrix {kwargs}: {len(cells)} cells differ, e.g. {cells[:3]}")
+
+    expected_summary = reference.summarize(source, day, bucketing)
+    actual_summary = engine.summarize(source, day, bucketing)
+    if actual_summary != expected_summary and not (
+        pd.isna(actual_summary.get('success_rate')) and pd.isna(expected_summary.get('success_rate'))
+        and {k: v for k, v in actual_summary.items() if k != 'success_rate'}
+        == {k: v for k, v in expected_summary.items() if k != 'success_rate'}
+    ):
+        differences.append(f"summary: {actual_summary} vs {expected_summary}")
+
+    expected_daily = reference.daily_summaries(source, bucketing=bucketing)
+    actual_daily = engine.daily_summaries(source, bucketing=bucketing)
+    try:
+        pd.testing.assert_frame_equal(
+            actual_daily.astype(float), expected_daily.astype(float), check_index_type=False
+        )
+    except AssertionError as e:
+        differences.append(f"daily summaries: {e}")
+
+    if differences:
+        logger.warning(f"{engine.name} engine differs from pandas in {len(differences)} checks")
+    else:
+        logger.info(f"{engine.name} engine matches pandas on {len(filter_sets)} matrices and summaries")
+    return differences
@@ -0,0 +1,323 @@
+"""
+Incremental matrix module for Bot Monitoring Dashboard
+Keeps per-cell status counts so refreshes only recompute the cells that changed
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.processors import STATUS_PRIORITY, FilterSelection, normalize_filters
+from data_processing.validators import validate_matrix_data
+from data_storage.csv_ingest import RUN_KEY_COLUMNS
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('incremental_matrix')
+
+# Constants
+HOURS = list(range(24))
+STATE_COLUMNS = ['display_name', 'automation_project', 'hour', 'taskstatus']
+REQUIRED_COLUMNS = STATE_COLUMNS + ['datetimestarted']
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15  # Mixes the cell hash before folding it into the key hash
+
+Cell = Tuple[str, int]
+
+def _highest_priority(counts: Counter) -> str:
+    """Highest priority status with a non-zero count (ties: alphabetically first), or 'No Run'"""
+    present = sorted(status for status, count in counts.items() if count > 0)
+    if not present:
+        return "No Run"
+    return max(present, key=lambda x: STATUS_PRIORITY.get(x, 0))
+
+class HourlyMatrixState:
+    """
+    Incrementally maintained hourly matrix for a single day.
+
+    Holds, for every (display_name, hour) cell, a count of runs per status,
+    and for every run the cell and status it currently contributes. Applying
+    a batch of new or changed runs only touches the cells those runs moved
+    in or out of, so a refresh costs time proportional to the changes rather
+    than to the number of flows.
+    """
+
+    def __init__(self):
+        self.cell_counts: Dict[Cell, Counter] = {}
+        self.cell_status: Dict[Cell, str] = {}
+        self.run_cells: Dict[Hashable, Tuple[str, int, str]] = {}
+        self.projects: Dict[str, str] = {}
+        self.owners: Dict[str, str] = {}
+        # Row hashes of the last frame seen, for vectorized change detection
+        self.row_keys = np.empty(0, dtype='uint64')
+        self.row_values = np.empty(0, dtype='uint64')
+
+    @staticmethod
+    def _key_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Run identifier columns (flow GUID + start time, else display name + start time)"""
+        flow_column = 'flowguid' if all(col in df.columns for col in RUN_KEY_COLUMNS) else 'display_name'
+        keys = pd.DataFrame({
+            'flow': df[flow_column].to_numpy(),
+            'start': pd.to_datetime(df['datetimestarted']).to_numpy()
+        })
+        if 'bucket_offset' in df.columns:
+            # Interval bucketing: a run contributes one row per hour it overlapped
+            keys['offset'] = df['bucket_offset'].to_numpy()
+        return keys
+
+    @classmethod
+    def _run_keys(cls, df: pd.DataFrame) -> np.ndarray:
+        """Run identifiers for each row, as 64-bit hashes of the key columns"""
+        return pd.util.hash_pandas_object(cls._key_frame(df), index=False).to_numpy()
+
+    @classmethod
+    def _row_hashes(cls, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashes of each row's run key and of its key plus cell/status columns"""
+        keys = cls._run_keys(df)
+        cells = pd.util.hash_pandas_object(
+            pd.DataFrame({column: df[column].to_numpy() for column in STATE_COLUMNS}).astype({'taskstatus': str}),
+            index=False
+        ).to_numpy()
+        return keys, keys ^ (cells * np.uint64(HASH_MULTIPLIER))
+
+    @classmethod
+    def from_processed(cls, df: pd.DataFrame) -> 'HourlyMatrixState':
+        """
+        Build the state from a processed DataFrame.
+
+        Args:
+            df: Output of process_data_for_dashboard for one day
+
+        Returns:
+            HourlyMatrixState covering every run in df
+        """
+        state = cls()
+        state.apply_runs(df)
+        if df is not None and not df.empty and all(col in df.columns for col in REQUIRED_COLUMNS):
+            state.row_keys, state.row_values = cls._row_hashes(df)
+        return state
+
+    def changed_runs(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the rows of a processed DataFrame that are new or differ from the last frame seen.
+
+        Rows are compared by hashing their key and cell/status columns and
+        looking the hashes up in the previous frame's, so only the changed
+        subset is ever handled row by row.
+
+        Args:
+            df: Output of process_data_for_dashboard for the same day
+
+        Returns:
+            Subset of df whose run is unknown or whose cell/status changed
+        """
+        if df is None or df.empty or not all(col in df.columns for col in REQUIRED_COLUMNS):
+            return pd.DataFrame()
+
+        _, values = self._row_hashes(df)
+        return df[~pd.Index(values).isin(self.row_values)]
+
+    def apply_runs(self, runs: pd.DataFrame) -> Set[Cell]:
+        """
+        Apply new or changed runs to the state.
+
+        Args:
+            runs: Processed rows for new or changed runs
+
+        Returns:
+            Set of (display_name, hour) cells whose displayed status changed
+        """
+        if runs is None or runs.empty:
+            return set()
+
+        missing = [col for col in REQUIRED_COLUMNS if col not in runs.columns]
+        if missing:
+            logger.error(f"Missing required columns for incremental matrix: {missing}")
+            return set()
+
+        dirty: Set[Cell] = set()
+        keys = self._run_keys(runs).tolist()
+        owners = runs['owner'].tolist() if 'owner' in runs.columns else [None] * len(runs)
+        rows = zip(
+            keys,
+            runs['display_name'].tolist(),
+            runs['automation_project'].tolist(),
+            owners,
+            runs['hour'].tolist(),
+            runs['taskstatus'].astype(str).tolist()
+        )
+
+        for key, name, project, owner, hour, status in rows:
+            if not isinstance(name, str) or not name or pd.isna(hour) or not 0 <= hour <= 23:
+                continue
+            hour = int(hour)
+
+            previous = self.run_cells.get(key)
+            if previous == (name, hour, status):
+                continue
+            if previous is not None:
+                old_cell = (previous[0], previous[1])
+                self.cell_counts[old_cell][previous[2]] -= 1
+                dirty.add(old_cell)
+
+            cell = (name, hour)
+            self.cell_counts.setdefault(cell, Counter())[status] += 1
+            self.run_cells[key] = (name, hour, status)
+            self.projects[name] = project
+            self.owners[name] = owner
+            dirty.add(cell)
+
+        changed_cells = self._recompute(dirty)
+        logger.info(f"Applied {len(keys)} runs: {len(dirty)} cells touched, {len(changed_cells)} changed")
+        return changed_cells
+
+    def remove_runs(self, keys: Iterable[Hashable]) -> Set[Cell]:
+        """
+        Remove runs from the state.
+
+        Args:
+            keys: Run identifiers (see _run_keys) of runs no longer in the data
+
+        Returns:
+            Set of (display_name, hour) cells whose displayed status changed
+        """
+        dirty: Set[Cell] = set()
+        for key in keys:
+            previous = self.run_cells.pop(key, None)
+            if previous is None:
+                continue
+            cell = (previous[0], previous[1])
+            self.cell_counts[cell][previous[2]] -= 1
+            dirty.add(cell)
+
+        changed_cells = self._recompute(dirty)
+        if dirty:
+            logger.info(f"Removed runs from {len(dirty)} cells, {len(changed_cells)} changed")
+        return changed_cells
+
+    def _recompute(self, dirty: Set[Cell]) -> Set[Cell]:
+        """Recompute the displayed status of the touched cells, returning those that changed"""
+        changed_cells = set()
+        for cell in dirty:
+            status = _highest_priority(self.cell_counts[cell])
+            if self.cell_status.get(cell, "No Run") != status:
+                changed_cells.add(cell)
+            self.cell_status[cell] = status
+        return changed_cells
+
+    def to_matrix(
+        self,
+        selected_project: FilterSelection = 'All Projects',
+        selected_status: FilterSelection = 'All Statuses',
+        max_rows: int = 300,
+        selected_owner: FilterSelection = 'All Owners'
+    ) -> Tuple[Dict[str, Dict[int, str]], List[str], List[int]]:
+        """
+        Render the state in the same shape as create_hourly_matrix.
+
+        Trigger types are not tracked per cell; use create_hourly_matrix to
+        filter by trigger group.
+
+        Args:
+            selected_project: Project filter(s) (or 'All Projects')
+            selected_status: Status filter(s) (or 'All Statuses')
+            max_rows: Maximum number of rows to display
+            selected_owner: Owner filter(s) (or 'All Owners')
+
+        Returns:
+            tuple: (bot_hour_status, display_names, hours)
+        """
+        filters = normalize_filters(selected_project, selected_status, selected_owner)
+        projects = filters['automation_project']
+        statuses = filters['taskstatus']
+        owners = filters['owner']
+        names = [
+            name for name, project in self.projects.items()
+            if (projects is None or project in projects) and
+               (owners is None or self.owners.get(name) in owners)
+        ]
+        included = set(names)
+
+        # Walk only the occupied cells rather than every name x hour
+        rows: Dict[str, Dict[int, str]] = {}
+        totals: Dict[str, List[int]] = {}
+        for (name, hour), counts in self.cell_counts.items():
+            if name not in included:
+                continue
+            if statuses is None:
+                selected, status = counts, self.cell_status.get((name, hour), "No Run")
+            else:
+                selected = Counter({status: counts[status] for status in statuses})
+                status = _highest_priority(selected)
+            total = sum(selected.values())
+            if total <= 0:
+                continue
+            rows.setdefault(name, {})[hour] = status
+            tally = totals.setdefault(name, [0, 0, 0])
+            tally[0] += selected['Failed']
+            tally[1] += selected['Running']
+            tally[2] += total
+
+        bot_hour_status: Dict[str, Dict[int, str]] = {}
+        scores: Dict[str, int] = {}
+        for name in names:
+            if name not in rows:
+                continue
+            row = dict.fromkeys(HOURS, "No Run")
+            row.update(rows[name])
+            bot_hour_status[name] = row
+            failed, running, total = totals[name]
+            scores[name] = failed * 100 + running * 10 + total
+
+        display_names = list(bot_hour_status)
+        if len(display_names) > max_rows:
+            logger.warning(f"Too many display names ({len(display_names)}), using intelligent selection")
+            display_names = sorted(display_names, key=lambda n: scores[n], reverse=True)[:max_rows]
+            bot_hour_status = {name: bot_hour_status[name] for name in display_names}
+
+        is_valid, message, validated_data = validate_matrix_data(bot_hour_status, display_names, list(HOURS))
+        if not is_valid:
+            logger.warning(f"Matrix validation warning: {message}")
+            return bot_hour_status, display_names, list(HOURS)
+        return validated_data
+
+def update_hourly_matrix(
+    state: Optional[HourlyMatrixState],
+    processed_df: pd.DataFrame
+) -> Tuple[HourlyMatrixState, Set[Cell]]:
+    """
+    Bring a matrix state up to date with a freshly processed DataFrame.
+
+    Runs in the state that are missing from processed_df (e.g. after an
+    environment filter or a switch of data source) are removed.
+
+    Args:
+        state: Previous state for the same day, or None to build from scratch
+        processed_df: Output of process_data_for_dashboard for that day
+
+    Returns:
+        tuple: (updated state, set of (display_name, hour) cells that changed)
+    """
+    if state is None:
+        return HourlyMatrixState.from_processed(processed_df), set()
+
+    if processed_df is None or processed_df.empty:
+        keys = values = np.empty(0, dtype='uint64')
+        changed = pd.DataFrame()
+    elif all(col in processed_df.columns for col in REQUIRED_COLUMNS):
+        keys, values = state._row_hashes(processed_df)
+        changed = processed_df[~pd.Index(values).isin(state.row_values)]
+    else:
+        return state, set()
+
+    removed = state.remove_runs(state.row_keys[~pd.Index(state.row_keys).isin(keys)].tolist())
+    state.row_keys, state.row_values = keys, values
+    return state, removed | state.apply_runs(changed)
@@ -0,0 +1,112 @@
+"""
+Filter index module for Bot Monitoring Dashboard
+Inverted indexes from filter values to row positions of a processed data snapshot
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('filter_index')
+
+# Columns the dashboard filters on
+INDEX_COLUMNS = ('automation_project', 'taskstatus', 'owner', 'trigger_group')
+
+class FilterIndex:
+    """
+    Inverted index over a processed DataFrame.
+
+    For every indexed column each distinct value maps to the sorted array of
+    row positions holding it. The index is built once per data snapshot with
+    one factorize + argsort per column; afterwards any filter combination is
+    resolved by intersecting position arrays, starting from the smallest, so
+    its cost depends on the matching rows rather than on the frame size.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.postings: Dict[str, Dict[Any, np.ndarray]] = {}
+
+        for column in columns:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column], sort=True)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.postings[column] = {
+                value: order[bounds[i]:bounds[i + 1]]
+                for i, value in enumerate(list(uniques))
+            }
+
+        logger.info(f"Built filter index over {self.n_rows} rows for {list(self.postings)}")
+
+    def values(self, column: str) -> List[Any]:
+        """Distinct values of an indexed column, sorted"""
+        return list(self.postings.get(column, {}))
+
+    def counts(self, column: str) -> Dict[Any, int]:
+        """Row count per distinct value of an indexed column"""
+        return {value: len(positions) for value, positions in self.postings.get(column, {}).items()}
+
+    def lookup(self, column: str, values: Iterable[Any]) -> np.ndarray:
+        """
+        Row positions matching any of the given values of one column.
+
+        Args:
+            column: Indexed column name
+            values: Values to match
+
+        Returns:
+            Sorted array of row positions
+        """
+        postings = self.postings.get(column, {})
+        matches = [postings[value] for value in values if value in postings]
+        if not matches:
+            return np.array([], dtype=np.intp)
+        if len(matches) == 1:
+            return matches[0]
+        return np.sort(np.concatenate(matches))
+
+    def select(self, **filters: Optional[Iterable[Any]]) -> np.ndarray:
+        """
+        Row positions matching every given column filter.
+
+        Args:
+            **filters: Column name to a value or list of values; None leaves the column unfiltered
+
+        Returns:
+            Sorted array of row positions
+
+        Raises:
+            KeyError: If a filter names a column that is not indexed
+        """
+        candidates = []
+        for column, values in filters.items():
+            if values is None:
+                continue
+            if column not in self.postings:
+                raise KeyError(f"Column '{column}' is not indexed")
+            if isinstance(values, str) or not isinstance(values, Iterable):
+                values = [values]
+            candidates.append(self.lookup(column, values))
+
+        if not candidates:
+            return np.arange(self.n_rows)
+
+        candidates.sort(key=len)
+        positions = candidates[0]
+        for other in candidates[1:]:
+            if positions.size == 0:
+                break
+            positions = np.intersect1d(positions, other, assume_unique=True)
+        return positions
@@ -0,0 +1,71 @@
+"""
+Memoization module for Bot Monitoring Dashboard
+Caches derived results on (data version, parameters) instead of hashing DataFrames
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('versioned_memo')
+
+# Constants
+MEMO_SIZE = 32  # Results kept per session
+
+class VersionedMemo:
+    """
+    LRU memo of derived results keyed on (data version, name, parameters).
+
+    The data version is a cheap token of the loaded snapshot (see
+    data_storage.freshness.data_version), so looking up a processed frame,
+    matrix or summary costs a dict access however large the data is. A new
+    version never matches old entries; they age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = MEMO_SIZE):
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, version: str, name: str, params: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """
+        Memoized result of compute for a data version and parameters.
+
+        Args:
+            version: Data version token of the input
+            name: Name of the derived result
+            params: Hashable parameters the result depends on besides the data
+            compute: Callable producing the result on a miss
+
+        Returns:
+            The cached or newly computed result
+        """
+        key = (version, name, params)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        result = compute()
+        self.entries[key] = result
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Drop every memoized result"""
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        """Entry count, hits and misses"""
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -5,13 +5,14 @@ Contains functions to process and transform data for display
 
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import date, datetime
 import logging
 import re
 import gc
 from functools import lru_cache
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 from data_processing.validators import validate_processed_data, validate_matrix_data
+from data_processing.indexes import FilterIndex
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +42,12 @@ STATUS_PRIORITY = {
     "No Run": 0         # Lowest priority
 }
 
+# Statuses of runs that have not finished yet
+RUNNING_STATUSES = frozenset(["Running", "InProgress", "Started"])
+
+# How runs are assigned to hour buckets: the start hour only, or every hour the run overlapped
+BUCKETING_MODES = ('start', 'interval')
+
 # Regex patterns (compiled for performance)
 CAMEL_CASE_PATTERN = re.compile(r'^([A-Z][a-z]+)')
 ALPHA_SEQUENCE_PATTERN = re.compile(r'[A-Za-z]{3,}')
@@ -49,6 +56,20 @@ SPLIT_PATTERN = re.compile(r'[_\s-]')
 # Common project identifiers
 COMMON_IDENTIFIERS = frozenset(["AMZ", "AWS", "C2D", "AZ", "WF", "PS", "VP", "BI"])
 
+# Filter columns and the label meaning "no filter" for each
+FILTER_ALL_LABELS = {
+    'automation_project': 'All Projects',
+    'taskstatus': 'All Statuses',
+    'owner': 'All Owners',
+    'trigger_group': 'All Triggers'
+}
+
+# Trigger groups, in category order
+TRIGGER_GROUPS = ['Manual', 'OtherTrigger', 'Recurrence']
+
+# A filter selection is a single value or a collection of values
+FilterSelection = Union[str, Sequence[str], None]
+
 # Required columns for different operations
 MATRIX_COLUMNS = {'display_name', 'automation_project', 'taskstatus', 'hour'}
 PROCESS_COLUMNS = {'datetimestarted', 'flowname', 'taskstatus', 'flowowner', 'wassuccessful', 'triggertype'}
@@ -109,13 +130,72 @@ def extract_project_name(flow_name: str) -> str:
         logger.error(f"Error extracting project from {flow_name}: {e}")
         return 'Unknown'
 
-def process_data_for_dashboard(df: pd.DataFrame, day_filter: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+def status_priority_sql(column: str = 'taskstatus') -> str:
+    """SQL CASE expression ranking a status column like STATUS_PRIORITY (unknown statuses rank 0)"""
+    branches = ' '.join(
+        f"WHEN '{status}' THEN {priority}" for status, priority in STATUS_PRIORITY.items()
+    )
+    return f"CASE {column} {branches} ELSE 0 END"
+
+def label_flows(flows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Owner, project and display name of distinct flows.
+    
+    Applies the same derivations as process_data_for_dashboard to a small
+    table of distinct (flowowner, flowname) pairs, for callers that
+    aggregate runs elsewhere (SQL, DuckDB) and join the labels back.
+    
+    Args:
+        flows: DataFrame with flowowner and flowname columns, one row per flow
+        
+    Returns:
+        Copy of flows with owner, automation_project and display_name added;
+        display_name is missing where the owner or flow name is
+    """
+    labels = flows.copy()
+    owners = labels['flowowner'].astype(object)
+    names = labels['flowname'].astype(object)
+    labels['owner'] = owners.str.replace(' serviceaccount', '').str.title()
+    labels['automation_project'] = names.map(extract_project_name)
+    labels['display_name'] = (labels['owner'] + ' | ' + labels['automation_project'] + ' | ' + names).where(
+        owners.notna() & names.notna()
+    )
+    return labels
+
+def _dictionary_encode(codes: np.ndarray, values: pd.Series) -> pd.Categorical:
+    """
+    Categorical column from row codes and the value derived for each code.
+    
+    Args:
+        codes: Row codes into values (-1 for missing)
+        values: Derived value per code; duplicates are merged and missing values become NaN
+        
+    Returns:
+        pd.Categorical with sorted categories
+    """
+    value_codes, categories = pd.factorize(values, sort=True)
+    if pd.api.types.is_string_dtype(categories):
+        # Store the dictionary as the default (Arrow-backed where available) string dtype
+        categories = categories.astype('str')
+    if len(value_codes) == 0:
+        return pd.Categorical.from_codes(np.full(len(codes), -1), categories)
+    return pd.Categorical.from_codes(np.where(codes >= 0, value_codes[np.maximum(codes, 0)], -1), categories)
+
+def process_data_for_dashboard(
+    df: pd.DataFrame,
+    day_filter: Optional[Union[str, datetime]] = None,
+    bucketing: str = 'start',
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
     """
     Process data with dynamic project mapping and optimized performance.
     
     Args:
         df (pd.DataFrame): Raw DataFrame with bot data
         day_filter (Optional[Union[str, datetime]]): Optional date filter
+        bucketing (str): 'start' assigns each run to its start hour; 'interval' returns
+            one row per hour the run overlapped (see expand_run_hours)
+        now (Optional[datetime]): End time for runs still in progress in 'interval' mode
         
     Returns:
         pd.DataFrame: Processed DataFrame ready for dashboard display
@@ -155,38 +235,63 @@ def process_data_for_dashboard(df: pd.DataFrame, day_filter: Optional[Union[str,
                     logger.warning(f"Found {processed_df['datetimestarted'].isna().sum()} rows with invalid datetime values")
                     processed_df = processed_df[~processed_df['datetimestarted'].isna()]
                 
-                # Apply date filter
-                processed_df = processed_df[processed_df['datetimestarted'].dt.date == filter_date]
+                # Apply date filter; interval bucketing also keeps runs carried over from earlier days
+                if bucketing == 'interval':
+                    processed_df = runs_overlapping_day(processed_df, filter_date, now=now)
+                else:
+                    processed_df = processed_df[processed_df['datetimestarted'].dt.date == filter_date]
                 logger.info(f"After date filtering: {len(processed_df)} records")
             except Exception as e:
                 logger.error(f"Error during date filtering: {e}")
                 # Continue with unfiltered data
         
-        # Add derived columns
+        # Add derived columns. Owner, project and display name are dictionary encoded:
+        # each is computed once per distinct value and joined back to the rows by code
         processed_df['hour'] = pd.to_datetime(processed_df['datetimestarted']).dt.hour
-        processed_df['owner'] = processed_df['flowowner'].str.replace(' serviceaccount', '').str.title()
-        processed_df['automation_project'] = processed_df['flowname'].apply(extract_project_name)
+        owner_codes, accounts = pd.factorize(processed_df['flowowner'])
+        owner_names = pd.Series(accounts, dtype=object).str.replace(' serviceaccount', '').str.title()
+        processed_df['owner'] = _dictionary_encode(owner_codes, owner_names)
+        
+        flow_codes, flows = pd.factorize(processed_df['flowname'], use_na_sentinel=False)
+        flow_names = pd.Series(flows, dtype=object)
+        flow_projects = flow_names.map(extract_project_name)
+        processed_df['automation_project'] = _dictionary_encode(flow_codes, flow_projects)
         
         # Add trigger type grouping
         if 'triggertype' in processed_df.columns:
-            conditions = [
-                processed_df['triggertype'] == 'manual',
-                processed_df['triggertype'] == 'Recurrence'
-            ]
-            choices = ['Manual', 'Recurrence']
-            processed_df['trigger_group'] = np.select(conditions, choices, default='OtherTrigger')
-        
-        # Create display name
-        processed_df['display_name'] = (
-            processed_df['owner'] + ' | ' + 
-            processed_df['automation_project'] + ' | ' + 
-            processed_df['flowname']
+            trigger_codes = np.select(
+                [processed_df['triggertype'] == 'manual', processed_df['triggertype'] == 'Recurrence'],
+                [TRIGGER_GROUPS.index('Manual'), TRIGGER_GROUPS.index('Recurrence')],
+                default=TRIGGER_GROUPS.index('OtherTrigger')
+            )
+            processed_df['trigger_group'] = pd.Categorical.from_codes(trigger_codes, TRIGGER_GROUPS)
+        
+        # Create display name once per distinct (owner, flow) pair; runs without an
+        # owner or flow name get no display name
+        n_flows = max(len(flows), 1)
+        pair_codes, pairs = pd.factorize(
+            np.where(owner_codes >= 0, owner_codes.astype(np.int64) * n_flows + flow_codes, -1)
         )
+        pair_names = pd.Series([
+            f"{owner} | {project} | {flow}" if isinstance(owner, str) and isinstance(flow, str) else None
+            for owner, project, flow in zip(
+                owner_names.reindex(pairs // n_flows),
+                flow_projects.reindex(pairs % n_flows),
+                flow_names.reindex(pairs % n_flows)
+            )
+        ], dtype=object)
+        processed_df['display_name'] = _dictionary_encode(pair_codes, pair_names)
         
         # Add success rate calculation
         if 'wassuccessful' in processed_df.columns:
             processed_df['success_rate'] = processed_df.groupby('flowname')['wassuccessful'].transform('mean') * 100
         
+        # Rasterize runs over every hour they overlapped
+        if bucketing == 'interval':
+            processed_df = expand_run_hours(processed_df, now=now, day=day_filter or None)
+        elif bucketing != 'start':
+            logger.warning(f"Unknown bucketing mode '{bucketing}' - using start hour")
+        
         # Cleanup to free memory
         gc.collect()
         
@@ -197,20 +302,168 @@ def process_data_for_dashboard(df: pd.DataFrame, day_filter: Optional[Union[str,
         logger.error(f"Error in process_data_for_dashboard: {e}")
         return pd.DataFrame()
 
+def _run_end_times(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.Series:
+    """End time of each run: datetimecompleted, or now for runs still in progress (NaT otherwise)"""
+    if 'datetimecompleted' in df.columns:
+        completed = pd.to_datetime(df['datetimecompleted'], errors='coerce')
+    else:
+        completed = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    in_progress = df['taskstatus'].isin(RUNNING_STATUSES) & completed.isna()
+    return completed.mask(in_progress, pd.Timestamp(now or datetime.now()))
+
+def runs_overlapping_day(
+    df: pd.DataFrame,
+    day: Union[str, date, datetime],
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    Select the runs that overlapped a day.
+    
+    A run overlaps the day when it started on it, or started earlier and
+    completed (or is still running) at or after the day's start, so a run
+    started at 23:30 still shows up on the next day.
+    
+    Args:
+        df (pd.DataFrame): Runs with datetimestarted, taskstatus and optionally datetimecompleted
+        day (Union[str, date, datetime]): Day to select
+        now (Optional[datetime]): End time for runs still in progress (default: datetime.now())
+        
+    Returns:
+        pd.DataFrame: Rows of df overlapping the day, in their original order
+    """
+    if df is None or df.empty:
+        return df
+    day_start = pd.Timestamp(pd.to_datetime(day).date())
+    day_end = day_start + pd.Timedelta(days=1)
+    started = pd.to_datetime(df['datetimestarted'], errors='coerce')
+    overlaps = (started < day_end) & ((started >= day_start) | (_run_end_times(df, now) >= day_start))
+    return df[overlaps]
+
+def expand_run_hours(
+    processed_df: pd.DataFrame,
+    now: Optional[datetime] = None,
+    day: Optional[Union[str, date, datetime]] = None
+) -> pd.DataFrame:
+    """
+    Expand each run into one row per hour bucket it overlapped.
+    
+    A run covers every hour from its start to datetimecompleted, or to now
+    for runs still in progress, clipped to the given day (default: each
+    run's start day). Runs carried over from an earlier day start at hour 0
+    of the day; runs that do not reach the day are dropped. Runs without a
+    usable end time occupy their start hour only. The expansion is a single
+    np.repeat over per-run bucket counts, so it stays linear in the number
+    of output rows.
+    
+    Args:
+        processed_df (pd.DataFrame): Output of process_data_for_dashboard (one row per run)
+        now (Optional[datetime]): End time for runs still in progress (default: datetime.now())
+        day (Optional[Union[str, date, datetime]]): Day to clip runs to (see runs_overlapping_day)
+        
+    Returns:
+        pd.DataFrame: One row per (run, hour) with 'hour' set to the bucket and
+        'bucket_offset' holding the number of hours after the run's start hour
+    """
+    try:
+        if processed_df is None or processed_df.empty:
+            return processed_df
+        
+        started = pd.to_datetime(processed_df['datetimestarted'], errors='coerce')
+        completed = _run_end_times(processed_df, now)
+        if day is None:
+            day_start = started.dt.floor('D')
+        else:
+            day_start = pd.Series(pd.Timestamp(pd.to_datetime(day).date()), index=processed_df.index)
+        
+        # Hours relative to the day's midnight; carried-over runs begin at hour 0
+        carried = started < day_start
+        start_hour = ((started.dt.floor('h') - day_start) / pd.Timedelta(hours=1)).to_numpy(dtype=float)
+        first_hour = np.where(carried.to_numpy(), 0, start_hour)
+        end_hour = ((completed.dt.floor('h') - day_start) / pd.Timedelta(hours=1)).to_numpy(dtype=float)
+        last_hour = np.minimum(np.where(np.isnan(end_hour) | (end_hour < first_hour), first_hour, end_hour), 23)
+        counts = np.where(np.isnan(start_hour), 1, last_hour - first_hour + 1)
+        
+        # Runs outside the day: carried over without reaching it, or started after it
+        outside = (carried & ~(completed >= day_start)).to_numpy() | (start_hour > 23)
+        counts = np.where(outside, 0, counts).astype(np.int64)
+        
+        rows = np.repeat(np.arange(len(processed_df)), counts)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        
+        expanded = processed_df.iloc[rows].reset_index(drop=True)
+        carried_hours = np.where(np.isnan(start_hour), 0, first_hour - start_hour)
+        expanded['bucket_offset'] = (carried_hours[rows] + offsets).astype(np.int64)
+        expanded['hour'] = (first_hour[rows] + offsets)
+        if not np.isnan(start_hour).any():
+            expanded['hour'] = expanded['hour'].astype(int)
+        
+        logger.info(f"Expanded {len(processed_df)} runs into {len(expanded)} hour buckets")
+        return expanded
+        
+    except Exception as e:
+        logger.error(f"Error expanding runs into hour buckets: {e}")
+        return processed_df
+
+def normalize_filters(
+    selected_project: FilterSelection = 'All Projects',
+    selected_status: FilterSelection = 'All Statuses',
+    selected_owner: FilterSelection = 'All Owners',
+    selected_trigger: FilterSelection = 'All Triggers'
+) -> Dict[str, Optional[Tuple[str, ...]]]:
+    """
+    Normalize single or multi-select filter values.
+    
+    Each selection may be a single value, a list of values, the column's
+    "All ..." label, or empty/None (no filtering). The result is keyed by the
+    filtered column and holds a sorted tuple of values, or None when the
+    column is unfiltered, so it can be used directly as part of a cache key.
+    
+    Args:
+        selected_project: Project(s) to show
+        selected_status: Status(es) to show
+        selected_owner: Owner(s) to show
+        selected_trigger: Trigger group(s) to show
+    
+    Returns:
+        Dict[str, Optional[Tuple[str, ...]]]: Column name to selected values (None = all)
+    """
+    selections = zip(FILTER_ALL_LABELS.items(), (selected_project, selected_status, selected_owner, selected_trigger))
+    filters = {}
+    for (column, all_label), selection in selections:
+        if selection is None or isinstance(selection, str):
+            selection = [] if selection is None else [selection]
+        values = tuple(sorted({str(value) for value in selection if value != all_label}))
+        filters[column] = values or None
+    return filters
+
+def filter_cache_key(filters: Dict[str, Optional[Tuple[str, ...]]]) -> Tuple:
+    """Hashable key for a normalize_filters result"""
+    return tuple(sorted(filters.items()))
+
 def create_hourly_matrix(
     df: pd.DataFrame, 
-    selected_project: str = 'All Projects', 
-    selected_status: str = 'All Statuses', 
-    max_rows: int = 300
+    selected_project: FilterSelection = 'All Projects', 
+    selected_status: FilterSelection = 'All Statuses', 
+    max_rows: int = 300,
+    selected_owner: FilterSelection = 'All Owners',
+    selected_trigger: FilterSelection = 'All Triggers',
+    filter_index: Optional[FilterIndex] = None
 ) -> Tuple[Dict[str, Dict[int, str]], List[str], List[int]]:
     """
     Create hourly matrix for dashboard display.
     
+    Every filter accepts a single value or a list of values (any of which may
+    match); all filters are combined and evaluated in one vectorized pass.
+    
     Args:
         df (pd.DataFrame): Processed DataFrame with bot data
-        selected_project (str): Project filter (or 'All Projects')
-        selected_status (str): Status filter (or 'All Statuses')
+        selected_project (FilterSelection): Project filter (or 'All Projects')
+        selected_status (FilterSelection): Status filter (or 'All Statuses')
         max_rows (int): Maximum number of rows to display
+        selected_owner (FilterSelection): Owner filter (or 'All Owners')
+        selected_trigger (FilterSelection): Trigger group filter (or 'All Triggers')
+        filter_index (Optional[FilterIndex]): Index built on df; when given, filters are
+            resolved from the index and only matching rows are validated and scanned
     
     Returns:
         tuple: A tuple containing:
@@ -230,6 +483,24 @@ def create_hourly_matrix(
             logger.warning("No data available for matrix creation")
             return {}, [], hours
         
+        filters = normalize_filters(selected_project, selected_status, selected_owner, selected_trigger)
+        active_filters = {column: values for column, values in filters.items() if values is not None}
+        
+        # Resolve filters through the inverted index so only matching rows are touched
+        if filter_index is not None and active_filters:
+            if filter_index.n_rows != len(df):
+                logger.warning("Filter index does not match DataFrame - filtering by scan")
+            elif not all(column in filter_index.postings for column in active_filters):
+                logger.warning("Filter index does not cover every filter - filtering by scan")
+            else:
+                positions = filter_index.select(**active_filters)
+                logger.info(f"Filter index matched {len(positions)} of {len(df)} records")
+                df = df.iloc[positions]
+                active_filters = {}
+                if df.empty:
+                    logger.warning("No data after filtering")
+                    return {}, [], hours
+        
         # Validate processed data
         is_valid, message, validated_df = validate_processed_data(df)
         if not is_valid:
@@ -242,35 +513,27 @@ def create_hourly_matrix(
         # Optimize memory usage by selecting only needed columns
         try:
             # Extract only needed columns to reduce memory footprint
-            matrix_df = df[list(MATRIX_COLUMNS)].copy()
+            missing_filters = [column for column in active_filters if column not in df.columns]
+            if missing_filters:
+                logger.error(f"Missing filter columns for matrix creation: {missing_filters}")
+                return {}, [], hours
+            matrix_df = df[list(MATRIX_COLUMNS | set(active_filters))].copy()
         except KeyError as e:
             logger.error(f"Missing required columns for matrix creation: {e}")
             return {}, [], hours
         
-        # Apply filters with vectorized operations for performance
+        # Apply all filters in one vectorized pass (isin works on category codes)
         filter_mask = pd.Series(True, index=matrix_df.index)
         orig_count = len(matrix_df)
-        
-        # Apply project filter if specified (vectorized operation)
-        if selected_project != 'All Projects':
-            project_mask = (matrix_df['automation_project'] == selected_project)
-            filter_mask &= project_mask
-            logger.info(f"Project filter '{selected_project}' matched {project_mask.sum()} of {orig_count} records")
-            
-        # Apply status filter if specified (vectorized operation)
-        if selected_status != 'All Statuses':
-            status_mask = (matrix_df['taskstatus'] == selected_status)
-            filter_mask &= status_mask
-            logger.info(f"Status filter '{selected_status}' matched {status_mask.sum()} of {orig_count} records")
+        for column, values in active_filters.items():
+            filter_mask &= matrix_df[column].isin(values)
+        if active_filters:
+            logger.info(f"Filters {active_filters} matched {int(filter_mask.sum())} of {orig_count} records")
         
         # Apply combined filter in one operation (more efficient)
         filtered_df = matrix_df.loc[filter_mask]
         logger.info(f"Filtered from {len(matrix_df)} to {len(filtered_df)} records")
         
-        # Clean up intermediate objects to free memory
-        del matrix_df
-        gc.collect()
-        
         # Check if we have data after filtering
         if filtered_df.empty:
             logger.warning("No data after filtering")
@@ -295,9 +558,9 @@ def create_hourly_matrix(
                     filtered_df['flowname'] = filtered_df.get('flowname', 'Unknown')
                     
                     filtered_df['display_name'] = (
-                        filtered_df['owner'].fillna('Unknown') + ' | ' + 
-                        filtered_df['automation_project'].fillna('Unknown') + ' | ' + 
-                        filtered_df['flowname'].fillna('Unknown')
+                        filtered_df['owner'].astype(object).fillna('Unknown') + ' | ' + 
+                        filtered_df['automation_project'].astype(object).fillna('Unknown') + ' | ' + 
+                        filtered_df['flowname'].astype(object).fillna('Unknown')
                     )
                     
                     # Filter out any remaining invalid display names
@@ -318,18 +581,17 @@ def create_hourly_matrix(
         if len(display_names_array) > max_rows:
             logger.warning(f"Too many display names ({len(display_names_array)}), using intelligent selection")
             
-            # Use a smarter approach to select the most interesting bots
-            # Count statuses by display_name, prioritizing failures and actives
-            status_counts = (
-                filtered_df.groupby('display_name')['taskstatus']
-                .apply(lambda x: pd.Series({
-                    'failed': (x == 'Failed').sum(),
-                    'running': (x == 'Running').sum(),
-                    'total': len(x)
-                }))
+            # Score bots by status counts (prioritize failures, then running, then total)
+            statuses = filtered_df['taskstatus']
+            status_counts = pd.DataFrame({
+                'failed': (statuses == 'Failed').to_numpy(dtype=bool, na_value=False),
+                'running': (statuses == 'Running').to_numpy(dtype=bool, na_value=False),
+                'display_name': filtered_df['display_name'].array
+            }).groupby('display_name', sort=False, observed=True).agg(
+                failed=('failed', 'sum'),
+                running=('running', 'sum'),
+                total=('failed', 'size')
             )
-            
-            # Create score based on status counts (prioritize failures, then running, then total)
             status_counts['score'] = (
                 status_counts['failed'] * 100 + 
                 status_counts['running'] * 10 + 
@@ -337,7 +599,7 @@ def create_hourly_matrix(
             )
             
             # Select top bots by score
-            selected_names = status_counts.sort_values('score', ascending=False).head(max_rows).index.tolist()
+            selected_names = status_counts.sort_values('score', ascending=False, kind='stable').head(max_rows).index.tolist()
             display_names = selected_names
             filtered_df = filtered_df[filtered_df['display_name'].isin(display_names)]
         else:
@@ -347,25 +609,24 @@ def create_hourly_matrix(
         bot_hour_status = {name: {hour: "No Run" for hour in hours} for name in display_names}
         
         try:
-            # Use optimized groupby approach
-            # Group once by both dimensions for better performance
-            grouped = filtered_df.groupby(['display_name', 'hour'])
+            # Highest priority status per (display_name, hour) cell in one vectorized pass;
+            # ties resolve to the alphabetically first status
+            # Columns keep their dictionary/Arrow encoding; strings materialize only per cell
+            cells = pd.DataFrame({
+                'display_name': filtered_df['display_name'].array,
+                'hour': filtered_df['hour'].to_numpy(),
+                'taskstatus': filtered_df['taskstatus'].astype(str).array
+            })
+            cells = cells[cells['hour'].between(0, 23)]
+            cells['priority'] = cells['taskstatus'].map(STATUS_PRIORITY).astype(float).fillna(0)
+            cells = cells.sort_values(
+                ['display_name', 'hour', 'priority', 'taskstatus'],
+                ascending=[True, True, False, True]
+            ).drop_duplicates(['display_name', 'hour'])
             
-            # Process groups for matrix creation
-            for (name, hour), group in grouped:
-                if name in bot_hour_status and 0 <= hour <= 23:
-                    # Find highest priority status in this group efficiently
-                    # Use numpy operations for performance
-                    if len(group) > 0:
-                        status_values = group['taskstatus'].values
-                        
-                        # Find the status with highest priority using max with key function
-                        highest_status = max(
-                            np.unique(status_values),
-                            key=lambda x: STATUS_PRIORITY.get(x, 0)
-                        )
-                        
-                        bot_hour_status[name][hour] = highest_status
+            for name, hour, status in zip(cells['display_name'], cells['hour'], cells['taskstatus']):
+                if name in bot_hour_status:
+                    bot_hour_status[name][int(hour)] = status
             
         except Exception as e:
             logger.error(f"Error creating status matrix: {e}")
@@ -0,0 +1,221 @@
+"""
+Schedule inference module for Bot Monitoring Dashboard
+Infers each Recurrence flow's cadence from its run history and flags late or missed runs
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('schedule_inference')
+
+# Constants
+MIN_INTERVALS = 4           # Intervals needed before a cadence is trusted
+MIN_CONFIDENCE = 0.5        # Share of intervals that must match the modal cadence
+LATE_TOLERANCE = 0.1        # Fraction of the cadence a run may slip before it is late
+MIN_LATE_MINUTES = 5        # Lateness below this is never flagged
+SCHEDULE_COLUMNS = [
+    'flowname', 'interval_minutes', 'confidence', 'intervals',
+    'last_run', 'next_expected', 'minutes_late', 'missed_runs', 'schedule_status'
+]
+
+def snap_intervals(minutes: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Snap raw run intervals to a cadence grid to absorb scheduler jitter.
+
+    Intervals under 10 minutes round to the minute, under 2 hours to 5
+    minutes, and longer ones to 15 minutes.
+
+    Args:
+        minutes: Raw intervals in minutes
+
+    Returns:
+        Snapped intervals in whole minutes
+    """
+    values = np.asarray(minutes, dtype=float)
+    step = np.select([values < 10, values < 120], [1, 5], default=15)
+    return np.maximum(np.round(values / step) * step, 1)
+
+def _flow_key_column(df: pd.DataFrame) -> str:
+    """Column that identifies a flow (GUID when available)"""
+    return 'flowguid' if 'flowguid' in df.columns and df['flowguid'].notna().all() else 'flowname'
+
+class ScheduleTracker:
+    """
+    Cached per-flow cadence inference for Recurrence-triggered flows.
+
+    The tracker keeps, per flow, the last seen start time and a histogram of
+    snapped intervals between consecutive runs. update() only looks at runs
+    newer than each flow's last seen start, adds their intervals to the
+    histograms with one vectorized diff, and re-derives the modal cadence
+    for the flows that received runs. Evaluating lateness is a vectorized
+    pass over the cached per-flow schedules.
+    """
+
+    def __init__(self):
+        self.last_run = pd.Series(dtype='datetime64[ns]')
+        self.flow_names = pd.Series(dtype=object)
+        self.interval_counts = pd.Series(dtype=float)
+        self.schedules = pd.DataFrame(columns=['interval_minutes', 'confidence', 'intervals'])
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Feed new runs into the tracker.
+
+        Args:
+            df: Raw or processed runs (only Recurrence-triggered runs are used)
+
+        Returns:
+            Number of flows whose schedule was re-derived
+        """
+        if df is None or df.empty or 'datetimestarted' not in df.columns:
+            return 0
+
+        runs = df
+        if 'triggertype' in runs.columns:
+            runs = runs[runs['triggertype'] == 'Recurrence']
+        key_col = _flow_key_column(runs)
+        runs = pd.DataFrame({
+            'flow': runs[key_col].astype(str).to_numpy(),
+            'flowname': runs['flowname'].astype(str).to_numpy() if 'flowname' in runs.columns else runs[key_col].astype(str).to_numpy(),
+            'start': pd.to_datetime(runs['datetimestarted'], errors='coerce').to_numpy(),
+        }).dropna(subset=['start'])
+        if runs.empty:
+            return 0
+
+        # Keep only runs newer than what the tracker has already seen
+        seen = pd.Series(self.last_run.reindex(runs['flow'].to_numpy()).to_numpy(), index=runs.index)
+        runs = runs[seen.isna() | (runs['start'] > seen)]
+        if runs.empty:
+            return 0
+
+        # Seed each touched flow with its previous last run so the first new interval is counted
+        touched = runs['flow'].unique()
+        known = self.last_run.reindex(touched).dropna()
+        seeds = pd.DataFrame({'flow': known.index, 'flowname': None, 'start': known.to_numpy()})
+        timeline = pd.concat([seeds, runs], ignore_index=True).sort_values(['flow', 'start'])
+
+        diffs = timeline.groupby('flow')['start'].diff().dt.total_seconds() / 60
+        timeline = timeline.assign(interval=diffs)
+        timeline = timeline[timeline['interval'] > 0]
+        if not timeline.empty:
+            timeline['interval'] = snap_intervals(timeline['interval'])
+            new_counts = timeline.groupby(['flow', 'interval']).size().astype(float)
+            if self.interval_counts.empty:
+                self.interval_counts = new_counts
+            else:
+                self.interval_counts = self.interval_counts.add(new_counts, fill_value=0)
+
+        latest = runs.groupby('flow')['start'].max()
+        self.last_run = latest.combine_first(self.last_run)
+        self.flow_names = runs.groupby('flow')['flowname'].last().combine_first(self.flow_names)
+
+        self._derive_schedules(touched)
+        logger.info(f"Schedule tracker updated with {len(runs)} runs across {len(touched)} flows")
+        return len(touched)
+
+    def _derive_schedules(self, flows: np.ndarray) -> None:
+        """Recompute the modal cadence and its confidence for the given flows"""
+        if self.interval_counts.empty:
+            return
+
+        counts = self.interval_counts[self.interval_counts.index.get_level_values(0).isin(flows)]
+        if counts.empty:
+            return
+
+        by_flow = counts.groupby(level=0)
+        modal = by_flow.idxmax().map(lambda idx: idx[1])
+        derived = pd.DataFrame({
+            'interval_minutes': modal,
+            'confidence': by_flow.max() / by_flow.sum(),
+            'intervals': by_flow.sum().astype(int),
+        })
+        self.schedules = pd.concat([self.schedules.drop(derived.index, errors='ignore'), derived])
+
+    def evaluate(self, now: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Flag late and missed runs for every flow with a trusted cadence.
+
+        A flow is 'late' once its next expected run is overdue by more than
+        LATE_TOLERANCE of its cadence (at least MIN_LATE_MINUTES) and 'missed'
+        once at least one whole expected run has passed.
+
+        Args:
+            now: Evaluation time (default: datetime.now())
+
+        Returns:
+            pd.DataFrame indexed by flow key with SCHEDULE_COLUMNS, most overdue first
+        """
+        if self.schedules.empty:
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+        now = pd.Timestamp(now or datetime.now())
+        schedules = self.schedules[
+            (self.schedules['intervals'] >= MIN_INTERVALS) &
+            (self.schedules['confidence'] >= MIN_CONFIDENCE)
+        ].copy()
+        if schedules.empty:
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+        interval = pd.to_timedelta(schedules['interval_minutes'].astype(float), unit='m')
+        schedules['flowname'] = self.flow_names.reindex(schedules.index)
+        schedules['last_run'] = self.last_run.reindex(schedules.index)
+        schedules['next_expected'] = schedules['last_run'] + interval
+        overdue = (now - schedules['next_expected']).dt.total_seconds() / 60
+        tolerance = np.maximum(schedules['interval_minutes'].astype(float) * LATE_TOLERANCE, MIN_LATE_MINUTES)
+
+        schedules['minutes_late'] = overdue.clip(lower=0)
+        schedules['missed_runs'] = np.floor(overdue.clip(lower=0) / schedules['interval_minutes'].astype(float)).astype(int)
+        schedules['schedule_status'] = np.select(
+            [schedules['missed_runs'] >= 1, overdue > tolerance],
+            ['missed', 'late'],
+            default='on schedule'
+        )
+        return schedules[SCHEDULE_COLUMNS].sort_values('minutes_late', ascending=False)
+
+def find_schedule_gaps(df: pd.DataFrame, schedules: pd.DataFrame) -> pd.DataFrame:
+    """
+    Find historical gaps where a flow skipped one or more expected runs.
+
+    Args:
+        df: Run history covering the period to inspect
+        schedules: Output of ScheduleTracker.evaluate (indexed by flow key)
+
+    Returns:
+        pd.DataFrame with flow, flowname, gap_start, gap_end and missed_runs per gap
+    """
+    columns = ['flow', 'flowname', 'gap_start', 'gap_end', 'missed_runs']
+    if df is None or df.empty or schedules is None or schedules.empty:
+        return pd.DataFrame(columns=columns)
+
+    runs = df
+    if 'triggertype' in runs.columns:
+        runs = runs[runs['triggertype'] == 'Recurrence']
+    key_col = _flow_key_column(runs)
+    timeline = pd.DataFrame({
+        'flow': runs[key_col].astype(str).to_numpy(),
+        'gap_end': pd.to_datetime(runs['datetimestarted'], errors='coerce').to_numpy(),
+    }).dropna().sort_values(['flow', 'gap_end'])
+    timeline = timeline[timeline['flow'].isin(schedules.index)]
+
+    timeline['gap_start'] = timeline.groupby('flow')['gap_end'].shift()
+    timeline['interval'] = timeline['flow'].map(schedules['interval_minutes'].astype(float))
+    gap_minutes = (timeline['gap_end'] - timeline['gap_start']).dt.total_seconds() / 60
+    # A gap of k cadences holds k - 1 missed runs, allowing for scheduler jitter
+    timeline['missed_runs'] = np.floor(gap_minutes / timeline['interval'] - LATE_TOLERANCE)
+
+    gaps = timeline[timeline['missed_runs'] >= 1].copy()
+    gaps['missed_runs'] = gaps['missed_runs'].astype(int)
+    gaps['flowname'] = gaps['flow'].map(schedules['flowname'])
+    return gaps[columns].reset_index(drop=True)
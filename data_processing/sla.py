@@ -0,0 +1,357 @@
+"""
+SLA module for Bot Monitoring Dashboard
+Matches each flow's expected schedule slots to its runs and reports on-time, late, missed and failed shares
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_processing.baselines import FAILURE_STATUSES
+from data_processing.schedules import LATE_TOLERANCE, MIN_CONFIDENCE, MIN_INTERVALS, MIN_LATE_MINUTES, ScheduleTracker
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('sla_engine')
+
+# Constants
+SLA_FILE = Path(os.getenv('FLOW_SLA_FILE', 'flow_slas.json'))
+SLA_TARGET_PCT = float(os.getenv('SLA_TARGET_PCT', '95'))   # On-time share a flow must reach
+DEFAULT_DEADLINE_MINUTES = 15       # Declared schedules without a deadline
+EARLY_MINUTES = 5                   # A run may start this early and still count for a slot
+SLA_OUTCOMES = ('on_time', 'late', 'missed', 'failed')
+SLA_PERIODS = {'day': 'D', 'week': 'W-SUN', 'month': 'M'}   # Weeks run Monday to Sunday
+QUERY_ORIGINS = ('database', 'sources')   # Origins whose fetch time is when the data was current
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+ALL_WEEKDAYS = 0b1111111
+SCHEDULE_COLUMNS = [
+    'flowname', 'anchor', 'interval_minutes', 'deadline_minutes', 'weekdays',
+    'target_pct', 'not_before', 'schedule_source'
+]
+_ANCHOR_DAY = pd.Timestamp('2000-01-03')  # A Monday; declared times of day are anchored here
+
+def _weekday_mask(weekdays: Optional[Sequence[Any]]) -> int:
+    """Bit mask of weekdays (bit 0 = Monday) from names or numbers; all days when empty"""
+    if not weekdays:
+        return ALL_WEEKDAYS
+    mask = 0
+    for day in weekdays:
+        index = WEEKDAYS.index(str(day).lower()[:3]) if isinstance(day, str) else int(day)
+        mask |= 1 << index
+    return mask
+
+def _minutes_of_day(value: str) -> int:
+    """Minutes after midnight of an 'HH:MM' time"""
+    hours, minutes = str(value).split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+def load_declared_schedules(config: Optional[Sequence[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    Declared SLA schedules from a list of mappings or the SLA file.
+
+    Each entry names a flow and either daily 'times' (["06:00", "18:00"]) or
+    an 'interval_minutes' cadence with an optional 'anchor' time of day, plus
+    optional 'deadline_minutes' (a run must start within this long after its
+    slot), 'weekdays' (["mon", "fri"] or 0-6) and 'target_pct'.
+
+    Args:
+        config: Schedule mappings (default: read SLA_FILE if it exists)
+
+    Returns:
+        pd.DataFrame with SCHEDULE_COLUMNS, one row per flow and cadence
+    """
+    if config is None:
+        if not SLA_FILE.exists():
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+        try:
+            config = json.loads(SLA_FILE.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.error(f"Could not read SLA file {SLA_FILE}: {e}")
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+    rows = []
+    for entry in config:
+        try:
+            common = {
+                'flowname': entry['flowname'],
+                'deadline_minutes': float(entry.get('deadline_minutes', DEFAULT_DEADLINE_MINUTES)),
+                'weekdays': _weekday_mask(entry.get('weekdays')),
+                'target_pct': float(entry.get('target_pct', SLA_TARGET_PCT)),
+                'not_before': pd.NaT,
+                'schedule_source': 'declared',
+            }
+            if 'times' in entry:
+                for time_of_day in entry['times']:
+                    rows.append({**common, 'interval_minutes': 1440.0,
+                                 'anchor': _ANCHOR_DAY + pd.Timedelta(minutes=_minutes_of_day(time_of_day))})
+            else:
+                rows.append({**common, 'interval_minutes': float(entry['interval_minutes']),
+                             'anchor': _ANCHOR_DAY + pd.Timedelta(minutes=_minutes_of_day(entry.get('anchor', '00:00')))})
+        except Exception as e:
+            logger.error(f"Skipping invalid SLA schedule {entry}: {e}")
+    return pd.DataFrame(rows, columns=SCHEDULE_COLUMNS)
+
+def infer_schedules(tracker: ScheduleTracker, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    SLA schedules of Recurrence flows with a trusted inferred cadence.
+
+    The slot phase is the median offset of the flow's runs from its last
+    run, folded into (-interval/2, interval/2], so scheduler delays do not
+    shift the slots. The deadline is the lateness tolerance of
+    ScheduleTracker.evaluate, and slots start at the flow's first loaded run.
+
+    Args:
+        tracker: ScheduleTracker updated with df
+        df: Runs the cadences were inferred from
+
+    Returns:
+        pd.DataFrame with SCHEDULE_COLUMNS, one row per flow
+    """
+    schedules = tracker.schedules
+    if schedules.empty or df is None or df.empty:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+    trusted = schedules[(schedules['intervals'] >= MIN_INTERVALS) & (schedules['confidence'] >= MIN_CONFIDENCE)]
+    if trusted.empty:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+    flows = pd.DataFrame({
+        'flowname': tracker.flow_names.reindex(trusted.index).to_numpy(),
+        'interval_minutes': trusted['interval_minutes'].astype(float).to_numpy(),
+        'last_run': pd.to_datetime(tracker.last_run.reindex(trusted.index)).to_numpy(),
+    }).dropna().drop_duplicates('flowname')
+
+    runs = df
+    if 'triggertype' in runs.columns:
+        runs = runs[runs['triggertype'] == 'Recurrence']
+    runs = pd.DataFrame({
+        'flowname': runs['flowname'].astype(str).to_numpy(),
+        'start': pd.to_datetime(runs['datetimestarted'], errors='coerce').to_numpy(),
+    }).dropna().merge(flows, on='flowname')
+    if runs.empty:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+    interval = runs['interval_minutes'].to_numpy() * 60
+    offset = (runs['start'] - runs['last_run']).dt.total_seconds().to_numpy()
+    runs['phase'] = (offset + interval / 2) % interval - interval / 2
+    phases = runs.groupby('flowname').agg(phase=('phase', 'median'), not_before=('start', 'min'))
+    flows = flows.join(phases, on='flowname', how='inner')
+
+    return pd.DataFrame({
+        'flowname': flows['flowname'],
+        'anchor': flows['last_run'] + pd.to_timedelta(flows['phase'], unit='s'),
+        'interval_minutes': flows['interval_minutes'],
+        'deadline_minutes': np.maximum(flows['interval_minutes'] * LATE_TOLERANCE, MIN_LATE_MINUTES),
+        'weekdays': ALL_WEEKDAYS,
+        'target_pct': SLA_TARGET_PCT,
+        'not_before': flows['not_before'] - pd.Timedelta(minutes=EARLY_MINUTES),
+        'schedule_source': 'inferred',
+    }, columns=SCHEDULE_COLUMNS).reset_index(drop=True)
+
+def combine_schedules(declared: pd.DataFrame, inferred: pd.DataFrame) -> pd.DataFrame:
+    """Declared schedules plus inferred ones for flows without a declaration"""
+    inferred = inferred[~inferred['flowname'].isin(declared['flowname'])]
+    frames = [frame for frame in (declared, inferred) if not frame.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+def expected_slots(schedules: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    """
+    Every expected slot in [start, end) of every schedule.
+
+    Slots are generated for all schedules at once: each schedule's first
+    and last slot index in the range are computed arithmetically, and a
+    single np.repeat/arange expansion produces the slot times. A slot's
+    window runs from shortly before it to the window of the flow's next
+    slot, and at most one interval.
+
+    Args:
+        schedules: SCHEDULE_COLUMNS rows
+        start: Start of the range
+        end: End of the range (exclusive)
+
+    Returns:
+        pd.DataFrame with flowname, slot, deadline, window_start, window_end
+        and target_pct, one row per slot
+    """
+    columns = ['flowname', 'slot', 'deadline', 'window_start', 'window_end', 'target_pct']
+    if schedules is None or schedules.empty:
+        return pd.DataFrame(columns=columns)
+
+    interval = (schedules['interval_minutes'].to_numpy(dtype=float) * 60e9).astype(np.int64)
+    anchor = pd.to_datetime(schedules['anchor']).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    not_before = pd.to_datetime(schedules['not_before']).fillna(pd.Timestamp(start)).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    first = np.maximum(pd.Timestamp(start).value, not_before)
+    last = pd.Timestamp(end).value - 1
+
+    k_first = -((anchor - first) // interval)      # ceil((first - anchor) / interval)
+    k_last = (last - anchor) // interval
+    counts = np.maximum(k_last - k_first + 1, 0)
+    rows = np.repeat(np.arange(len(schedules)), counts)
+    steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + k_first[rows]
+    slots = pd.to_datetime(anchor[rows] + steps * interval[rows])
+
+    weekday_ok = (schedules['weekdays'].to_numpy(dtype=np.int64)[rows] >> slots.dayofweek.to_numpy()) & 1
+    keep = weekday_ok.astype(bool)
+    rows, slots = rows[keep], slots[keep]
+
+    slot_values = slots.to_numpy(dtype='datetime64[ns]')
+    frame = pd.DataFrame({
+        'flowname': schedules['flowname'].to_numpy()[rows],
+        'slot': slot_values,
+        'deadline': slot_values + pd.to_timedelta(schedules['deadline_minutes'].to_numpy(dtype=float)[rows], unit='m').to_numpy(),
+        'interval': interval[rows].astype('timedelta64[ns]'),
+        'target_pct': schedules['target_pct'].to_numpy(dtype=float)[rows],
+    }).sort_values(['flowname', 'slot'], kind='stable').drop_duplicates(['flowname', 'slot'])
+
+    # Windows of a flow's slots never overlap, even across several daily times,
+    # so every run counts for at most one slot
+    by_flow = frame.groupby('flowname', sort=False)['slot']
+    half_gap = (frame['slot'] - by_flow.shift(1)).fillna(frame['interval']) / 2
+    early = (frame['interval'] / 2).clip(upper=pd.Timedelta(minutes=EARLY_MINUTES))
+    early = early.where(early <= half_gap, half_gap)
+    frame['window_start'] = frame['slot'] - early
+    next_start = by_flow.shift(-1) - early.groupby(frame['flowname'], sort=False).shift(-1)
+    latest_end = frame['slot'] + frame['interval'] - early
+    frame['window_end'] = next_start.where(next_start < latest_end, latest_end)
+    return frame[columns].reset_index(drop=True)
+
+def match_slots(slots: pd.DataFrame, df: pd.DataFrame, as_of: datetime) -> pd.DataFrame:
+    """
+    Classify every slot by the first run of its flow inside the slot's window.
+
+    One as-of join (pd.merge_asof by flow, forward) finds each slot's first
+    run at or after its window start; the run counts if it starts before the
+    window ends. Matched slots are 'failed' when the run failed, otherwise
+    'on_time' or 'late' by start time against the deadline. Unmatched slots
+    are 'missed' once their window has closed by as_of and 'pending' before.
+
+    Args:
+        slots: Output of expected_slots
+        df: Runs with flowname, datetimestarted and taskstatus
+        as_of: Time the data is current to
+
+    Returns:
+        slots with run_started, taskstatus and outcome columns
+    """
+    if slots.empty:
+        return slots.assign(run_started=pd.Series(dtype='datetime64[ns]'), taskstatus=None, outcome=None)
+
+    runs = pd.DataFrame({
+        'flowname': df['flowname'].astype(str).to_numpy(),
+        'run_started': pd.to_datetime(df['datetimestarted'], errors='coerce').to_numpy(dtype='datetime64[ns]'),
+        'taskstatus': df['taskstatus'].astype(object).to_numpy(),
+    }).dropna(subset=['run_started'])
+    runs = runs[runs['flowname'].isin(slots['flowname'].unique())].sort_values('run_started', kind='stable')
+
+    matched = pd.merge_asof(
+        slots.assign(flowname=slots['flowname'].astype(str)).sort_values('window_start', kind='stable'),
+        runs, left_on='window_start', right_on='run_started', by='flowname', direction='forward'
+    )
+    in_window = matched['run_started'].notna() & (matched['run_started'] < matched['window_end'])
+    matched.loc[~in_window, ['run_started', 'taskstatus']] = [pd.NaT, None]
+
+    as_of = pd.Timestamp(as_of)
+    matched['outcome'] = np.select(
+        [
+            in_window & matched['taskstatus'].isin(FAILURE_STATUSES),
+            in_window & (matched['run_started'] <= matched['deadline']),
+            in_window,
+            matched['window_end'] <= as_of,
+        ],
+        ['failed', 'on_time', 'late', 'missed'],
+        default='pending'
+    )
+    return matched.sort_values(['flowname', 'slot'], kind='stable').reset_index(drop=True)
+
+def compute_sla_outcomes(
+    df: pd.DataFrame,
+    schedules: pd.DataFrame,
+    start: datetime,
+    end: datetime,
+    as_of: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    Outcome of every expected slot between start and end.
+
+    Args:
+        df: Runs covering the range
+        schedules: Output of combine_schedules
+        start: Start of the range
+        end: End of the range (exclusive); slots after as_of are not generated
+        as_of: Time the data is current to (default: datetime.now())
+
+    Returns:
+        pd.DataFrame of slots with their outcome (see match_slots)
+    """
+    as_of = pd.Timestamp(as_of or datetime.now())
+    slots = expected_slots(schedules, start, min(pd.Timestamp(end), as_of))
+    outcomes = match_slots(slots, df, as_of)
+    logger.info(f"Matched {len(outcomes)} SLA slots of {schedules['flowname'].nunique() if not schedules.empty else 0} flows")
+    return outcomes
+
+def evaluation_time(freshness: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Time a snapshot's SLA slots are evaluated as of.
+
+    A query result is current to its fetch time. Exports, the run store and
+    the sample are only current to their newest run start or modification;
+    their fetch time is merely when the file was read, and evaluating as of
+    it would count every slot since the export as missed.
+
+    Args:
+        freshness: Output of get_freshness
+
+    Returns:
+        Evaluation time (None if the stamp has neither a watermark nor a fetch time)
+    """
+    if freshness.get('origin') not in QUERY_ORIGINS:
+        watermarks = [value for value in (freshness.get('max_started'), freshness.get('max_modified')) if value]
+        if watermarks:
+            return datetime.fromisoformat(max(watermarks))
+    fetched_at = freshness.get('fetched_at')
+    return datetime.fromisoformat(fetched_at) if fetched_at else None
+
+def sla_report(outcomes: pd.DataFrame, period: str = 'day') -> pd.DataFrame:
+    """
+    Per-flow SLA shares per day, week or month.
+
+    Args:
+        outcomes: Output of compute_sla_outcomes
+        period: 'day', 'week' (Monday to Sunday) or 'month'
+
+    Returns:
+        pd.DataFrame indexed by (flowname, period_start) with slot counts per
+        outcome, <outcome>_pct shares of the decided slots, target_pct and met
+    """
+    columns = ['slots', *SLA_OUTCOMES, *(f"{outcome}_pct" for outcome in SLA_OUTCOMES), 'target_pct', 'met']
+    if outcomes is None or outcomes.empty:
+        return pd.DataFrame(columns=columns)
+
+    decided = outcomes[outcomes['outcome'] != 'pending']
+    if decided.empty:
+        return pd.DataFrame(columns=columns)
+
+    slots = decided['slot']
+    period_start = (slots.dt.floor('D') if period == 'day'
+                    else slots.dt.to_period(SLA_PERIODS[period]).dt.start_time).rename('period_start')
+    keys = [decided['flowname'], period_start]
+    report = decided.groupby(keys + [decided['outcome']], sort=False).size().unstack(fill_value=0)
+    report = report.reindex(columns=list(SLA_OUTCOMES), fill_value=0).sort_index()
+    report.columns.name = None
+    report.insert(0, 'slots', report.sum(axis=1))
+    for outcome in SLA_OUTCOMES:
+        report[f"{outcome}_pct"] = report[outcome] / report['slots'] * 100
+    report['target_pct'] = decided['target_pct'].groupby(keys).max()
+    report['met'] = report['on_time_pct'] >= report['target_pct']
+    return report[columns]
@@ -0,0 +1,192 @@
+"""
+Success rate module for Bot Monitoring Dashboard
+Maintains per-flow success counters in hourly buckets and derives rolling-window rates
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_processing.processors import extract_project_name
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('success_rates')
+
+# Constants
+ROLLING_WINDOWS = {'1h': 1, '24h': 24, '7d': 24 * 7, '30d': 24 * 30}  # Window name to hours
+REOPEN_HOURS = 6  # Buckets this close to the newest one are recounted, as run statuses still change
+_NS_PER_HOUR = 3600 * 10**9
+
+def _hour_buckets(started: pd.Series) -> np.ndarray:
+    """Hours since the epoch for each start time"""
+    return pd.to_datetime(started, errors='coerce').to_numpy(dtype='datetime64[ns]').astype(np.int64) // _NS_PER_HOUR
+
+class SuccessCounters:
+    """
+    Per-flow run and success counts in hourly buckets.
+
+    update() only recounts buckets that are new or still open (within
+    REOPEN_HOURS of the newest bucket); older buckets are final and never
+    touched again. Prefix sums over each flow's buckets are rebuilt after an
+    update, so any trailing window is the difference of two prefix sums and
+    rolling rates for every flow cost O(flows log buckets).
+    """
+
+    def __init__(self):
+        self.counts = pd.DataFrame(columns=['runs', 'successes'],
+                                   index=pd.MultiIndex.from_arrays([[], []], names=['flowname', 'bucket']))
+        self.projects: Dict[str, str] = {}
+        self.newest_bucket: Optional[int] = None
+        self._keys = np.array([], dtype=np.int64)
+        self._flow_codes: Dict[str, int] = {}
+        self._cum_runs = np.array([], dtype=np.int64)
+        self._cum_successes = np.array([], dtype=np.int64)
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Count runs from df into the hourly buckets.
+
+        Args:
+            df: Raw or processed runs with flowname, datetimestarted and wassuccessful or taskstatus
+
+        Returns:
+            Number of buckets (re)counted
+        """
+        if df is None or df.empty or 'flowname' not in df.columns or 'datetimestarted' not in df.columns:
+            return 0
+
+        if 'wassuccessful' in df.columns:
+            successes = pd.to_numeric(df['wassuccessful'], errors='coerce').fillna(0).to_numpy()
+        elif 'taskstatus' in df.columns:
+            successes = (df['taskstatus'] == 'Succeeded').to_numpy()
+        else:
+            return 0
+
+        runs = pd.DataFrame({
+            'flowname': df['flowname'].astype(str).to_numpy(),
+            'bucket': _hour_buckets(df['datetimestarted']),
+            'successes': successes.astype(np.int64),
+        })
+        runs = runs[runs['bucket'] > np.iinfo(np.int64).min // _NS_PER_HOUR]
+        if runs.empty:
+            return 0
+
+        # Buckets older than the reopen horizon are final once counted
+        if self.newest_bucket is not None:
+            known = set(self.counts.index.get_level_values('bucket').unique())
+            horizon = self.newest_bucket - REOPEN_HOURS
+            runs = runs[(runs['bucket'] >= horizon) | ~runs['bucket'].isin(known)]
+            if runs.empty:
+                return 0
+
+        recounted = runs.groupby(['flowname', 'bucket']).agg(
+            runs=('successes', 'size'),
+            successes=('successes', 'sum')
+        )
+        buckets = recounted.index.get_level_values('bucket').unique()
+        kept = self.counts[~self.counts.index.get_level_values('bucket').isin(buckets)]
+        self.counts = pd.concat([kept, recounted]).sort_index()
+        self.newest_bucket = int(self.counts.index.get_level_values('bucket').max())
+
+        for flow in recounted.index.get_level_values('flowname').unique():
+            if flow not in self.projects:
+                self.projects[flow] = extract_project_name(flow)
+
+        self._rebuild_prefix_sums()
+        logger.info(f"Success counters recounted {len(buckets)} hourly buckets")
+        return len(buckets)
+
+    def _rebuild_prefix_sums(self) -> None:
+        """Rebuild the sorted (flow, bucket) keys and per-flow cumulative counts"""
+        flows = self.counts.index.get_level_values('flowname')
+        codes, uniques = pd.factorize(flows, sort=True)
+        self._flow_codes = {flow: code for code, flow in enumerate(uniques)}
+        buckets = self.counts.index.get_level_values('bucket').to_numpy(dtype=np.int64)
+
+        # Offset buckets so (code, bucket) pairs sort as single int64 keys
+        self._bucket_offset = int(buckets.min()) - 1 if len(buckets) else 0
+        self._span = int(buckets.max()) - self._bucket_offset + 1 if len(buckets) else 1
+        self._keys = codes.astype(np.int64) * self._span + (buckets - self._bucket_offset)
+        self._cum_runs = self.counts['runs'].to_numpy(dtype=np.int64).cumsum()
+        self._cum_successes = self.counts['successes'].to_numpy(dtype=np.int64).cumsum()
+
+    def _cumulative_at(self, codes: np.ndarray, bucket: int) -> np.ndarray:
+        """Index into the cumulative arrays of each flow's last bucket before `bucket` (-1 if none)"""
+        relative = np.clip(bucket - self._bucket_offset, 0, self._span)
+        return np.searchsorted(self._keys, codes * self._span + relative, side='left') - 1
+
+    def rolling_rates(self, now: Optional[datetime] = None, windows: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+        """
+        Per-flow runs and success rates over trailing windows.
+
+        Args:
+            now: End of the windows (default: datetime.now())
+            windows: Window name to length in hours (default: ROLLING_WINDOWS)
+
+        Returns:
+            pd.DataFrame indexed by flowname with runs_<w> and success_rate_<w>
+            (percent, NaN when a window has no runs) for every window
+        """
+        windows = windows or ROLLING_WINDOWS
+        if not self._flow_codes:
+            return pd.DataFrame()
+
+        flows = list(self._flow_codes)
+        codes = np.arange(len(flows), dtype=np.int64)
+        end_bucket = int(pd.Timestamp(now or datetime.now()).value // _NS_PER_HOUR) + 1
+        end = self._cumulative_at(codes, end_bucket)
+        first = np.searchsorted(self._keys, codes * self._span, side='left') - 1
+
+        def cumulative(positions: np.ndarray, values: np.ndarray) -> np.ndarray:
+            # Running total of a flow's own entries up to each position (0 before its first entry)
+            base = np.where(first >= 0, values[np.maximum(first, 0)], 0)
+            at = np.where(positions >= 0, values[np.maximum(positions, 0)], 0)
+            return np.where(positions > first, at - base, 0)
+
+        result = {}
+        for name, hours in windows.items():
+            start = self._cumulative_at(codes, end_bucket - hours)
+            runs = cumulative(end, self._cum_runs) - cumulative(start, self._cum_runs)
+            successes = cumulative(end, self._cum_successes) - cumulative(start, self._cum_successes)
+            result[f"runs_{name}"] = runs
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result[f"success_rate_{name}"] = np.where(runs > 0, successes / runs * 100, np.nan)
+
+        rates = pd.DataFrame(result, index=pd.Index(flows, name='flowname'))
+        rates.insert(0, 'automation_project', [self.projects.get(flow, 'Unknown') for flow in flows])
+        return rates
+
+    def project_rates(self, now: Optional[datetime] = None, windows: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+        """
+        Per-project runs and success rates over trailing windows.
+
+        Args:
+            now: End of the windows (default: datetime.now())
+            windows: Window name to length in hours (default: ROLLING_WINDOWS)
+
+        Returns:
+            pd.DataFrame indexed by automation_project with the same columns as rolling_rates
+        """
+        windows = windows or ROLLING_WINDOWS
+        rates = self.rolling_rates(now, windows)
+        if rates.empty:
+            return rates
+
+        projects = pd.DataFrame(index=pd.Index(sorted(rates['automation_project'].unique()), name='automation_project'))
+        grouped = rates.groupby('automation_project')
+        for name in windows:
+            runs = grouped[f"runs_{name}"].sum()
+            successes = (rates[f"runs_{name}"] * rates[f"success_rate_{name}"].fillna(0) / 100).groupby(rates['automation_project']).sum()
+            projects[f"runs_{name}"] = runs
+            projects[f"success_rate_{name}"] = (successes / runs * 100).where(runs > 0)
+        return projects
@@ -0,0 +1,12 @@
+"""
+Data storage module for Bot Monitoring Dashboard
+Contains local persistence for flow run history
+"""
+
+from data_storage.csv_ingest import ingest_csv_exports, find_csv_exports, read_flow_csv, apply_run_schema
+from data_storage.run_store import write_runs, read_runs, apply_retention
+from data_storage.query_cache import QueryResultCache, query_fingerprint
+from data_storage.sql_aggregation import SqlDialect, MSSQL, SQLITE, build_hourly_aggregate_query, build_cell_runs_query
+from data_storage.sources import FlowSource, ConnectionPool, load_sources, fetch_all_sources
+from data_storage.freshness import stamp_freshness, get_freshness, freshness_metrics, prometheus_metrics, data_version, derive_version
+from data_storage.snapshots import Snapshot, save_snapshot, load_snapshot, BackgroundLoads
@@ -0,0 +1,351 @@
+"""
+CSV ingestion module for Bot Monitoring Dashboard
+Incrementally loads every flow_data_*.csv export into a local columnar store
+"""
+
+import os
+import json
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union, Any
+
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('csv_ingest')
+
+# Parquet support is optional - without it every load falls back to plain CSV parsing
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    logger.warning("pyarrow not available - CSV exports will not be cached in columnar form")
+    PARQUET_AVAILABLE = False
+
+# Constants
+CSV_PATTERN = 'flow_data_*.csv'
+DEFAULT_SEARCH_PATHS = ('.', 'data')
+CACHE_DIR = Path(os.getenv('FLOW_CACHE_DIR', '.flow_cache'))
+MANIFEST_VERSION = 2
+
+# Arrow-backed strings when pyarrow is installed
+STRING_DTYPE = 'string[pyarrow]' if PARQUET_AVAILABLE else 'string'
+
+# Explicit dtypes for the known export columns; anything else is dropped on read
+CSV_SCHEMA = {
+    'flowguid': STRING_DTYPE,
+    'flowname': STRING_DTYPE,
+    'state': 'category',
+    'flowowner': 'category',
+    'taskstatus': 'category',
+    'triggertype': 'category',
+    'wassuccessful': 'Int8',
+    'finalsuccessful': 'Int8',
+}
+CSV_DATETIME_COLUMNS = ['startedon', 'lastmodified', 'datetimestarted', 'datetimecompleted']
+SUCCESS_FLAG_COLUMNS = ['wassuccessful', 'finalsuccessful']
+
+# A run is identified by its flow and the moment it started
+RUN_KEY_COLUMNS = ['flowguid', 'datetimestarted']
+
+def find_csv_exports(search_paths: Sequence[str] = DEFAULT_SEARCH_PATHS) -> List[str]:
+    """
+    Find all flow_data_*.csv exports in the given search paths.
+
+    Args:
+        search_paths: Directories to search (non-existent ones are skipped)
+
+    Returns:
+        Sorted list of unique absolute file paths
+    """
+    csv_files = set()
+
+    for path in search_paths:
+        if not os.path.isdir(path):
+            continue
+
+        logger.info(f"Searching for CSV files in '{path}'")
+        try:
+            csv_files.update(str(f.resolve()) for f in Path(path).glob(CSV_PATTERN))
+        except Exception as e:
+            logger.warning(f"Error searching path '{path}': {e}")
+
+            # Fallback to os.listdir if Path.glob fails
+            try:
+                csv_files.update(
+                    os.path.abspath(os.path.join(path, f))
+                    for f in os.listdir(path)
+                    if f.startswith('flow_data_') and f.endswith('.csv')
+                )
+            except Exception as list_err:
+                logger.warning(f"Error listing files in '{path}': {list_err}")
+
+    return sorted(csv_files)
+
+def read_flow_csv(filepath: str) -> pd.DataFrame:
+    """
+    Read a single flow_data CSV export and normalize its core columns.
+
+    Only columns listed in CSV_SCHEMA are loaded, with explicit dtypes so no
+    inference pass is needed. Timestamps are parsed by the reader itself and
+    low-cardinality text columns are loaded as categoricals. The pyarrow
+    engine is used when available, falling back to the C engine if pyarrow
+    rejects the file (for example non-ISO timestamps).
+
+    Args:
+        filepath: Path to the CSV file
+
+    Returns:
+        DataFrame with the export's rows
+
+    Raises:
+        pd.errors.EmptyDataError, pd.errors.ParserError: If the file cannot be parsed
+    """
+    # Read the header only to project the schema onto the columns present
+    header = pd.read_csv(filepath, nrows=0).columns
+    usecols = [col for col in header if col in CSV_SCHEMA or col in CSV_DATETIME_COLUMNS]
+    if not usecols:
+        usecols = list(header)
+    dtype = {col: CSV_SCHEMA[col] for col in usecols if col in CSV_SCHEMA}
+    parse_dates = [col for col in usecols if col in CSV_DATETIME_COLUMNS]
+
+    df = None
+    if PARQUET_AVAILABLE:
+        try:
+            # pyarrow infers ISO timestamps natively, which is far cheaper than parse_dates
+            df = pd.read_csv(filepath, engine='pyarrow', usecols=usecols, dtype=dtype)
+        except Exception as e:
+            logger.info(f"pyarrow CSV engine could not read '{filepath}' ({e}) - using C engine")
+
+    if df is None:
+        df = pd.read_csv(filepath, usecols=usecols, dtype=dtype, parse_dates=parse_dates)
+
+    # Coerce any timestamp column the reader left unparsed
+    for col in parse_dates:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    # Derive success flags with vectorized comparisons
+    if 'taskstatus' in df.columns:
+        succeeded = (df['taskstatus'] == 'Succeeded').astype('int8')
+        for col in SUCCESS_FLAG_COLUMNS:
+            if col not in df.columns:
+                df[col] = succeeded
+
+    return df
+
+def apply_run_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast known run columns to their storage dtypes.
+
+    Text columns become Arrow-backed strings or dictionary-encoded
+    categoricals, so run data from any source (database, CSV, store) holds no
+    per-row Python string objects.
+
+    Args:
+        df: Run data with any subset of the CSV_SCHEMA columns
+
+    Returns:
+        The same DataFrame with converted columns
+    """
+    for col, dtype in CSV_SCHEMA.items():
+        # Numeric success flags need no encoding and may legitimately hold other integer types
+        if col not in df.columns or col in SUCCESS_FLAG_COLUMNS or str(df[col].dtype) == dtype:
+            continue
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not convert column '{col}' to {dtype}: {e}")
+    return df
+
+def _part_name(filepath: str) -> str:
+    """Stable Parquet file name for the parsed copy of a CSV export"""
+    return hashlib.sha1(filepath.encode('utf-8')).hexdigest()[:16] + '.parquet'
+
+def _parse_to_part(job: Tuple[str, str]) -> Tuple[str, int, Optional[str]]:
+    """
+    Worker: parse one CSV export and write it as a Parquet part.
+
+    Runs in a separate process, so only paths and counts cross the process
+    boundary - the parsed frame never gets pickled back to the parent.
+
+    Args:
+        job: (csv_path, part_path) tuple
+
+    Returns:
+        tuple: (csv_path, row_count, error_message or None)
+    """
+    csv_path, part_path = job
+    try:
+        df = read_flow_csv(csv_path)
+        tmp_path = part_path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, part_path)
+        return csv_path, len(df), None
+    except Exception as e:
+        return csv_path, 0, str(e)
+
+def _load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the ingestion manifest, returning an empty one if missing or outdated"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            logger.info("Ingestion manifest version changed - re-ingesting all exports")
+            return {}
+        return manifest.get('files', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Could not read ingestion manifest: {e}")
+        return {}
+
+def _save_manifest(manifest_path: Path, files: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically write the ingestion manifest"""
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+def deduplicate_runs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop duplicate runs by flow GUID + start time, keeping the last occurrence.
+
+    Rows missing either key column are kept as-is since they cannot be matched.
+
+    Args:
+        df: DataFrame ordered so that the preferred copy of a run comes last
+
+    Returns:
+        Deduplicated DataFrame
+    """
+    if df.empty or not all(col in df.columns for col in RUN_KEY_COLUMNS):
+        return df
+
+    keyed = df[RUN_KEY_COLUMNS].notna().all(axis=1)
+    deduped = df[keyed].drop_duplicates(subset=RUN_KEY_COLUMNS, keep='last')
+    removed = int(keyed.sum()) - len(deduped)
+    if removed:
+        logger.info(f"Removed {removed} duplicate runs")
+
+    return pd.concat([deduped, df[~keyed]], ignore_index=True)
+
+def ingest_csv_exports(
+    search_paths: Sequence[str] = DEFAULT_SEARCH_PATHS,
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Load the full history of CSV exports, parsing only new or changed files.
+
+    Every export is tracked in a manifest of (path, size, mtime). Files whose
+    entry is unchanged are served from their Parquet part; new or modified
+    files are parsed in parallel worker processes. Parts are merged with
+    newer exports taking precedence and runs deduplicated by flow GUID +
+    start time. The merged result is itself cached, so a rerun with no
+    changed exports reads a single Parquet file.
+
+    Args:
+        search_paths: Directories to search for flow_data_*.csv files
+        cache_dir: Directory for the manifest and Parquet parts (default: FLOW_CACHE_DIR)
+        max_workers: Maximum number of parser processes (default: CPU count)
+
+    Returns:
+        pd.DataFrame: Merged, deduplicated run history (empty if no exports found)
+    """
+    if not PARQUET_AVAILABLE:
+        raise ImportError("pyarrow is required for incremental CSV ingestion")
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    parts_dir = cache_dir / 'csv_parts'
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / 'csv_manifest.json'
+    merged_path = cache_dir / 'csv_history.parquet'
+
+    csv_files = find_csv_exports(search_paths)
+    if not csv_files:
+        logger.warning("No flow_data_*.csv files found in any search path")
+        return pd.DataFrame()
+
+    previous = _load_manifest(manifest_path)
+    current: Dict[str, Dict[str, Any]] = {}
+    jobs = []
+
+    for csv_path in csv_files:
+        try:
+            stat = os.stat(csv_path)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable CSV export '{csv_path}': {e}")
+            continue
+
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime, 'part': _part_name(csv_path)}
+        old = previous.get(csv_path)
+        if (old and old.get('size') == entry['size'] and old.get('mtime') == entry['mtime']
+                and (parts_dir / old.get('part', '')).exists()):
+            entry['rows'] = old.get('rows', 0)
+        else:
+            jobs.append((csv_path, str(parts_dir / entry['part'])))
+        current[csv_path] = entry
+
+    removed = set(previous) - set(current)
+    for csv_path in removed:
+        try:
+            (parts_dir / previous[csv_path].get('part', '')).unlink()
+        except OSError:
+            pass
+
+    if not jobs and not removed and merged_path.exists():
+        logger.info(f"All {len(current)} CSV exports unchanged - using cached history")
+        return pd.read_parquet(merged_path)
+
+    if jobs:
+        logger.info(f"Parsing {len(jobs)} new or changed CSV exports ({len(current) - len(jobs)} unchanged)")
+        if len(jobs) == 1:
+            results = [_parse_to_part(jobs[0])]
+        else:
+            try:
+                workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(_parse_to_part, jobs))
+            except Exception as e:
+                logger.warning(f"Parallel CSV parsing unavailable ({e}) - parsing serially")
+                results = [_parse_to_part(job) for job in jobs]
+
+        for csv_path, rows, error in results:
+            if error:
+                logger.error(f"Error parsing CSV file '{csv_path}': {error}")
+                current.pop(csv_path, None)
+            else:
+                current[csv_path]['rows'] = rows
+
+    # Merge parts oldest export first so newer copies of a run win the dedupe
+    frames = []
+    for csv_path, entry in sorted(current.items(), key=lambda item: item[1]['mtime']):
+        try:
+            frames.append(pd.read_parquet(parts_dir / entry['part']))
+        except Exception as e:
+            logger.warning(f"Could not read cached part for '{csv_path}': {e}")
+
+    frames = [frame for frame in frames if not frame.empty]
+    merged = deduplicate_runs(pd.concat(frames, ignore_index=True)) if frames else pd.DataFrame()
+
+    try:
+        if not merged.empty:
+            tmp_path = merged_path.with_suffix('.tmp')
+            merged.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, merged_path)
+        _save_manifest(manifest_path, current)
+    except Exception as e:
+        logger.warning(f"Could not persist CSV ingestion cache: {e}")
+
+    logger.info(f"Ingested {len(merged)} runs from {len(current)} CSV exports")
+    return merged
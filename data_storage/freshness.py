@@ -0,0 +1,190 @@
+"""
+Freshness module for Bot Monitoring Dashboard
+Records data watermarks and fetch timings with each loaded snapshot and derives pipeline lag metrics
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('data_freshness')
+
+# Constants
+FRESHNESS_ATTR = 'freshness'    # DataFrame.attrs key; attrs survive the Parquet query cache and run store
+VERSION_ATTR = 'data_version'
+FRESHNESS_WARNING_MINUTES = float(os.getenv('FRESHNESS_WARNING_MINUTES', '30'))
+FRESHNESS_CRITICAL_MINUTES = float(os.getenv('FRESHNESS_CRITICAL_MINUTES', '120'))
+FRESHNESS_LEVELS = ('fresh', 'warning', 'critical', 'unknown')
+METRICS_PREFIX = 'flow_monitor'
+
+def _max_timestamp(df: pd.DataFrame, column: str) -> Optional[str]:
+    """Latest timestamp of a column as an ISO string (None if absent or empty)"""
+    if column not in df.columns or df.empty:
+        return None
+    latest = pd.to_datetime(df[column], errors='coerce').max()
+    return None if pd.isna(latest) else latest.isoformat()
+
+def stamp_freshness(
+    df: pd.DataFrame,
+    origin: str,
+    query_seconds: Optional[float] = None,
+    fetched_at: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    Record the snapshot's watermarks and fetch timing in df.attrs.
+
+    The stamp is taken once when the data is fetched; the query cache keeps
+    it with the result, so cache hits report when the data was actually
+    fetched instead of being measured again.
+
+    Args:
+        df: Loaded runs
+        origin: Where the runs came from ('database', 'sources', 'store', 'csv' or 'sample')
+        query_seconds: Duration of the query (None when no query ran)
+        fetched_at: Completion time of the fetch (default: now)
+
+    Returns:
+        The same DataFrame
+    """
+    df.attrs[FRESHNESS_ATTR] = {
+        'origin': origin,
+        'rows': int(len(df)),
+        'max_started': _max_timestamp(df, 'datetimestarted'),
+        'max_modified': _max_timestamp(df, 'lastmodified'),
+        'query_seconds': None if query_seconds is None else float(query_seconds),
+        'fetched_at': (fetched_at or datetime.now()).isoformat(),
+    }
+    return df
+
+def get_freshness(df: Optional[pd.DataFrame]) -> Dict[str, Any]:
+    """Freshness stamp of a snapshot (measured now if it was never stamped)"""
+    if df is None:
+        return {}
+    if FRESHNESS_ATTR not in df.attrs:
+        stamp_freshness(df, 'unknown')
+    return dict(df.attrs[FRESHNESS_ATTR])
+
+def data_version(df: Optional[pd.DataFrame]) -> str:
+    """
+    Version token of a loaded snapshot.
+
+    Built from the freshness watermarks and the row count, which are known
+    from the stamp without touching the data, so it costs the same for a
+    month of runs as for ten. Tokens start with the newest watermark and
+    sort in load order; a change to any run's status moves LastModified and
+    therefore the token. Row subsets (df[mask]) inherit attrs but get their
+    own token because their length differs; use derive_version for subsets
+    of equal length.
+
+    Args:
+        df: Loaded runs
+
+    Returns:
+        Token such as '2024-05-01T10:42:07#15230-1a2b3c4d'
+    """
+    if df is None:
+        return 'none'
+    cached = df.attrs.get(VERSION_ATTR)
+    if cached is not None and cached[1] == len(df):
+        return cached[0]
+
+    freshness = get_freshness(df)
+    watermarks = [value for value in (freshness.get('max_started'), freshness.get('max_modified')) if value]
+    material = json.dumps([freshness.get('origin'), freshness.get('max_started'), freshness.get('max_modified'), len(df)])
+    digest = hashlib.sha1(material.encode('utf-8')).hexdigest()[:8]
+    version = f"{max(watermarks) if watermarks else 'none'}#{len(df)}-{digest}"
+    df.attrs[VERSION_ATTR] = [version, len(df)]
+    return version
+
+def derive_version(df: pd.DataFrame, parent_version: str, *params: Hashable) -> str:
+    """Give a subset of a snapshot its own token, derived from the parent token and the subset parameters"""
+    digest = hashlib.sha1(json.dumps([parent_version, *params], default=str).encode('utf-8')).hexdigest()[:8]
+    version = f"{parent_version}/{digest}"
+    df.attrs[VERSION_ATTR] = [version, len(df)]
+    return version
+
+def freshness_level(lag_seconds: Optional[float]) -> str:
+    """'fresh', 'warning' or 'critical' against the lag thresholds ('unknown' without a lag)"""
+    if lag_seconds is None:
+        return 'unknown'
+    if lag_seconds >= FRESHNESS_CRITICAL_MINUTES * 60:
+        return 'critical'
+    if lag_seconds >= FRESHNESS_WARNING_MINUTES * 60:
+        return 'warning'
+    return 'fresh'
+
+def freshness_metrics(freshness: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Pipeline lag metrics of a freshness stamp.
+
+    Ingestion lag is the time from the newest run start or modification in
+    the data to now, so it covers both a stale rpa_FlowRunHistory table and
+    a stale fetch; fetch age isolates the part caused by caching.
+
+    Args:
+        freshness: Output of get_freshness
+        now: Reference time (default: datetime.now())
+
+    Returns:
+        Dict with rows, query_seconds, fetch_age_seconds, started_lag_seconds,
+        modified_lag_seconds, ingestion_lag_seconds (None where unknown) and level
+    """
+    now = now or datetime.now()
+
+    def age(key: str) -> Optional[float]:
+        value = freshness.get(key)
+        return None if value is None else (now - datetime.fromisoformat(value)).total_seconds()
+
+    started_lag = age('max_started')
+    modified_lag = age('max_modified')
+    known = [lag for lag in (started_lag, modified_lag) if lag is not None]
+    ingestion_lag = min(known) if known else None
+    return {
+        'origin': freshness.get('origin'),
+        'rows': freshness.get('rows'),
+        'query_seconds': freshness.get('query_seconds'),
+        'fetch_age_seconds': age('fetched_at'),
+        'started_lag_seconds': started_lag,
+        'modified_lag_seconds': modified_lag,
+        'ingestion_lag_seconds': ingestion_lag,
+        'level': freshness_level(ingestion_lag),
+    }
+
+def prometheus_metrics(metrics: Dict[str, Any], prefix: str = METRICS_PREFIX) -> str:
+    """
+    Freshness metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics: Output of freshness_metrics
+        prefix: Metric name prefix
+
+    Returns:
+        Exposition text with one gauge per known numeric metric, and a level
+        gauge per freshness level (1 for the current one)
+    """
+    lines = []
+    origin = metrics.get('origin') or 'unknown'
+    for name in ('rows', 'query_seconds', 'fetch_age_seconds', 'started_lag_seconds',
+                 'modified_lag_seconds', 'ingestion_lag_seconds'):
+        value = metrics.get(name)
+        if value is None:
+            continue
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.append(f'{prefix}_{name}{{origin="{origin}"}} {float(value):g}')
+    lines.append(f"# TYPE {prefix}_freshness_level gauge")
+    for level in FRESHNESS_LEVELS:
+        lines.append(f'{prefix}_freshness_level{{level="{level}"}} {int(metrics.get("level") == level)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,324 @@
+"""
+Query result cache for Bot Monitoring Dashboard
+Disk-backed cache of query results keyed by query fingerprint, shared across processes
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import pandas as pd
+
+from data_storage.csv_ingest import CACHE_DIR, PARQUET_AVAILABLE
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('query_cache')
+
+# Constants
+QUERY_CACHE_DIR = CACHE_DIR / 'queries'
+DEFAULT_TTL_SECONDS = float(os.getenv('QUERY_CACHE_TTL_SECONDS', '300'))
+DEFAULT_MAX_BYTES = int(float(os.getenv('QUERY_CACHE_MAX_MB', '512')) * 1024 * 1024)
+LOCK_TIMEOUT_SECONDS = float(os.getenv('QUERY_LOCK_TIMEOUT_SECONDS', '600'))  # Longest wait for another process's fetch
+LOCK_HEARTBEAT_SECONDS = 10     # A held lock file is touched this often
+LOCK_STALE_SECONDS = 60         # Locks not touched for this long are assumed abandoned
+LOCK_POLL_SECONDS = 0.1
+
+_WHITESPACE = re.compile(r'\s+')
+
+def query_fingerprint(sql: str, params: Any = None, window: Optional[str] = None) -> str:
+    """
+    Fingerprint a query by its normalized SQL text, parameters and time window.
+
+    Args:
+        sql: SQL text (whitespace differences are ignored)
+        params: Query parameters (must be JSON serializable or convertible with str)
+        window: Description of the time window the query covers
+
+    Returns:
+        Hex digest identifying the query
+    """
+    normalized = _WHITESPACE.sub(' ', sql).strip()
+    material = json.dumps([normalized, params, window], default=str, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+
+class _FileLock:
+    """
+    Cross-process lock based on exclusive creation of a lock file.
+
+    Works on every platform without extra dependencies. The holder touches
+    the lock file every LOCK_HEARTBEAT_SECONDS, so a lock is only broken as
+    abandoned once it has gone LOCK_STALE_SECONDS without a heartbeat (its
+    process crashed), never because the fetch is slow. Waiters give up
+    after timeout seconds and fetch without the lock. The lock file holds
+    a token of its owner, and only the owner removes it.
+    """
+
+    def __init__(self, path: Path, timeout: float = LOCK_TIMEOUT_SECONDS):
+        self.path = path
+        self.timeout = timeout
+        self.acquired = False
+        self.token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def _owned(self) -> bool:
+        try:
+            return self.path.read_text(encoding='ascii') == self.token
+        except (OSError, ValueError):
+            return False
+
+    def _beat(self) -> None:
+        while not self._stop.wait(LOCK_HEARTBEAT_SECONDS):
+            if not self._owned():
+                return
+            try:
+                os.utime(self.path)
+            except OSError:
+                return
+
+    def _break_stale(self) -> None:
+        """
+        Remove an abandoned lock file without racing other waiters.
+
+        The file is first renamed to a name only this waiter uses, which is
+        atomic: of several waiters that saw it stale, one moves it and the
+        rest find it gone. The moved file is checked again; if it turns out
+        to be live (a new owner took the lock between the stat and the
+        rename), it is linked back unless yet another lock was created.
+        """
+        aside = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.replace(self.path, aside)
+        except FileNotFoundError:
+            return
+        try:
+            if time.time() - aside.stat().st_mtime > LOCK_STALE_SECONDS:
+                logger.warning(f"Breaking stale cache lock {self.path.name}")
+                return
+            try:
+                os.link(aside, self.path)
+            except FileExistsError:
+                logger.warning(f"Cache lock {self.path.name} was replaced while breaking it")
+        finally:
+            aside.unlink(missing_ok=True)
+
+    def __enter__(self) -> '_FileLock':
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, self.token.encode('ascii'))
+                os.close(fd)
+                self.acquired = True
+                self._heartbeat = threading.Thread(target=self._beat, name='cache-lock-heartbeat', daemon=True)
+                self._heartbeat.start()
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime > LOCK_STALE_SECONDS:
+                        self._break_stale()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    logger.warning(f"Timed out waiting for cache lock {self.path.name}")
+                    return self
+                time.sleep(LOCK_POLL_SECONDS)
+
+    def __exit__(self, *exc) -> None:
+        if not self.acquired:
+            return
+        self._stop.set()
+        if self._owned():
+            self.path.unlink(missing_ok=True)
+        else:
+            logger.warning(f"Cache lock {self.path.name} was taken over; leaving it to its new owner")
+
+class QueryResultCache:
+    """
+    Disk-backed cache of query results stored as Parquet files.
+
+    Each entry is <fingerprint>.parquet plus a <fingerprint>.json sidecar
+    recording when it was created. Entries expire after ttl_seconds (or a
+    shorter TTL recorded with the entry, e.g. for partial results); the
+    Parquet file's mtime is bumped on every hit so eviction can drop the
+    least recently used entries once the cache exceeds max_bytes. Writes are
+    atomic renames and fills are serialized per fingerprint with a lock
+    file, so concurrent processes share one query instead of racing.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else QUERY_CACHE_DIR
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    def _paths(self, key: str):
+        return (
+            self.cache_dir / f"{key}.parquet",
+            self.cache_dir / f"{key}.json",
+            self.cache_dir / f"{key}.lock",
+        )
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Cached result for a fingerprint, or None if missing or expired.
+
+        Args:
+            key: Query fingerprint
+
+        Returns:
+            Cached DataFrame or None
+        """
+        if not PARQUET_AVAILABLE:
+            return None
+
+        data_path, meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if time.time() - meta.get('created', 0) > meta.get('ttl', self.ttl_seconds):
+                return None
+            df = pd.read_parquet(data_path)
+            os.utime(data_path)  # Mark as recently used
+            logger.info(f"Query cache hit for {key} ({len(df)} rows)")
+            return df
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read cached query result {key}: {e}")
+            return None
+
+    def put(self, key: str, df: pd.DataFrame, description: str = '', ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a query result and evict least recently used entries if over budget.
+
+        Args:
+            key: Query fingerprint
+            df: Result to cache
+            description: Optional human-readable note stored in the sidecar
+            ttl_seconds: Lifetime of this entry if shorter than the cache TTL
+        """
+        if not PARQUET_AVAILABLE or df is None:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data_path, meta_path, _ = self._paths(key)
+        try:
+            tmp_data = data_path.with_suffix(f".{os.getpid()}.tmp")
+            df.to_parquet(tmp_data, index=False)
+            os.replace(tmp_data, data_path)
+
+            tmp_meta = meta_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                meta = {'created': time.time(), 'rows': len(df), 'description': description}
+                if ttl_seconds is not None:
+                    meta['ttl'] = min(ttl_seconds, self.ttl_seconds)
+                json.dump(meta, f)
+            os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            logger.warning(f"Could not cache query result {key}: {e}")
+            return
+
+        self.evict()
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], pd.DataFrame],
+        refresh: bool = False,
+        description: str = '',
+        ttl_for: Optional[Callable[[pd.DataFrame], Optional[float]]] = None
+    ) -> pd.DataFrame:
+        """
+        Return the cached result, or run fetch once across all processes and cache it.
+
+        Args:
+            key: Query fingerprint
+            fetch: Function that runs the query
+            refresh: Ignore any cached result and fetch again
+            description: Optional human-readable note stored with the entry
+            ttl_for: Optional function giving a fetched result a shorter TTL
+                (None keeps the cache TTL, 0 or less skips caching)
+
+        Returns:
+            Query result
+        """
+        if not refresh:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+        if not PARQUET_AVAILABLE:
+            return fetch()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with _FileLock(self._paths(key)[2]):
+            # Another process may have filled the entry while we waited for the lock
+            if not refresh:
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+            df = fetch()
+            ttl_seconds = ttl_for(df) if ttl_for is not None else None
+            if ttl_seconds is None or ttl_seconds > 0:
+                self.put(key, df, description, ttl_seconds)
+            return df
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until within max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        now = time.time()
+        removed = 0
+        for data_path in self.cache_dir.glob('*.parquet'):
+            meta_path = data_path.with_suffix('.json')
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                created, ttl = meta.get('created', 0), meta.get('ttl', self.ttl_seconds)
+                stat = data_path.stat()
+            except (OSError, ValueError):
+                created, ttl, stat = 0, self.ttl_seconds, None
+
+            if stat is None or now - created > ttl:
+                data_path.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, data_path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, data_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            data_path.unlink(missing_ok=True)
+            data_path.with_suffix('.json').unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} query cache entries")
+        return removed
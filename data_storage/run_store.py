@@ -0,0 +1,242 @@
+"""
+Run history store for Bot Monitoring Dashboard
+Maintains a local day-partitioned Parquet dataset of flow runs
+"""
+
+import os
+import time
+import shutil
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from data_storage.csv_ingest import CACHE_DIR, PARQUET_AVAILABLE, RUN_KEY_COLUMNS, deduplicate_runs
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('run_store')
+
+# Constants
+RUN_STORE_DIR = CACHE_DIR / 'runs'
+PARTITION_PREFIX = 'day='
+RETENTION_DAYS = int(os.getenv('RUN_STORE_RETENTION_DAYS', '90'))
+COMPACT_THRESHOLD = 4  # Parts per day before a write triggers compaction
+
+DateLike = Union[str, date, datetime]
+
+def _store_dir(store_dir: Optional[Union[str, Path]]) -> Path:
+    """Resolve the store directory, defaulting to RUN_STORE_DIR"""
+    return Path(store_dir) if store_dir is not None else RUN_STORE_DIR
+
+def _partition_dir(root: Path, day: date) -> Path:
+    """Directory holding the Parquet parts for a single day"""
+    return root / f"{PARTITION_PREFIX}{day.isoformat()}"
+
+def _to_date(value: DateLike) -> date:
+    """Convert a date-like value to a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.to_datetime(value).date()
+
+def list_partitions(store_dir: Optional[Union[str, Path]] = None) -> Dict[date, Path]:
+    """
+    List the day partitions present in the store.
+
+    Args:
+        store_dir: Store directory (default: RUN_STORE_DIR)
+
+    Returns:
+        Dictionary of partition date to partition directory
+    """
+    root = _store_dir(store_dir)
+    partitions = {}
+    if not root.is_dir():
+        return partitions
+
+    for entry in root.iterdir():
+        if entry.is_dir() and entry.name.startswith(PARTITION_PREFIX):
+            try:
+                partitions[date.fromisoformat(entry.name[len(PARTITION_PREFIX):])] = entry
+            except ValueError:
+                logger.warning(f"Ignoring unrecognised partition directory '{entry.name}'")
+
+    return partitions
+
+def _part_files(partition: Path) -> List[Path]:
+    """Parquet parts of a partition, oldest first"""
+    return sorted(partition.glob('part-*.parquet'))
+
+def write_runs(df: pd.DataFrame, store_dir: Optional[Union[str, Path]] = None) -> int:
+    """
+    Write runs through to the store, one new Parquet part per day touched.
+
+    Writes only ever add files, so concurrent writers never overwrite each
+    other; duplicates across parts are resolved on read and by compaction.
+    Days that accumulate COMPACT_THRESHOLD parts are compacted immediately.
+
+    Args:
+        df: Runs to store (must contain datetimestarted)
+        store_dir: Store directory (default: RUN_STORE_DIR)
+
+    Returns:
+        Number of rows written
+    """
+    if not PARQUET_AVAILABLE:
+        logger.warning("pyarrow not available - run history store disabled")
+        return 0
+
+    if df is None or df.empty or 'datetimestarted' not in df.columns:
+        return 0
+
+    root = _store_dir(store_dir)
+    runs = df.copy()
+    runs['datetimestarted'] = pd.to_datetime(runs['datetimestarted'], errors='coerce')
+    invalid = runs['datetimestarted'].isna()
+    if invalid.any():
+        logger.warning(f"Not storing {invalid.sum()} runs without a valid start time")
+        runs = runs[~invalid]
+
+    written = 0
+    stamp = f"{time.time_ns()}-{os.getpid()}"
+    for day, day_df in runs.groupby(runs['datetimestarted'].dt.date):
+        partition = _partition_dir(root, day)
+        partition.mkdir(parents=True, exist_ok=True)
+        part_path = partition / f"part-{stamp}.parquet"
+        tmp_path = part_path.with_suffix('.tmp')
+        day_df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, part_path)
+        written += len(day_df)
+
+        if len(_part_files(partition)) >= COMPACT_THRESHOLD:
+            compact_partition(partition)
+
+    logger.info(f"Wrote {written} runs to the run history store")
+    return written
+
+def compact_partition(partition: Path) -> None:
+    """
+    Merge all parts of a day partition into a single deduplicated file.
+
+    Args:
+        partition: Partition directory to compact
+    """
+    parts = _part_files(partition)
+    if len(parts) <= 1:
+        return
+
+    try:
+        merged = deduplicate_runs(pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True))
+        # Name the compacted file after the newest part so it still sorts after older parts
+        compacted = partition / (parts[-1].stem + '-c.parquet')
+        tmp_path = compacted.with_suffix('.tmp')
+        merged.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, compacted)
+        for part in parts:
+            part.unlink(missing_ok=True)
+        logger.info(f"Compacted {len(parts)} parts in {partition.name} to {len(merged)} runs")
+    except Exception as e:
+        logger.warning(f"Could not compact partition {partition.name}: {e}")
+
+def read_runs(
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    columns: Optional[Sequence[str]] = None,
+    store_dir: Optional[Union[str, Path]] = None
+) -> pd.DataFrame:
+    """
+    Read runs from the store with partition pruning and column projection.
+
+    Only partitions within [start_date, end_date] are opened and only the
+    requested columns are read, so loading one compacted day reads one file.
+
+    Args:
+        start_date: First day to include (default: earliest stored day)
+        end_date: Last day to include (default: latest stored day)
+        columns: Columns to load (default: all)
+        store_dir: Store directory (default: RUN_STORE_DIR)
+
+    Returns:
+        pd.DataFrame: Stored runs (empty if none match)
+    """
+    if not PARQUET_AVAILABLE:
+        return pd.DataFrame()
+
+    start = _to_date(start_date) if start_date is not None else date.min
+    end = _to_date(end_date) if end_date is not None else date.max
+    partitions = [
+        path for day, path in sorted(list_partitions(store_dir).items())
+        if start <= day <= end
+    ]
+
+    # Dedupe needs the run key even if the caller did not ask for it
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys(list(columns) + RUN_KEY_COLUMNS))
+
+    frames = []
+    for partition in partitions:
+        for part in _part_files(partition):
+            try:
+                frames.append(pd.read_parquet(part, columns=read_columns))
+            except Exception as e:
+                logger.warning(f"Could not read stored part {part}: {e}")
+
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+
+    runs = pd.concat(frames, ignore_index=True)
+    if len(frames) > len(partitions):
+        runs = deduplicate_runs(runs)
+    if columns is not None:
+        runs = runs[list(columns)]
+
+    logger.info(f"Read {len(runs)} runs from {len(partitions)} stored day partitions")
+    return runs
+
+def apply_retention(
+    retention_days: int = RETENTION_DAYS,
+    store_dir: Optional[Union[str, Path]] = None,
+    compact: bool = True
+) -> int:
+    """
+    Enforce the store's retention and compaction policy.
+
+    Partitions older than retention_days are deleted and, if compact is set,
+    every remaining partition with more than one part is compacted.
+
+    Args:
+        retention_days: Number of days of history to keep
+        store_dir: Store directory (default: RUN_STORE_DIR)
+        compact: Whether to compact the remaining partitions
+
+    Returns:
+        Number of partitions removed
+    """
+    cutoff = date.today() - timedelta(days=retention_days)
+    removed = 0
+
+    for day, partition in list_partitions(store_dir).items():
+        if day < cutoff:
+            shutil.rmtree(partition, ignore_errors=True)
+            removed += 1
+        elif compact:
+            # Temp files older than an hour are leftovers of interrupted writes
+            for leftover in partition.glob('*.tmp'):
+                if time.time() - leftover.stat().st_mtime > 3600:
+                    leftover.unlink(missing_ok=True)
+            compact_partition(partition)
+
+    if removed:
+        logger.info(f"Removed {removed} day partitions older than {cutoff}")
+    return removed
@@ -0,0 +1,281 @@
+"""
+Warm-start module for Bot Monitoring Dashboard
+Persists the last processed snapshot for instant cold starts and loads fresh data in the background
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from data_storage.csv_ingest import CACHE_DIR, PARQUET_AVAILABLE
+from data_storage.query_cache import DEFAULT_TTL_SECONDS
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('warm_start')
+
+# Constants
+SNAPSHOT_DIR = CACHE_DIR / 'snapshot'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAX_AGE_HOURS = float(os.getenv('SNAPSHOT_MAX_AGE_HOURS', '24'))  # Older snapshots are not served
+SNAPSHOT_FILES = ('processed', 'matrix')
+STALE_FILE_SECONDS = 300            # Unreferenced data files older than this are left over from failed saves
+
+_SAVE_LOCK = threading.Lock()       # Serializes saves within the process
+_LAST_SAVED: Dict[Path, Hashable] = {}  # Key of the last snapshot persisted per directory
+
+class Snapshot:
+    """
+    Processed data of one day as shown on the dashboard.
+
+    Holds the processed runs, the unfiltered hourly matrix and the summary
+    values of the data summary section, plus when and from what data it was
+    taken. On disk the frames are Parquet files (the matrix as a long table
+    of the cells that ran) next to a small JSON manifest that points to them.
+    """
+
+    def __init__(
+        self,
+        selected_date: date,
+        processed_df: pd.DataFrame,
+        matrix: Tuple[Dict[str, Dict[int, str]], List[str], List[int]],
+        summaries: Dict[str, Any],
+        freshness: Optional[Dict[str, Any]] = None,
+        saved_at: Optional[datetime] = None
+    ):
+        self.selected_date = selected_date
+        self.processed_df = processed_df
+        self.matrix = matrix
+        self.summaries = summaries
+        self.freshness = freshness or {}
+        self.saved_at = saved_at or datetime.now()
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        """Seconds since the snapshot was taken"""
+        return ((now or datetime.now()) - self.saved_at).total_seconds()
+
+def _matrix_cells(matrix: Tuple[Dict[str, Dict[int, str]], List[str], List[int]]) -> pd.DataFrame:
+    """Long table of the matrix cells with a run"""
+    bot_hour_status, display_names, _ = matrix
+    rows = [(name, hour, status) for name in display_names
+            for hour, status in bot_hour_status.get(name, {}).items() if status != "No Run"]
+    return pd.DataFrame(rows, columns=['display_name', 'hour', 'status'])
+
+def _read_manifest(directory: Path) -> Optional[Dict[str, Any]]:
+    """Manifest of the snapshot in a directory, or None if there is none"""
+    try:
+        with open(directory / 'manifest.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _snapshot_files(manifest: Dict[str, Any]) -> Dict[str, str]:
+    """Data file names a manifest points to (snapshots saved before versioned files used fixed names)"""
+    return manifest.get('files') or {name: f"{name}.parquet" for name in SNAPSHOT_FILES}
+
+def _remove_superseded(directory: Path, manifest: Dict[str, Any], replaced: Optional[Dict[str, Any]]) -> None:
+    """
+    Delete data files no manifest needs any more.
+
+    The files of the current and the replaced manifest are kept, so a reader
+    that read the old manifest just before the swap can still open its
+    files. Files the replaced manifest had superseded go right away; other
+    unreferenced files (left by interrupted saves, or still being written by
+    another process) only once they are STALE_FILE_SECONDS old.
+    """
+    keep = set(_snapshot_files(manifest).values()) | set(manifest.get('previous_files', []))
+    superseded = set(replaced.get('previous_files', [])) if replaced else set()
+    now = time.time()
+    for path in list(directory.glob('*.parquet')) + list(directory.glob('manifest.*.tmp')):
+        if path.name in keep:
+            continue
+        try:
+            if path.name in superseded or now - path.stat().st_mtime > STALE_FILE_SECONDS:
+                path.unlink()
+        except OSError:
+            pass
+
+def save_snapshot(
+    snapshot: Snapshot,
+    directory: Optional[os.PathLike] = None,
+    key: Optional[Hashable] = None
+) -> bool:
+    """
+    Persist a snapshot, replacing the previous one.
+
+    The data files are written under names unique to this save and the
+    manifest pointing to them is swapped in with a single atomic rename, so
+    readers always find a complete snapshot, before or after the swap.
+    Saves within the process are serialized, and a save whose key matches
+    the last one persisted to the directory is skipped.
+
+    Args:
+        snapshot: Snapshot to store
+        directory: Target directory (default: SNAPSHOT_DIR)
+        key: Identifier of the data in the snapshot (e.g. its data version)
+
+    Returns:
+        True if the snapshot was written or was already persisted
+    """
+    if not PARQUET_AVAILABLE:
+        return False
+
+    target = SNAPSHOT_DIR if directory is None else Path(directory)
+    with _SAVE_LOCK:
+        if key is not None and _LAST_SAVED.get(target) == key:
+            return True
+
+        generation = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        files = {name: f"{name}.{generation}.parquet" for name in SNAPSHOT_FILES}
+        staging = target / f"manifest.{generation}.tmp"
+        try:
+            target.mkdir(parents=True, exist_ok=True)
+            snapshot.processed_df.to_parquet(target / files['processed'], index=False)
+            _matrix_cells(snapshot.matrix).to_parquet(target / files['matrix'], index=False)
+
+            replaced = _read_manifest(target)
+            manifest = {
+                'version': SNAPSHOT_VERSION,
+                'date': snapshot.selected_date.isoformat(),
+                'saved_at': snapshot.saved_at.isoformat(),
+                'display_names': list(snapshot.matrix[1]),
+                'hours': list(snapshot.matrix[2]),
+                'summaries': snapshot.summaries,
+                'freshness': snapshot.freshness,
+                'files': files,
+                'previous_files': list(_snapshot_files(replaced).values()) if replaced else [],
+            }
+            with open(staging, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, default=str)
+            os.replace(staging, target / 'manifest.json')
+
+            _remove_superseded(target, manifest, replaced)
+            if key is not None:
+                _LAST_SAVED[target] = key
+            logger.info(f"Saved snapshot of {snapshot.selected_date} ({len(snapshot.processed_df)} runs)")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save snapshot: {e}")
+            for path in [staging] + [target / name for name in files.values()]:
+                path.unlink(missing_ok=True)
+            return False
+
+def load_snapshot(
+    selected_date: Optional[date] = None,
+    directory: Optional[os.PathLike] = None,
+    max_age_hours: float = SNAPSHOT_MAX_AGE_HOURS
+) -> Optional[Snapshot]:
+    """
+    Load the persisted snapshot.
+
+    Args:
+        selected_date: Only return the snapshot if it is of this date (default: any date)
+        directory: Snapshot directory (default: SNAPSHOT_DIR)
+        max_age_hours: Ignore snapshots taken longer ago than this
+
+    Returns:
+        Snapshot or None if there is no usable one
+    """
+    if not PARQUET_AVAILABLE:
+        return None
+
+    source = SNAPSHOT_DIR if directory is None else Path(directory)
+    started = time.perf_counter()
+    # A save that lands between reading the manifest and its files may remove
+    # them; the manifest read on the second attempt points to current files
+    for attempt in range(2):
+        try:
+            manifest = _read_manifest(source)
+            if manifest is None or manifest.get('version') != SNAPSHOT_VERSION:
+                return None
+            snapshot_date = date.fromisoformat(manifest['date'])
+            saved_at = datetime.fromisoformat(manifest['saved_at'])
+            if selected_date is not None and snapshot_date != selected_date:
+                return None
+            if (datetime.now() - saved_at).total_seconds() > max_age_hours * 3600:
+                return None
+
+            files = _snapshot_files(manifest)
+            cells = pd.read_parquet(source / files['matrix'])
+            processed_df = pd.read_parquet(source / files['processed'])
+            display_names, hours = manifest['display_names'], manifest['hours']
+            bot_hour_status = {name: {hour: "No Run" for hour in hours} for name in display_names}
+            for name, hour, status in zip(cells['display_name'], cells['hour'], cells['status']):
+                if name in bot_hour_status:
+                    bot_hour_status[name][int(hour)] = status
+
+            snapshot = Snapshot(
+                snapshot_date,
+                processed_df,
+                (bot_hour_status, display_names, hours),
+                manifest.get('summaries', {}),
+                manifest.get('freshness'),
+                saved_at
+            )
+            logger.info(f"Loaded snapshot of {snapshot_date} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            return snapshot
+        except FileNotFoundError:
+            if attempt:
+                return None
+        except Exception as e:
+            logger.warning(f"Could not load snapshot: {e}")
+            return None
+    return None
+
+class BackgroundLoads:
+    """
+    Process-wide registry of data loads running in background threads.
+
+    Every session asking for the same key while a load is in flight shares
+    it, so a cold start runs the expensive fetch once no matter how many
+    viewers arrive. Finished loads are handed out until discarded, or until
+    they are older than max_result_age seconds (the query cache TTL), after
+    which the next submit starts a fresh load instead of serving old data.
+    """
+
+    def __init__(self, max_workers: int = 2, max_result_age: float = DEFAULT_TTL_SECONDS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='background-load')
+        self._loads: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.max_result_age = max_result_age
+
+    @staticmethod
+    def _mark_completed(future: Future) -> None:
+        future.completed_at = time.monotonic()
+
+    def submit(self, key: Hashable, load: Callable[[], Any]) -> Future:
+        """Running or recently finished load for key, starting load() if there is none"""
+        with self._lock:
+            previous = self._loads.get(key)
+            completed_at = getattr(previous, 'completed_at', None)
+            if completed_at is not None and time.monotonic() - completed_at > self.max_result_age:
+                logger.info(f"Discarding background load {key} finished {time.monotonic() - completed_at:.0f}s ago")
+                del self._loads[key]
+            if key not in self._loads:
+                logger.info(f"Starting background load {key}")
+                future = self._executor.submit(load)
+                future.add_done_callback(self._mark_completed)
+                self._loads[key] = future
+            return self._loads[key]
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a load so the next submit starts a new one"""
+        with self._lock:
+            self._loads.pop(key, None)
+
+BACKGROUND_LOADS = BackgroundLoads()
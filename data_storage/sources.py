@@ -0,0 +1,323 @@
+"""
+Multi-source module for Bot Monitoring Dashboard
+Fetches flow runs from several databases concurrently through pooled connections and merges them
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from data_storage.sql_aggregation import DIALECTS, RUN_TABLE, build_flow_run_query
+
+# The ODBC driver is optional - SQLite sources work without it
+try:
+    import pypyodbc as odbc
+    ODBC_AVAILABLE = True
+except ImportError:
+    ODBC_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('flow_sources')
+
+# Constants
+SOURCES_FILE = Path(os.getenv('FLOW_SOURCES_FILE', 'flow_sources.json'))
+SOURCE_COLUMN = 'source'
+SOURCE_STATUS_ATTR = 'source_status'   # DataFrame.attrs key; kept with cached results
+FAILED_SOURCE_TTL_SECONDS = float(os.getenv('FAILED_SOURCE_TTL_SECONDS', '30'))  # Cache lifetime of partial results
+POOL_SIZE = 2                   # Idle connections kept per source
+SOURCE_TIMEOUT_SECONDS = float(os.getenv('SOURCE_TIMEOUT_SECONDS', '120'))
+DEFAULT_WINDOW_DAYS = 31        # Same window as the single-source query (last month)
+ODBC_DRIVER = '{SQL SERVER}'
+
+def odbc_connection_string(server: str, database: str, uid: str, pwd: str, driver: str = ODBC_DRIVER) -> str:
+    """SQL Server ODBC connection string"""
+    return (
+        f"DRIVER={driver};"
+        f"SERVER={server};"
+        f"DATABASE={database};"
+        f"UID={uid};"
+        f"PWD={pwd};"
+    )
+
+def _resolve(value: Optional[str]) -> Optional[str]:
+    """Config value, reading '$NAME' from the environment so secrets stay out of the config file"""
+    if isinstance(value, str) and value.startswith('$'):
+        return os.getenv(value[1:])
+    return value
+
+class FlowSource:
+    """
+    One monitored database: connection settings, owner set and query.
+
+    SQL Server sources connect through ODBC; 'sqlite' sources open the file
+    named by database, which makes every source replaceable by a local
+    stand-in. Without a custom query the source runs the standard flow run
+    query for its owners over the last window_days.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        owners: Sequence[str] = (),
+        server: Optional[str] = None,
+        database: Optional[str] = None,
+        uid: Optional[str] = None,
+        pwd: Optional[str] = None,
+        dialect: str = 'mssql',
+        table: str = RUN_TABLE,
+        query: Optional[str] = None,
+        window_days: int = DEFAULT_WINDOW_DAYS
+    ):
+        if dialect not in DIALECTS:
+            raise ValueError(f"Source '{name}': unknown dialect '{dialect}'")
+        if not owners and not query:
+            raise ValueError(f"Source '{name}': needs owners or a custom query")
+        self.name = name
+        self.owners = tuple(owners)
+        self.server = server
+        self.database = database
+        self.uid = uid
+        self.pwd = pwd
+        self.dialect = DIALECTS[dialect]
+        self.table = table
+        self.query = query
+        self.window_days = window_days
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'FlowSource':
+        """Source from a config mapping; string values of the form '$NAME' are read from the environment"""
+        config = dict(config)
+        for key in ('server', 'database', 'uid', 'pwd'):
+            config[key] = _resolve(config.get(key))
+        return cls(**config)
+
+    @property
+    def key(self) -> Tuple[str, Optional[str], Optional[str]]:
+        """Identity of the connection target, used to share connection pools"""
+        return (self.name, self.server, self.database)
+
+    def connect(self) -> Any:
+        """
+        Open a new connection to the source.
+
+        Raises:
+            ImportError: If an ODBC source is used without the driver installed
+            ValueError: If connection settings are missing
+        """
+        if self.dialect.name == 'sqlite':
+            if not self.database:
+                raise ValueError(f"Source '{self.name}': SQLite sources need a database file")
+            return sqlite3.connect(self.database, check_same_thread=False)
+        if not ODBC_AVAILABLE:
+            raise ImportError("ODBC driver (pypyodbc) not available - cannot connect to SQL Server")
+        if not all([self.server, self.database, self.uid, self.pwd]):
+            raise ValueError(f"Source '{self.name}': missing server, database or credentials")
+        return odbc.connect(odbc_connection_string(self.server, self.database, self.uid, self.pwd))
+
+    def query_and_params(self, now: Optional[datetime] = None) -> Tuple[str, Optional[List[Any]]]:
+        """SQL text and parameters of the source's flow run query"""
+        if self.query:
+            return self.query, None
+        window_start = (now or datetime.now()) - timedelta(days=self.window_days)
+        sql = build_flow_run_query(self.dialect, len(self.owners), self.table)
+        return sql, list(self.owners) + [self.dialect.timestamp(window_start)]
+
+class ConnectionPool:
+    """
+    Thread-safe pool of open connections to one source.
+
+    Connections are reused across fetches; one that raised while in use is
+    closed instead of being returned, so a broken connection is replaced on
+    the next fetch.
+    """
+
+    def __init__(self, connect: Callable[[], Any], max_size: int = POOL_SIZE):
+        self._connect = connect
+        self.max_size = max_size
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow an idle connection, or open a new one"""
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._connect()
+
+        try:
+            yield connection
+        except Exception:
+            self._close(connection)
+            raise
+
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(connection)
+                return
+        self._close(connection)
+
+    @staticmethod
+    def _close(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+_POOLS: Dict[Tuple, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+def get_pool(source: FlowSource) -> ConnectionPool:
+    """Process-wide connection pool of a source"""
+    with _POOLS_LOCK:
+        if source.key not in _POOLS:
+            _POOLS[source.key] = ConnectionPool(source.connect)
+        return _POOLS[source.key]
+
+def load_sources(config: Optional[Sequence[Dict[str, Any]]] = None) -> List[FlowSource]:
+    """
+    Configured sources from a list of mappings or the sources file.
+
+    Args:
+        config: Source mappings (default: read SOURCES_FILE if it exists)
+
+    Returns:
+        List of sources (empty when none are configured)
+    """
+    if config is None:
+        if not SOURCES_FILE.exists():
+            return []
+        try:
+            config = json.loads(SOURCES_FILE.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.error(f"Could not read sources file {SOURCES_FILE}: {e}")
+            return []
+
+    sources = []
+    for entry in config:
+        try:
+            sources.append(FlowSource.from_config(entry))
+        except Exception as e:
+            logger.error(f"Skipping invalid source {entry.get('name', entry) if isinstance(entry, dict) else entry}: {e}")
+    return sources
+
+def fetch_source(source: FlowSource, now: Optional[datetime] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Run one source's query through its pool.
+
+    Args:
+        source: Source to query
+        now: End of the query window (default: datetime.now())
+
+    Returns:
+        tuple: (rows tagged with the source name, status dict with source, ok,
+        rows, latency_seconds and error); failures return an empty frame
+    """
+    started = time.perf_counter()
+    try:
+        sql, params = source.query_and_params(now)
+        with get_pool(source).connection() as connection:
+            cursor = connection.cursor()
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        df[SOURCE_COLUMN] = source.name
+        latency = time.perf_counter() - started
+        logger.info(f"Source '{source.name}' returned {len(df)} runs in {latency:.2f}s")
+        return df, {'source': source.name, 'ok': True, 'rows': len(df), 'latency_seconds': latency, 'error': None}
+    except Exception as e:
+        latency = time.perf_counter() - started
+        logger.error(f"Source '{source.name}' failed after {latency:.2f}s: {e}")
+        return pd.DataFrame(), {'source': source.name, 'ok': False, 'rows': 0, 'latency_seconds': latency, 'error': str(e)}
+
+def fetch_all_sources(
+    sources: Sequence[FlowSource],
+    timeout: float = SOURCE_TIMEOUT_SECONDS,
+    now: Optional[datetime] = None
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Query every source concurrently and merge the results.
+
+    A failing or slow source only loses its own rows: errors are reported in
+    its status, and sources still running after timeout are reported as
+    timed out while the others are returned.
+
+    Args:
+        sources: Sources to query
+        timeout: Seconds to wait for all sources
+        now: End of the query windows (default: datetime.now())
+
+    Returns:
+        tuple: (merged runs with a SOURCE_COLUMN and the statuses in
+        attrs[SOURCE_STATUS_ATTR], one status dict per source in input order)
+    """
+    if not sources:
+        return pd.DataFrame(), []
+
+    now = now or datetime.now()
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='flow-source')
+    try:
+        futures = [executor.submit(fetch_source, source, now) for source in sources]
+        wait(futures, timeout=timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    frames, statuses = [], []
+    for source, future in zip(sources, futures):
+        if future.done() and not future.cancelled():
+            df, status = future.result()
+            if not df.empty:
+                frames.append(df)
+        else:
+            logger.error(f"Source '{source.name}' timed out after {timeout:.0f}s")
+            status = {'source': source.name, 'ok': False, 'rows': 0, 'latency_seconds': timeout,
+                      'error': f"timed out after {timeout:.0f}s"}
+        statuses.append(status)
+
+    merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if not merged.empty:
+        merged[SOURCE_COLUMN] = merged[SOURCE_COLUMN].astype('category')
+    merged.attrs[SOURCE_STATUS_ATTR] = statuses
+    failed = [status['source'] for status in statuses if not status['ok']]
+    logger.info(f"Fetched {len(merged)} runs from {len(sources) - len(failed)} of {len(sources)} sources"
+                + (f" (failed: {', '.join(failed)})" if failed else ""))
+    return merged, statuses
+
+def get_source_statuses(df: Optional[pd.DataFrame]) -> List[Dict[str, Any]]:
+    """Per-source statuses of the fetch that produced df (empty if it did not come from sources)"""
+    if df is None:
+        return []
+    return [dict(status) for status in df.attrs.get(SOURCE_STATUS_ATTR, [])]
+
+def partial_result_ttl(df: pd.DataFrame) -> Optional[float]:
+    """Short cache lifetime for results with failed sources, so a transient failure does not hide an environment"""
+    failed = any(not status['ok'] for status in get_source_statuses(df))
+    return FAILED_SOURCE_TTL_SECONDS if failed else None
@@ -0,0 +1,186 @@
+"""
+SQL aggregation module for Bot Monitoring Dashboard
+Dialect-abstracted queries that reduce flow runs to hourly matrix cells inside the database
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Sequence, Tuple
+
+from data_processing.processors import status_priority_sql
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger('sql_aggregation')
+
+# Constants
+RUN_TABLE = 'BusinessAnalytics.dbo.rpa_FlowRunHistory'
+
+# Source column and alias of every raw run column, as returned by the flow run query
+RUN_COLUMNS = (
+    ('FlowGUID', 'flowguid'),
+    ('FlowName', 'flowname'),
+    ('CreatedTime', 'startedon'),
+    ('LastModified', 'lastmodified'),
+    ('State', 'state'),
+    ('FlowOwner', 'flowowner'),
+    ('StartTime', 'datetimestarted'),
+    ('EndTime', 'datetimecompleted'),
+    ('TaskStatus', 'taskstatus'),
+    ('TriggerType', 'triggertype'),
+    ("CASE WHEN TaskStatus = 'Succeeded' THEN 1 ELSE 0 END", 'wassuccessful'),
+    ("CASE WHEN TaskStatus = 'Succeeded' THEN 1 ELSE 0 END", 'finalsuccessful'),
+)
+
+# Columns of the hourly aggregate result, one row per (flow, hour, status, trigger group)
+AGGREGATE_COLUMNS = [
+    'flowowner', 'flowname', 'hour', 'taskstatus', 'trigger_group',
+    'runs', 'first_started', 'priority', 'is_top'
+]
+
+# Same grouping as process_data_for_dashboard's trigger_group
+TRIGGER_GROUP_SQL = (
+    "CASE WHEN TriggerType = 'manual' THEN 'Manual' "
+    "WHEN TriggerType = 'Recurrence' THEN 'Recurrence' ELSE 'OtherTrigger' END"
+)
+
+class SqlDialect:
+    """
+    SQL fragments and parameter conventions that differ between databases.
+
+    Both supported databases take qmark (?) parameters and window functions;
+    they differ in extracting the hour of a timestamp and in how timestamp
+    parameters must be passed.
+    """
+
+    def __init__(self, name: str, hour_template: str, text_timestamps: bool = False):
+        self.name = name
+        self.hour_template = hour_template
+        self.text_timestamps = text_timestamps
+
+    def hour(self, column: str) -> str:
+        """Expression for the hour (0-23) of a timestamp column"""
+        return self.hour_template.format(column=column)
+
+    def timestamp(self, value: datetime) -> Any:
+        """Timestamp parameter in the form the database compares correctly"""
+        return value.strftime('%Y-%m-%d %H:%M:%S') if self.text_timestamps else value
+
+    def placeholders(self, count: int) -> str:
+        """Comma-separated parameter placeholders"""
+        return ', '.join(['?'] * count)
+
+MSSQL = SqlDialect('mssql', 'DATEPART(hour, {column})')
+SQLITE = SqlDialect('sqlite', "CAST(strftime('%H', {column}) AS INTEGER)", text_timestamps=True)
+DIALECTS = {dialect.name: dialect for dialect in (MSSQL, SQLITE)}
+
+def run_select_list() -> str:
+    """SELECT list of the raw run columns with their dashboard aliases"""
+    return ',\n            '.join(f"{source} as {alias}" for source, alias in RUN_COLUMNS)
+
+def build_flow_run_query(dialect: SqlDialect, owner_count: int, table: str = RUN_TABLE) -> str:
+    """
+    Parameterized raw run query for one source.
+
+    Parameters: the owners, then the window start.
+
+    Args:
+        dialect: Target SQL dialect
+        owner_count: Number of owner parameters
+        table: Run history table
+
+    Returns:
+        SQL text returning the raw run columns
+    """
+    return f"""
+        SELECT
+            {run_select_list()}
+        FROM {table}
+        WHERE FlowOwner IN ({dialect.placeholders(owner_count)})
+        AND StartTime >= ?
+        """
+
+def build_hourly_aggregate_query(dialect: SqlDialect, owner_count: int, table: str = RUN_TABLE) -> str:
+    """
+    Query reducing one day of runs to per-status counts per flow and hour.
+
+    Rows are grouped by owner, flow name, start hour, status and trigger
+    group. Each row carries its status priority (a CASE ranking equal to
+    STATUS_PRIORITY) and is_top = 1 when its status is the cell's highest
+    priority one, ties going to the alphabetically first status as in
+    create_hourly_matrix. Parameters: the owners, then the day's start and
+    end (exclusive).
+
+    Args:
+        dialect: Target SQL dialect
+        owner_count: Number of owner parameters
+        table: Run history table
+
+    Returns:
+        SQL text returning AGGREGATE_COLUMNS
+    """
+    hour = dialect.hour('StartTime')
+    return f"""
+        SELECT flowowner, flowname, hour, taskstatus, trigger_group, runs, first_started, priority,
+            CASE WHEN RANK() OVER (
+                PARTITION BY flowowner, flowname, hour
+                ORDER BY priority DESC, CASE WHEN taskstatus IS NULL THEN 1 ELSE 0 END, taskstatus
+            ) = 1 THEN 1 ELSE 0 END AS is_top
+        FROM (
+            SELECT
+                FlowOwner AS flowowner,
+                FlowName AS flowname,
+                {hour} AS hour,
+                TaskStatus AS taskstatus,
+                {TRIGGER_GROUP_SQL} AS trigger_group,
+                COUNT(*) AS runs,
+                MIN(StartTime) AS first_started,
+                {status_priority_sql('TaskStatus')} AS priority
+            FROM {table}
+            WHERE FlowOwner IN ({dialect.placeholders(owner_count)})
+            AND StartTime >= ? AND StartTime < ?
+            GROUP BY FlowOwner, FlowName, {hour}, TaskStatus, {TRIGGER_GROUP_SQL}
+        ) cells
+        """
+
+def build_cell_runs_query(dialect: SqlDialect, table: str = RUN_TABLE) -> str:
+    """
+    Query for the raw runs behind one matrix cell (drill-down).
+
+    Parameters: flow owner, flow name, then the hour's start and end (exclusive).
+
+    Args:
+        dialect: Target SQL dialect
+        table: Run history table
+
+    Returns:
+        SQL text returning the raw run columns, oldest first
+    """
+    return f"""
+        SELECT
+            {run_select_list()}
+        FROM {table}
+        WHERE FlowOwner = ? AND FlowName = ?
+        AND StartTime >= ? AND StartTime < ?
+        ORDER BY StartTime
+        """
+
+def _day_start(day: date) -> datetime:
+    """Midnight at the start of a date or datetime"""
+    return datetime.combine(day.date() if isinstance(day, datetime) else day, time.min)
+
+def hourly_aggregate_params(dialect: SqlDialect, owners: Sequence[str], day: date) -> List[Any]:
+    """Parameters of build_hourly_aggregate_query for one day"""
+    start = _day_start(day)
+    return list(owners) + [dialect.timestamp(start), dialect.timestamp(start + timedelta(days=1))]
+
+def cell_runs_params(dialect: SqlDialect, flowowner: str, flowname: str, day: date, hour: int) -> Tuple[Any, ...]:
+    """Parameters of build_cell_runs_query for one (flow, hour) cell"""
+    start = _day_start(day) + timedelta(hours=int(hour))
+    return (flowowner, flowname, dialect.timestamp(start), dialect.timestamp(start + timedelta(hours=1)))
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent-session load test for the Bot Monitoring Dashboard
+Features:
+- Drives N simultaneous headless sessions of bot_monitor_dashboard.main with Streamlit's AppTest
+- Sessions change dates and filters and trigger refreshes against a synthetic SQLite database
+- Reports rerun latency percentiles, memory per session and total database queries issued
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import logging
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from streamlit.testing.v1 import AppTest
+    APPTEST_AVAILABLE = True
+except ImportError:
+    APPTEST_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger('load_test')
+
+# Constants
+DASHBOARD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot_monitor_dashboard.py')
+DEFAULT_SESSIONS = 10
+DEFAULT_ACTIONS = 20
+DEFAULT_FLOWS = 200
+DEFAULT_RUNS_PER_DAY = 5000
+DEFAULT_DAYS = 30
+RERUN_TIMEOUT_SECONDS = 120
+OWNERS = [
+    'powerautomate', 'powerautomate02 serviceaccount', 'powerautomate03 serviceaccount',
+    'powerautomate04', 'powerautomate05', 'powerautomate06', 'powerautomate07', 'powerautomate08'
+]
+STATUSES = ['Succeeded', 'Failed', 'Running', 'Canceled']
+STATUS_WEIGHTS = [0.8, 0.1, 0.05, 0.05]
+
+# Same columns as FLOW_RUN_QUERY, in SQLite syntax
+SQLITE_FLOW_RUN_QUERY = """
+        SELECT
+            FlowGUID as flowguid,
+            FlowName as flowname,
+            CreatedTime as startedon,
+            LastModified as lastmodified,
+            State as state,
+            FlowOwner as flowowner,
+            StartTime as datetimestarted,
+            EndTime as datetimecompleted,
+            TaskStatus as taskstatus,
+            TriggerType as triggertype,
+            CASE WHEN TaskStatus = 'Succeeded' THEN 1 ELSE 0 END as wassuccessful,
+            CASE WHEN TaskStatus = 'Succeeded' THEN 1 ELSE 0 END as finalsuccessful
+        FROM rpa_FlowRunHistory
+        WHERE StartTime >= datetime('now', 'localtime', '-1 month')
+        """
+
+def build_synthetic_database(
+    db_path: str,
+    flows: int = DEFAULT_FLOWS,
+    runs_per_day: int = DEFAULT_RUNS_PER_DAY,
+    days: int = DEFAULT_DAYS,
+    seed: int = 0
+) -> int:
+    """
+    Create a SQLite stand-in for rpa_FlowRunHistory filled with synthetic runs.
+
+    Args:
+        db_path: SQLite database file to create
+        flows: Number of distinct flows
+        runs_per_day: Runs generated per day
+        days: Days of history ending now
+        seed: Random seed
+
+    Returns:
+        Number of runs written
+    """
+    rng = np.random.default_rng(seed)
+    total = runs_per_day * days
+    now = pd.Timestamp(datetime.now()).floor('s')
+    flow_ids = rng.integers(0, flows, total)
+    projects = np.array(['AMZ', 'C2D', 'PS', 'WF', 'BI', 'AWS', 'VP'])
+    flow_names = np.array([f"{projects[i % len(projects)]} - Flow {i:04d}" for i in range(flows)])
+    flow_owners = rng.choice(OWNERS, flows)
+
+    started = now - pd.to_timedelta(rng.integers(0, days * 86400, total), unit='s')
+    statuses = rng.choice(STATUSES, total, p=STATUS_WEIGHTS)
+    durations = pd.to_timedelta(rng.exponential(300, total).astype(int) + 1, unit='s')
+    ended = pd.Series(started + durations).where(statuses != 'Running')
+
+    runs = pd.DataFrame({
+        'FlowGUID': [f"flow-{i:04d}" for i in flow_ids],
+        'FlowName': flow_names[flow_ids],
+        'CreatedTime': started,
+        'LastModified': ended.fillna(now),
+        'State': np.where(statuses == 'Running', 'Active', 'Completed'),
+        'FlowOwner': flow_owners[flow_ids],
+        'StartTime': started,
+        'EndTime': ended,
+        'TaskStatus': statuses,
+        'TriggerType': rng.choice(['Recurrence', 'manual', 'When_a_new_email_arrives'], total, p=[0.7, 0.2, 0.1]),
+    })
+
+    with sqlite3.connect(db_path) as connection:
+        runs.to_sql('rpa_FlowRunHistory', connection, if_exists='replace', index=False, dtype={
+            'CreatedTime': 'TIMESTAMP', 'LastModified': 'TIMESTAMP', 'StartTime': 'TIMESTAMP', 'EndTime': 'TIMESTAMP'
+        })
+        connection.execute('CREATE INDEX ix_start ON rpa_FlowRunHistory (StartTime)')
+    logger.info(f"Wrote {total} synthetic runs for {flows} flows to {db_path}")
+    return total
+
+class QueryCounter:
+    """Thread-safe count of queries issued against the stand-in database"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def increment(self) -> None:
+        with self._lock:
+            self.count += 1
+
+class _CountingCursor:
+    """sqlite3 cursor that counts executed statements"""
+
+    def __init__(self, cursor: sqlite3.Cursor, counter: QueryCounter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, query, params=None):
+        self._counter.increment()
+        return self._cursor.execute(query, params or ())
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class _CountingConnection:
+    """sqlite3 connection exposing the subset of the DB-API the dashboard uses"""
+
+    def __init__(self, db_path: str, counter: QueryCounter):
+        self._connection = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self._counter = counter
+
+    def cursor(self) -> _CountingCursor:
+        return _CountingCursor(self._connection.cursor(), self._counter)
+
+    def close(self) -> None:
+        self._connection.close()
+
+def install_sqlite_source(db_path: str, counter: QueryCounter) -> None:
+    """
+    Point secure_db_connection at the SQLite stand-in.
+
+    The dashboard imports get_flow_data from secure_db_connection, which
+    resolves the connection factory and query through module globals, so
+    swapping them here routes every session's database reads to SQLite
+    through the normal query cache and fallback logic.
+    """
+    import secure_db_connection
+
+    secure_db_connection.ODBC_AVAILABLE = True
+    secure_db_connection.FLOW_RUN_QUERY = SQLITE_FLOW_RUN_QUERY
+    secure_db_connection.create_db_connection = lambda: _CountingConnection(db_path, counter)
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, if measurable"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _widget(widgets, label: str):
+    """First widget with the given label, or None"""
+    return next((widget for widget in widgets if widget.label == label), None)
+
+def run_session(session_id: int, actions: int, days: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Drive one dashboard session through a random sequence of interactions.
+
+    Args:
+        session_id: Session number (for reporting)
+        actions: Number of interactions after the initial page load
+        days: Days of history the dates are picked from
+        seed: Random seed for the interaction sequence
+
+    Returns:
+        List of {'session', 'action', 'seconds', 'error'} per rerun
+    """
+    rng = random.Random(seed + session_id)
+    timings = []
+    app = AppTest.from_file(DASHBOARD_SCRIPT, default_timeout=RERUN_TIMEOUT_SECONDS)
+
+    def timed(action: str, run) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            run()
+            if app.exception:
+                error = str(app.exception[0].message)
+        except Exception as e:
+            error = str(e)
+        timings.append({'session': session_id, 'action': action,
+                        'seconds': time.perf_counter() - started, 'error': error})
+
+    timed('load', app.run)
+    for _ in range(actions):
+        action = rng.choice(['date', 'filter', 'filter', 'clear_filters', 'refresh', 'rerun'])
+        if action == 'date':
+            picker = _widget(app.sidebar.date_input, "Select Date")
+            if picker is not None:
+                picker.set_value(date.today() - timedelta(days=rng.randrange(min(days, 30))))
+                timed(action, app.run)
+        elif action in ('filter', 'clear_filters'):
+            label = rng.choice(["Projects", "Owners", "Statuses", "Trigger Types"])
+            selector = _widget(app.multiselect, label)
+            if selector is not None:
+                options = list(selector.options)
+                chosen = rng.sample(options, min(len(options), rng.randint(1, 3))) if action == 'filter' else []
+                selector.set_value(chosen)
+                timed(f"{action}:{label}", app.run)
+        elif action == 'refresh':
+            button = _widget(app.sidebar.button, "Refresh Data")
+            if button is not None:
+                button.click()
+                timed(action, app.run)
+        else:
+            timed(action, app.run)
+    return timings
+
+def run_load_test(
+    sessions: int = DEFAULT_SESSIONS,
+    actions: int = DEFAULT_ACTIONS,
+    flows: int = DEFAULT_FLOWS,
+    runs_per_day: int = DEFAULT_RUNS_PER_DAY,
+    days: int = DEFAULT_DAYS,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run concurrent dashboard sessions against a synthetic SQLite database.
+
+    Args:
+        sessions: Number of simultaneous sessions
+        actions: Interactions per session after the initial load
+        flows: Distinct flows in the synthetic data
+        runs_per_day: Synthetic runs per day
+        days: Days of synthetic history
+        seed: Random seed for data and interactions
+
+    Returns:
+        dict: Report with latency percentiles, memory per session and database query count
+    """
+    if not APPTEST_AVAILABLE:
+        raise ImportError("streamlit.testing (Streamlit 1.28+) is required for the load test")
+
+    work_dir = tempfile.mkdtemp(prefix='dashboard_load_')
+    db_path = os.path.join(work_dir, 'flow_runs.sqlite')
+    total_runs = build_synthetic_database(db_path, flows, runs_per_day, days, seed)
+
+    # Isolate the on-disk caches and give the credential checks something to find
+    os.environ['FLOW_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+    for var in ('DB_SERVER', 'DB_NAME', 'DB_UID', 'DB_PWD'):
+        os.environ.setdefault(var, 'load-test')
+
+    counter = QueryCounter()
+    install_sqlite_source(db_path, counter)
+
+    baseline_rss = _current_rss()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        futures = [executor.submit(run_session, i, actions, days, seed) for i in range(sessions)]
+        timings = [timing for future in futures for timing in future.result()]
+    elapsed = time.perf_counter() - started
+    final_rss = _current_rss()
+
+    frame = pd.DataFrame(timings)
+    latencies = frame['seconds'] * 1000
+    by_action = frame.assign(kind=frame['action'].str.split(':').str[0]).groupby('kind')['seconds'].agg(
+        ['count', 'median', lambda s: s.quantile(0.95)]
+    )
+    by_action.columns = ['reruns', 'p50_ms', 'p95_ms']
+    by_action[['p50_ms', 'p95_ms']] *= 1000
+
+    report = {
+        'sessions': sessions,
+        'actions_per_session': actions,
+        'synthetic_runs': total_runs,
+        'reruns': int(len(frame)),
+        'errors': int(frame['error'].notna().sum()),
+        'wall_seconds': round(elapsed, 2),
+        'latency_ms': {
+            'p50': round(float(latencies.quantile(0.50)), 1),
+            'p90': round(float(latencies.quantile(0.90)), 1),
+            'p95': round(float(latencies.quantile(0.95)), 1),
+            'p99': round(float(latencies.quantile(0.99)), 1),
+            'max': round(float(latencies.max()), 1),
+        },
+        'latency_by_action_ms': by_action.round(1).to_dict(orient='index'),
+        'memory_per_session_mb': (
+            round((final_rss - baseline_rss) / sessions / 1024 ** 2, 1)
+            if baseline_rss is not None and final_rss is not None else None
+        ),
+        'process_rss_mb': round(final_rss / 1024 ** 2, 1) if final_rss is not None else None,
+        'db_queries': counter.count,
+    }
+    errors = frame.loc[frame['error'].notna(), 'error'].unique()[:5]
+    if len(errors):
+        report['sample_errors'] = [str(error) for error in errors]
+    return report
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Bot Monitoring Dashboard")
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help="Simultaneous sessions")
+    parser.add_argument('--actions', type=int, default=DEFAULT_ACTIONS, help="Interactions per session")
+    parser.add_argument('--flows', type=int, default=DEFAULT_FLOWS, help="Distinct flows in the synthetic data")
+    parser.add_argument('--runs-per-day', type=int, default=DEFAULT_RUNS_PER_DAY, help="Synthetic runs per day")
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS, help="Days of synthetic history")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.sessions, args.actions, args.flows, args.runs_per_day, args.days, args.seed)
+    body = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(body)
+        logger.info(f"Wrote load test report to {args.output}")
+    print(body)
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+"""
+Headless matrix service for the Bot Monitoring Dashboard
+Features:
+- HTTP API serving the hourly matrix, summary and per-flow stats as JSON
+- Shared in-process cache with ETags and conditional (304) responses
+- Data freshness and pipeline lag metrics in the Prometheus text format
+- CLI for one-off exports to stdout or a file
+"""
+
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from data_processing.processors import (
+    FILTER_ALL_LABELS, FilterSelection, process_data_for_dashboard, create_hourly_matrix,
+    normalize_filters, filter_cache_key
+)
+from data_processing.indexes import FilterIndex
+from data_storage.freshness import data_version, freshness_metrics, get_freshness, prometheus_metrics
+from secure_db_connection import get_flow_data
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger('matrix_service')
+
+# Constants
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 256       # Cached payloads kept across all date/filter combinations
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+PAYLOAD_SECTIONS = ('matrix', 'summary', 'flows')
+FILTER_PARAMS = ('project', 'status', 'owner', 'trigger')  # Query parameters, in FILTER_ALL_LABELS order
+
+class SharedCache:
+    """
+    Thread-safe TTL cache with single-flight computation.
+
+    Concurrent requests for the same key wait for one computation instead of
+    each running it, so many consumers share one result per TTL period.
+    Entries whose key already identifies their inputs (e.g. a data version)
+    can be stored without expiry. Expired entries are evicted on insert and
+    at most max_entries are kept, dropping the least recently used; per-key
+    locks go with their entries.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Any, Tuple[float, Any, bool]]' = OrderedDict()
+        self._key_locks: Dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: Any) -> Optional[Tuple[float, Any, bool]]:
+        """Unexpired entry for key, marked as recently used (caller holds _lock)"""
+        entry = self._entries.get(key)
+        if entry and (not entry[2] or time.monotonic() - entry[0] < self.ttl_seconds):
+            self._entries.move_to_end(key)
+            return entry
+        return None
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the least recently used beyond max_entries (caller holds _lock)"""
+        now = time.monotonic()
+        for key in [key for key, (created, _, expires) in self._entries.items()
+                    if expires and now - created >= self.ttl_seconds]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        # Locks still held belong to computations in flight
+        for key in [key for key, lock in self._key_locks.items() if key not in self._entries and not lock.locked()]:
+            del self._key_locks[key]
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any], expires: bool = True) -> Any:
+        """Return the cached value for key, computing it at most once per TTL (or once, if not expires)"""
+        with self._lock:
+            entry = self._fresh(key)
+            if entry:
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have filled the entry while we waited
+            with self._lock:
+                entry = self._fresh(key)
+                if entry:
+                    return entry[1]
+
+            value = compute()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), value, expires)
+                self._entries.move_to_end(key)
+                self._evict()
+            return value
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+def build_matrix_payload(
+    df: pd.DataFrame,
+    selected_date: date,
+    selected_project: FilterSelection = 'All Projects',
+    selected_status: FilterSelection = 'All Statuses',
+    selected_owner: FilterSelection = 'All Owners',
+    selected_trigger: FilterSelection = 'All Triggers',
+    processed: Optional[Tuple[pd.DataFrame, Optional[FilterIndex]]] = None
+) -> Dict[str, Any]:
+    """
+    Run the dashboard pipeline for a date and shape the result as JSON-ready data.
+
+    Args:
+        df: Raw flow data as returned by get_flow_data
+        selected_date: Date to build the matrix for
+        selected_project: Project filter(s) (or 'All Projects')
+        selected_status: Status filter(s) (or 'All Statuses')
+        selected_owner: Owner filter(s) (or 'All Owners')
+        selected_trigger: Trigger group filter(s) (or 'All Triggers')
+        processed: Already processed data for the date and its filter index, if cached
+
+    Returns:
+        dict: {'date', 'filters', 'matrix', 'summary', 'flows'}; contains no
+        timestamps of its own so identical data always yields an identical ETag
+    """
+    if processed is None:
+        processed = (process_data_for_dashboard(df, day_filter=selected_date), None)
+    processed_df, filter_index = processed
+    filters = normalize_filters(selected_project, selected_status, selected_owner, selected_trigger)
+    payload: Dict[str, Any] = {
+        'date': selected_date.isoformat(),
+        'filters': {
+            name: list(filters[column] or [])
+            for name, column in zip(FILTER_PARAMS, FILTER_ALL_LABELS)
+        },
+        'matrix': {'hours': list(range(24)), 'rows': []},
+        'summary': {'total_runs': 0},
+        'flows': [],
+    }
+    if processed_df is None or processed_df.empty:
+        return payload
+
+    bot_hour_status, display_names, hours = create_hourly_matrix(
+        processed_df,
+        filters['automation_project'],
+        filters['taskstatus'],
+        selected_owner=filters['owner'],
+        selected_trigger=filters['trigger_group'],
+        filter_index=filter_index
+    )
+    rows = []
+    for display_name in sorted(display_names):
+        parts = display_name.split(' | ', 2) + ['Unknown'] * 2
+        rows.append({
+            'display_name': display_name,
+            'owner': parts[0],
+            'automation_project': parts[1],
+            'flowname': parts[2],
+            'statuses': [bot_hour_status[display_name].get(hour, 'No Run') for hour in hours],
+        })
+    payload['matrix'] = {'hours': hours, 'rows': rows}
+
+    payload['summary'] = {
+        'total_runs': int(len(processed_df)),
+        'flows': int(processed_df['display_name'].nunique()),
+        'success_rate': round(float(processed_df['wassuccessful'].mean() * 100), 1),
+        'status_counts': {str(k): int(v) for k, v in processed_df['taskstatus'].value_counts().items()},
+        'project_counts': {str(k): int(v) for k, v in processed_df['automation_project'].value_counts().head(10).items()},
+    }
+
+    per_flow = processed_df.sort_values('datetimestarted').groupby('display_name', observed=True).agg(
+        runs=('taskstatus', 'size'),
+        failed=('taskstatus', lambda s: int((s == 'Failed').sum())),
+        success_rate=('wassuccessful', 'mean'),
+        last_status=('taskstatus', 'last'),
+        last_run=('datetimestarted', 'max'),
+    )
+    payload['flows'] = [
+        {
+            'display_name': name,
+            'runs': int(row.runs),
+            'failed': int(row.failed),
+            'success_rate': round(float(row.success_rate) * 100, 1),
+            'last_status': str(row.last_status),
+            'last_run': pd.Timestamp(row.last_run).isoformat(),
+        }
+        for name, row in per_flow.iterrows()
+    ]
+    return payload
+
+class MatrixService:
+    """
+    Shared matrix computation for many consumers.
+
+    Only the raw data load expires (once per TTL). Each date is processed and
+    indexed once per data version, and each (date, filter combination)
+    payload is computed once per data version, serialized once, and served
+    with a strong ETag derived from its content; entries of superseded
+    versions age out of the LRU.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, use_csv: bool = False, use_store: bool = False):
+        self.use_csv = use_csv
+        self.use_store = use_store
+        self.cache = SharedCache(ttl_seconds)
+
+    def _load(self) -> pd.DataFrame:
+        return self.cache.get_or_compute(
+            ('raw', self.use_csv, self.use_store),
+            lambda: get_flow_data(use_csv=self.use_csv, use_store=self.use_store)
+        )
+
+    def _processed(self, df: pd.DataFrame, selected_date: date) -> Tuple[pd.DataFrame, Optional[FilterIndex]]:
+        """Processed data for a date and its filter index, shared by every filter combination"""
+        def compute():
+            processed_df = process_data_for_dashboard(df, day_filter=selected_date)
+            if processed_df is None or processed_df.empty:
+                return processed_df, None
+            return processed_df, FilterIndex(processed_df)
+
+        return self.cache.get_or_compute(('processed', data_version(df), selected_date), compute, expires=False)
+
+    def get_metrics(self) -> str:
+        """Freshness metrics of the currently cached snapshot (see freshness_metrics), as Prometheus text"""
+        return prometheus_metrics(freshness_metrics(get_freshness(self._load())))
+
+    def get_section(
+        self,
+        section: str,
+        selected_date: date,
+        selected_project: FilterSelection = 'All Projects',
+        selected_status: FilterSelection = 'All Statuses',
+        selected_owner: FilterSelection = 'All Owners',
+        selected_trigger: FilterSelection = 'All Triggers'
+    ) -> Tuple[bytes, str]:
+        """
+        Serialized payload section and its ETag.
+
+        Args:
+            section: 'all' or one of PAYLOAD_SECTIONS
+            selected_date: Date to build the matrix for
+            selected_project: Project filter(s) (or 'All Projects')
+            selected_status: Status filter(s) (or 'All Statuses')
+            selected_owner: Owner filter(s) (or 'All Owners')
+            selected_trigger: Trigger group filter(s) (or 'All Triggers')
+
+        Returns:
+            tuple: (JSON bytes, quoted ETag)
+        """
+        filters = normalize_filters(selected_project, selected_status, selected_owner, selected_trigger)
+        df = self._load()
+
+        def compute() -> Dict[str, Tuple[bytes, str]]:
+            payload = build_matrix_payload(
+                None, selected_date, *filters.values(),
+                processed=self._processed(df, selected_date)
+            )
+            header = {key: payload[key] for key in ('date', 'filters')}
+            bodies = {'all': payload}
+            bodies.update({name: {**header, name: payload[name]} for name in PAYLOAD_SECTIONS})
+            encoded = {}
+            for name, body in bodies.items():
+                data = json.dumps(body, default=str).encode('utf-8')
+                encoded[name] = (data, '"' + hashlib.sha1(data).hexdigest() + '"')
+            return encoded
+
+        encoded = self.cache.get_or_compute(
+            ('payload', data_version(df), selected_date, filter_cache_key(filters)), compute, expires=False
+        )
+        return encoded[section]
+
+def make_handler(service: MatrixService):
+    """Build a request handler class bound to a MatrixService"""
+
+    class MatrixRequestHandler(BaseHTTPRequestHandler):
+        """GET /matrix, /summary, /flows, /all, /metrics and /health"""
+
+        def log_message(self, format, *args):
+            logger.info("%s - %s" % (self.address_string(), format % args))
+
+        def _send(self, status: int, body: bytes = b'', etag: Optional[str] = None,
+                  content_type: str = 'application/json; charset=utf-8') -> None:
+            self.send_response(status)
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', f"max-age={int(service.cache.ttl_seconds)}")
+            if body:
+                self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _error(self, status: int, message: str) -> None:
+            self._send(status, json.dumps({'error': message}).encode('utf-8'))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            section = url.path.strip('/') or 'all'
+            if section == 'health':
+                self._send(200, b'{"status": "ok"}')
+                return
+            if section == 'metrics':
+                try:
+                    body = service.get_metrics().encode('utf-8')
+                except Exception as e:
+                    logger.error(f"Error building metrics: {e}", exc_info=True)
+                    self._error(500, "Failed to build metrics")
+                    return
+                self._send(200, body, content_type='text/plain; version=0.0.4; charset=utf-8')
+                return
+            if section not in PAYLOAD_SECTIONS + ('all',):
+                self._error(404, f"Unknown endpoint '/{section}'")
+                return
+
+            query = parse_qs(url.query)
+            params = {key: values[-1] for key, values in query.items()}
+            # Filters may repeat (?status=Failed&status=Running) or be comma separated
+            selections = [
+                [value for values in query.get(name, []) for value in values.split(',') if value]
+                for name in FILTER_PARAMS
+            ]
+            try:
+                selected_date = pd.to_datetime(params['date']).date() if 'date' in params else date.today()
+            except (ValueError, TypeError):
+                self._error(400, f"Invalid date '{params.get('date')}'")
+                return
+
+            try:
+                body, etag = service.get_section(section, selected_date, *selections)
+            except Exception as e:
+                logger.error(f"Error building {section} for {selected_date}: {e}", exc_info=True)
+                self._error(500, "Failed to build matrix")
+                return
+
+            if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+                self._send(304, etag=etag)
+            else:
+                self._send(200, body, etag)
+
+    return MatrixRequestHandler
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **service_options) -> None:
+    """Run the HTTP API until interrupted"""
+    service = MatrixService(**service_options)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    logger.info(f"Matrix service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Matrix service stopped")
+    finally:
+        server.server_close()
+
+def main(argv: Optional[list] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Headless Bot Monitoring matrix service")
+    parser.add_argument('--use-csv', action='store_true', help="Use CSV files instead of database")
+    parser.add_argument('--use-store', action='store_true', help="Use the local run history store instead of database")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Run the HTTP API")
+    serve_parser.add_argument('--host', default=DEFAULT_HOST)
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--ttl', type=float, default=DEFAULT_TTL_SECONDS, help="Cache TTL in seconds")
+
+    export_parser = subparsers.add_parser('export', help="Print matrix JSON for a date")
+    export_parser.add_argument('--date', default=None, help="Date (YYYY-MM-DD, default today)")
+    export_parser.add_argument('--project', action='append', help="Project to include (repeatable)")
+    export_parser.add_argument('--status', action='append', help="Status to include (repeatable)")
+    export_parser.add_argument('--owner', action='append', help="Owner to include (repeatable)")
+    export_parser.add_argument('--trigger', action='append', help="Trigger group to include (repeatable)")
+    export_parser.add_argument('--section', default='all', choices=PAYLOAD_SECTIONS + ('all',))
+    export_parser.add_argument('--output', default=None, help="Write to this file instead of stdout")
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        serve(args.host, args.port, ttl_seconds=args.ttl, use_csv=args.use_csv, use_store=args.use_store)
+        return 0
+
+    selected_date = pd.to_datetime(args.date).date() if args.date else date.today()
+    service = MatrixService(use_csv=args.use_csv, use_store=args.use_store)
+    body, _ = service.get_section(args.section, selected_date, args.project, args.status, args.owner, args.trigger)
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(body)
+        logger.info(f"Wrote {args.section} for {selected_date} to {args.output}")
+    else:
+        sys.stdout.write(body.decode('utf-8') + '\n')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,24 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
+import time
 import logging
 import traceback
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, Union, List, Dict, Any
 from pathlib import Path
+from data_storage.csv_ingest import (
+    PARQUET_AVAILABLE, apply_run_schema, find_csv_exports, ingest_csv_exports, read_flow_csv
+)
+from data_storage.run_store import apply_retention, read_runs, write_runs
+from data_storage.query_cache import QueryResultCache, query_fingerprint
+from data_storage.sql_aggregation import (
+    MSSQL, RUN_TABLE, build_cell_runs_query, build_hourly_aggregate_query,
+    cell_runs_params, hourly_aggregate_params, run_select_list
+)
+from data_storage.sources import SOURCE_STATUS_ATTR, fetch_all_sources, get_source_statuses, load_sources, partial_result_ttl
+from data_storage.freshness import stamp_freshness
 
 # Configure logging
 logging.basicConfig(
@@ -17,6 +30,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger('database_connection')
 
+# Directories searched for flow_data_*.csv exports
+CSV_SEARCH_PATHS = ['.', 'data']
+
+# Days of stored history served when the database is not used
+STORE_HISTORY_DAYS = 31
+
+# Disk cache shared by every process that runs the flow run query
+QUERY_CACHE = QueryResultCache()
+
+FLOW_RUN_WINDOW = 'last_month'
+# Service accounts and users whose flows are monitored
+MONITORED_FLOW_OWNERS = (
+    'powerautomate', 'powerautomate02 serviceaccount',
+    'powerautomate03 serviceaccount', 'powerautomate04',
+    'powerautomate05', 'powerautomate06', 'powerautomate07',
+    'powerautomate08', 'Ryan Kieselhorst', 'Colin Boyle',
+    'Cheddrick Bagunu', 'Edu Cielo', 'Mohammad Asim'
+)
+
+FLOW_RUN_QUERY = f"""
+        SELECT
+            {run_select_list()}
+        FROM {RUN_TABLE}
+        WHERE FlowOwner in ({', '.join(f"'{owner}'" for owner in MONITORED_FLOW_OWNERS)})
+        AND StartTime >= DATEADD(month, -1, GETDATE())
+        """
+
+# Dialect of the hourly aggregation and drill-down queries sent to the database
+SQL_DIALECT = MSSQL
+
 # Check if we're running in Streamlit
 try:
     import streamlit as st
@@ -262,7 +305,7 @@ def generate_sample_data():
         # Convert to DataFrame
         sample_df = pd.DataFrame(records)
         logger.info(f"Generated {len(sample_df)} sample records for demonstration")
-        return sample_df
+        return stamp_freshness(sample_df, 'sample')
         
     except Exception as e:
         logger.error(f"Error generating sample data: {e}")
@@ -274,42 +317,31 @@ def generate_sample_data():
         ]
         return pd.DataFrame(columns=columns)
 
-def get_data_from_csv(filepath=None):
+def get_data_from_csv(filepath=None, full_history=True):
     """
     Fallback function to load data from CSV when database connection is not available
     
     Args:
-        filepath (str, optional): Path to CSV file. If None, looks for most recent flow_data_*.csv
+        filepath (str, optional): Path to CSV file. If None, loads the exported history
+        full_history (bool): When no filepath is given, ingest every flow_data_*.csv
+            export incrementally instead of reading only the most recent one
     
     Returns:
         pandas.DataFrame: Data loaded from CSV file
     """
     try:
         if filepath is None:
-            # Look for CSV files in multiple possible locations
-            csv_files = []
-            search_paths = ['.', './data', 'data']
+            # Merge the whole export history when the columnar cache is usable
+            if full_history and PARQUET_AVAILABLE:
+                try:
+                    df = ingest_csv_exports(CSV_SEARCH_PATHS)
+                    if not df.empty:
+                        return stamp_freshness(df, 'csv')
+                except Exception as e:
+                    logger.warning(f"Incremental CSV ingestion failed: {e}. Reading most recent file only.")
             
-            for path in search_paths:
-                if os.path.exists(path):
-                    logger.info(f"Searching for CSV files in '{path}'")
-                    try:
-                        # Try using Path for more robust file finding
-                        path_obj = Path(path)
-                        csv_files.extend([str(f) for f in path_obj.glob('flow_data_*.csv')])
-                    except Exception as e:
-                        logger.warning(f"Error searching path '{path}': {e}")
-                        
-                        # Fallback to os.listdir if Path.glob fails
-                        try:
-                            matching_files = [
-                                os.path.join(path, f) 
-                                for f in os.listdir(path) 
-                                if f.startswith('flow_data_') and f.endswith('.csv')
-                            ]
-                            csv_files.extend(matching_files)
-                        except Exception as list_err:
-                            logger.warning(f"Error listing files in '{path}': {list_err}")
+            # Look for CSV files in multiple possible locations
+            csv_files = find_csv_exports(CSV_SEARCH_PATHS)
             
             if not csv_files:
                 # Generate sample data if no CSV files found
@@ -322,20 +354,10 @@ def get_data_from_csv(filepath=None):
         
         # Load the CSV file with explicit error handling
         try:
-            df = pd.read_csv(filepath)
-            
-            # Ensure wassuccessful column exists
-            if 'wassuccessful' not in df.columns and 'taskstatus' in df.columns:
-                df['wassuccessful'] = df['taskstatus'].apply(
-                    lambda x: 1 if x == 'Succeeded' else 0
-                )
-            
-            # Ensure datetimestarted is datetime
-            if 'datetimestarted' in df.columns:
-                df['datetimestarted'] = pd.to_datetime(df['datetimestarted'], errors='coerce')
+            df = read_flow_csv(filepath)
             
             logger.info(f"Successfully loaded {len(df)} records from CSV")
-            return df
+            return stamp_freshness(df, 'csv')
             
         except pd.errors.EmptyDataError:
             logger.error(f"CSV file '{filepath}' is empty")
@@ -350,18 +372,161 @@ def get_data_from_csv(filepath=None):
         logger.debug(traceback.format_exc())
         return pd.DataFrame()  # Return empty DataFrame on error
 
-def get_flow_data(use_csv=False):
+def get_stored_flow_data(days: int = STORE_HISTORY_DAYS) -> pd.DataFrame:
+    """
+    Load recent runs from the local run history store
+    
+    Args:
+        days (int): Number of days of history to load, ending today
+    
+    Returns:
+        pandas.DataFrame: Stored runs (empty if the store has none)
+    """
+    try:
+        started = time.perf_counter()
+        df = read_runs(start_date=datetime.now().date() - timedelta(days=days))
+        return stamp_freshness(df, 'store', query_seconds=time.perf_counter() - started)
+    except Exception as e:
+        logger.warning(f"Error reading run history store: {e}")
+        return pd.DataFrame()
+
+def read_query(query: str, params=None) -> pd.DataFrame:
+    """
+    Run a query on a new database connection and return its rows
+    
+    Args:
+        query (str): SQL query
+        params: Optional query parameters
+    
+    Returns:
+        pandas.DataFrame: Query result with the cursor's column names
+    
+    Raises:
+        Exception: If the connection or query fails
+    """
+    connection = create_db_connection()
+    try:
+        cursor = execute_query(connection, query, params)
+        columns = [column[0] for column in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+    finally:
+        # Close connection
+        connection.close()
+
+def fetch_flow_data_from_database(query: str) -> pd.DataFrame:
+    """
+    Run a flow run query against the database and write the result through to the store
+    
+    Args:
+        query (str): SQL query returning flow run rows
+    
+    Returns:
+        pandas.DataFrame: Query result
+    
+    Raises:
+        Exception: If the connection or query fails
+    """
+    started = time.perf_counter()
+    df = apply_run_schema(read_query(query))
+    query_seconds = time.perf_counter() - started
+    logger.info(f"Successfully retrieved {len(df)} records from database in {query_seconds:.2f}s")
+    stamp_freshness(df, 'database', query_seconds=query_seconds)
+    
+    # Write through to the local run history store
+    try:
+        write_runs(df)
+        apply_retention(compact=False)
+    except Exception as store_err:
+        logger.warning(f"Could not update run history store: {store_err}")
+    
+    return df
+
+def get_flow_sources():
+    """
+    Get the configured flow run sources from Streamlit secrets or the sources file
+    
+    Returns:
+        list: FlowSource objects (empty when only the default database is used)
+    """
+    if STREAMLIT_AVAILABLE:
+        try:
+            if hasattr(st, 'secrets') and 'flow_sources' in st.secrets:
+                logger.info("Using Streamlit secrets for flow sources")
+                return load_sources([dict(entry) for entry in st.secrets['flow_sources']])
+        except Exception as e:
+            logger.warning(f"Error accessing Streamlit secrets: {e}")
+    return load_sources()
+
+def get_source_status(df) -> List[Dict[str, Any]]:
+    """
+    Get the per-source results of the multi-source fetch that produced the data
+    
+    The statuses travel with the data in df.attrs, so a cached result shown
+    by any worker reports the failures of the fetch it came from.
+    
+    Args:
+        df (pandas.DataFrame): Loaded flow data
+    
+    Returns:
+        list: Status dicts with source, ok, rows, latency_seconds and error
+    """
+    return get_source_statuses(df)
+
+def fetch_flow_data_from_sources(sources) -> pd.DataFrame:
+    """
+    Query every configured source concurrently and write the merged runs through to the store
+    
+    Args:
+        sources (list): FlowSource objects
+    
+    Returns:
+        pandas.DataFrame: Runs of every source that answered, with a source column
+    
+    Raises:
+        RuntimeError: If no source answered
+    """
+    started = time.perf_counter()
+    df, statuses = fetch_all_sources(sources)
+    query_seconds = time.perf_counter() - started
+    if not any(status['ok'] for status in statuses):
+        raise RuntimeError("All flow sources failed: " + "; ".join(
+            f"{status['source']}: {status['error']}" for status in statuses))
+    
+    df = stamp_freshness(apply_run_schema(df), 'sources', query_seconds=query_seconds)
+    df.attrs.pop(SOURCE_STATUS_ATTR, None)
+    try:
+        write_runs(df)
+        apply_retention(compact=False)
+    except Exception as store_err:
+        logger.warning(f"Could not update run history store: {store_err}")
+    
+    # Statuses are kept with the result (and its cache entry), not in the run store
+    df.attrs[SOURCE_STATUS_ATTR] = statuses
+    return df
+
+def get_flow_data(use_csv=False, use_store=False, refresh=False):
     """
-    Get flow data from either database, CSV, or generate sample data
+    Get flow data from either database, local history store, CSV, or generate sample data
+    
+    Database results are cached on disk by query fingerprint, so restarts and
+    other worker processes reuse a fresh result instead of repeating the
+    query. Successful database fetches are also written through to the local
+    run history store, which then serves as the first fallback when the
+    database is down. When several sources are configured (see
+    get_flow_sources) they are queried concurrently and merged, and a failing
+    source only drops its own rows.
     
     Args:
         use_csv (bool): Force using CSV instead of database
+        use_store (bool): Serve the local run history store without querying
+            the database when it has data (fast cold start)
+        refresh (bool): Bypass the query result cache and query the database
     
     Returns:
         pandas.DataFrame: Flow data from one of the available sources
     """
-    # If ODBC driver isn't available or CSV is specifically requested, use CSV
-    if use_csv or not ODBC_AVAILABLE:
+    # If CSV is specifically requested, use CSV
+    if use_csv:
         logger.info("Using CSV data source")
         df = get_data_from_csv()
         if not df.empty:
@@ -370,51 +535,111 @@ def get_flow_data(use_csv=False):
             logger.info("No CSV data available. Using sample data.")
             return generate_sample_data()
     
+    sources = get_flow_sources()
+    database_available = ODBC_AVAILABLE or bool(sources)
+    
+    # Serve the local store directly when requested or when no driver is available
+    if use_store or not database_available:
+        df = get_stored_flow_data()
+        if not df.empty:
+            logger.info(f"Using {len(df)} runs from local run history store")
+            return df
+        if not database_available:
+            logger.info("Local run history store is empty. Using CSV data source")
+            df = get_data_from_csv()
+            if not df.empty:
+                return df
+            else:
+                logger.info("No CSV data available. Using sample data.")
+                return generate_sample_data()
+    
     try:
-        # Try database connection first
-        connection = create_db_connection()
+        if sources:
+            # One cache entry covers every source; window start parameters are left out so it can be reused.
+            # Results with failed sources only live briefly, so the next fetch retries them
+            fingerprint = query_fingerprint(
+                "\n".join(source.query_and_params()[0] for source in sources),
+                [[source.name, source.server, source.database, list(source.owners)] for source in sources],
+                window=FLOW_RUN_WINDOW
+            )
+            return QUERY_CACHE.get_or_fetch(
+                fingerprint,
+                lambda: fetch_flow_data_from_sources(sources),
+                refresh=refresh,
+                description=f"rpa_FlowRunHistory last month from {len(sources)} sources",
+                ttl_for=partial_result_ttl
+            )
         
-        query = """
-        SELECT
-            FlowGUID as flowguid,
-            FlowName as flowname,
-            CreatedTime as startedon,
-            LastModified as lastmodified,
-            State as state,
-            FlowOwner as flowowner,
-            StartTime as datetimestarted,
-            EndTime as datetimecompleted,
-            TaskStatus as taskstatus,
-            TriggerType as triggertype,
-            CASE WHEN TaskStatus = 'Succeeded' THEN 1 ELSE 0 END as wassuccessful,
-            CASE WHEN TaskStatus = 'Succeeded' THEN 1 ELSE 0 END as finalsuccessful
-        FROM BusinessAnalytics.dbo.rpa_FlowRunHistory
-        WHERE FlowOwner in (
-            'powerautomate', 'powerautomate02 serviceaccount',
-            'powerautomate03 serviceaccount', 'powerautomate04',
-            'powerautomate05', 'powerautomate06', 'powerautomate07',
-            'powerautomate08', 'Ryan Kieselhorst', 'Colin Boyle',
-            'Cheddrick Bagunu', 'Edu Cielo', 'Mohammad Asim'
+        # Serve a cached result of the same query when fresh, otherwise hit the database once
+        fingerprint = query_fingerprint(FLOW_RUN_QUERY, window=FLOW_RUN_WINDOW)
+        return QUERY_CACHE.get_or_fetch(
+            fingerprint,
+            lambda: fetch_flow_data_from_database(FLOW_RUN_QUERY),
+            refresh=refresh,
+            description="rpa_FlowRunHistory last month"
         )
-        AND StartTime >= DATEADD(month, -1, GETDATE())
-        """
-        
-        cursor = execute_query(connection, query)
-        columns = [column[0] for column in cursor.description]
-        data = cursor.fetchall()
-        
-        df = pd.DataFrame.from_records(data, columns=columns)
-        
-        # Close connection
-        connection.close()
-        logger.info(f"Successfully retrieved {len(df)} records from database")
-        
-        return df
         
     except Exception as e:
-        logger.warning(f"Database connection failed: {e}. Falling back to CSV data.")
+        logger.warning(f"Database connection failed: {e}")
+        df = get_stored_flow_data()
+        if not df.empty:
+            logger.info(f"Using {len(df)} runs from local run history store")
+            return df
+        logger.info("Local run history store is empty. Falling back to CSV data.")
         return get_data_from_csv()
 
+def get_hourly_aggregates(selected_date, refresh=False) -> pd.DataFrame:
+    """
+    Get one day's hourly matrix cells aggregated by the database
+    
+    Only per-status counts per flow and hour are transferred, with the
+    highest priority status of each cell already marked (see
+    build_hourly_aggregate_query). Results are cached like raw queries.
+    
+    Args:
+        selected_date (date): Day to aggregate
+        refresh (bool): Bypass the query result cache
+    
+    Returns:
+        pandas.DataFrame: AGGREGATE_COLUMNS rows
+    
+    Raises:
+        Exception: If the database is unavailable or the query fails
+    """
+    query = build_hourly_aggregate_query(SQL_DIALECT, len(MONITORED_FLOW_OWNERS))
+    params = hourly_aggregate_params(SQL_DIALECT, MONITORED_FLOW_OWNERS, selected_date)
+    fingerprint = query_fingerprint(query, params, window=str(selected_date))
+    
+    def fetch():
+        df = read_query(query, params)
+        logger.info(f"Retrieved {len(df)} aggregated cells for {selected_date} from database")
+        return df
+    
+    return QUERY_CACHE.get_or_fetch(
+        fingerprint, fetch, refresh=refresh,
+        description=f"rpa_FlowRunHistory hourly aggregates {selected_date}"
+    )
+
+def get_cell_runs(flowowner: str, flowname: str, selected_date, hour: int) -> pd.DataFrame:
+    """
+    Get the raw runs behind one (flow, hour) matrix cell
+    
+    Args:
+        flowowner (str): Flow owner as stored in the database
+        flowname (str): Flow name
+        selected_date (date): Day of the cell
+        hour (int): Hour of the cell (0-23)
+    
+    Returns:
+        pandas.DataFrame: Runs started in that hour, oldest first
+    
+    Raises:
+        Exception: If the database is unavailable or the query fails
+    """
+    query = build_cell_runs_query(SQL_DIALECT)
+    params = cell_runs_params(SQL_DIALECT, flowowner, flowname, selected_date, hour)
+    return apply_run_schema(read_query(query, params))
+
 def test_connection() -> Tuple[bool, str]:
     """
     Test database connection and credentials
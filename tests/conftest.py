@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the Bot Monitoring Dashboard tests
+"""
+
+import os
+import sys
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from load_test import OWNERS, SQLITE_FLOW_RUN_QUERY, build_synthetic_database  # noqa: E402
+
+@pytest.fixture
+def sqlite_source_config(tmp_path):
+    """Factory of SQLite stand-in source configs, each backed by its own synthetic database"""
+    def make(name, flows=10, runs_per_day=100, days=3, seed=0, **overrides):
+        database = tmp_path / f"{name}.db"
+        build_synthetic_database(str(database), flows=flows, runs_per_day=runs_per_day, days=days, seed=seed)
+        config = {'name': name, 'dialect': 'sqlite', 'database': str(database), 'owners': list(OWNERS),
+                  'table': 'rpa_FlowRunHistory'}
+        config.update(overrides)
+        return config
+    return make
+
+@pytest.fixture(scope='module')
+def synthetic_runs(tmp_path_factory):
+    """Raw runs of a synthetic database, as returned by the flow run query"""
+    database = tmp_path_factory.mktemp('runs') / 'runs.db'
+    build_synthetic_database(str(database), flows=40, runs_per_day=400, days=4, seed=3)
+    with sqlite3.connect(database) as connection:
+        return pd.read_sql_query(SQLITE_FLOW_RUN_QUERY, connection)
@@ -0,0 +1,57 @@
+"""
+Equivalence tests of the DuckDB engine against the pandas reference engine
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+pytest.importorskip('duckdb')
+
+from data_processing.engines import DuckDBEngine, PandasEngine, compare_engines  # noqa: E402
+from data_processing.processors import process_data_for_dashboard  # noqa: E402
+
+BUCKETING_MODES = ['start', 'interval']
+NOW = datetime.combine(date.today(), datetime.min.time()) + timedelta(hours=12)  # Shared end of running runs
+
+@pytest.fixture(scope='module')
+def day():
+    return date.today() - timedelta(days=1)
+
+@pytest.fixture(scope='module')
+def filter_sets(synthetic_runs, day):
+    """Single- and multi-value filter combinations that all match runs of the day"""
+    processed = process_data_for_dashboard(synthetic_runs, day_filter=day)
+    projects = processed['automation_project'].value_counts().index[:2].tolist()
+    owners = processed['owner'].value_counts().index[:2].tolist()
+    return [
+        {},
+        {'max_rows': 5},
+        {'selected_project': projects},
+        {'selected_status': ['Failed', 'Running']},
+        {'selected_owner': owners, 'selected_status': ['Succeeded', 'Canceled']},
+        {'selected_project': projects[:1], 'selected_trigger': ['Recurrence', 'Manual']},
+        {'selected_project': projects, 'selected_owner': owners, 'selected_status': ['Failed'],
+         'selected_trigger': ['OtherTrigger', 'Recurrence']},
+    ]
+
+def test_filter_sets_select_runs(synthetic_runs, day, filter_sets):
+    for kwargs in filter_sets:
+        _, display_names, _ = PandasEngine().hourly_matrix(synthetic_runs, day, **kwargs)
+        assert display_names, kwargs
+
+@pytest.mark.parametrize('bucketing', BUCKETING_MODES)
+def test_duckdb_matches_pandas(synthetic_runs, day, filter_sets, bucketing):
+    differences = compare_engines(synthetic_runs, day, filter_sets, bucketing=bucketing, now=NOW,
+                                  engine=DuckDBEngine())
+    assert differences == []
+
+@pytest.mark.parametrize('bucketing', BUCKETING_MODES)
+def test_duckdb_matches_pandas_over_parquet(synthetic_runs, day, filter_sets, bucketing, tmp_path):
+    pytest.importorskip('pyarrow')
+    for run_day, day_runs in synthetic_runs.groupby(synthetic_runs['datetimestarted'].str[:10]):
+        day_runs.to_parquet(tmp_path / f"{run_day}.parquet", index=False)
+
+    differences = compare_engines(str(tmp_path), day, filter_sets[:3], bucketing=bucketing, now=NOW,
+                                  engine=DuckDBEngine())
+    assert differences == []
@@ -0,0 +1,103 @@
+"""
+Tests for concurrent multi-source fetching against SQLite stand-ins
+"""
+
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+import secure_db_connection
+from data_storage.csv_ingest import PARQUET_AVAILABLE
+from data_storage.query_cache import QueryResultCache
+from data_storage.sources import (
+    FAILED_SOURCE_TTL_SECONDS, SOURCE_COLUMN, fetch_all_sources, get_source_statuses, load_sources
+)
+
+# Recursive CTE that keeps SQLite busy for well over the test timeouts
+SLOW_QUERY = """
+    WITH RECURSIVE counter(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM counter WHERE n < 3000000)
+    SELECT count(*) AS n FROM counter
+"""
+
+def row_count(config):
+    with sqlite3.connect(config['database']) as connection:
+        return connection.execute("SELECT count(*) FROM rpa_FlowRunHistory").fetchone()[0]
+
+def test_merges_every_source(sqlite_source_config):
+    prod = sqlite_source_config('prod', seed=1)
+    dev = sqlite_source_config('dev', flows=5, seed=2)
+
+    df, statuses = fetch_all_sources(load_sources([prod, dev]))
+
+    assert [status['source'] for status in statuses] == ['prod', 'dev']
+    assert all(status['ok'] for status in statuses)
+    assert len(df) == row_count(prod) + row_count(dev)
+    assert isinstance(df[SOURCE_COLUMN].dtype, pd.CategoricalDtype)
+    assert df[SOURCE_COLUMN].value_counts().to_dict() == {'prod': row_count(prod), 'dev': row_count(dev)}
+    assert get_source_statuses(df) == statuses
+
+def test_failing_source_only_drops_its_rows(sqlite_source_config):
+    prod = sqlite_source_config('prod', seed=1)
+    broken = sqlite_source_config('broken', seed=2, table='missing_table')
+
+    df, statuses = fetch_all_sources(load_sources([prod, broken]))
+
+    assert statuses[0]['ok'] and not statuses[1]['ok']
+    assert 'missing_table' in statuses[1]['error']
+    assert set(df[SOURCE_COLUMN].unique()) == {'prod'}
+    assert len(df) == row_count(prod)
+
+def test_timed_out_source_is_reported(sqlite_source_config):
+    prod = sqlite_source_config('prod', seed=1)
+    slow = sqlite_source_config('slow', seed=2, query=SLOW_QUERY)
+
+    df, statuses = fetch_all_sources(load_sources([prod, slow]), timeout=0.5)
+
+    assert statuses[0]['ok']
+    assert not statuses[1]['ok'] and 'timed out' in statuses[1]['error']
+    assert set(df[SOURCE_COLUMN].unique()) == {'prod'}
+
+    # Let the abandoned query finish before the test's database is removed
+    for thread in threading.enumerate():
+        if thread.name.startswith('flow-source'):
+            thread.join()
+
+@pytest.fixture
+def sources_backend(tmp_path, monkeypatch):
+    """Route get_flow_data to the given sources with a private query cache and no run store writes"""
+    cache = QueryResultCache(tmp_path / 'queries', ttl_seconds=300)
+    monkeypatch.setattr(secure_db_connection, 'QUERY_CACHE', cache)
+    monkeypatch.setattr(secure_db_connection, 'write_runs', lambda df: None)
+    monkeypatch.setattr(secure_db_connection, 'apply_retention', lambda compact=False: None)
+
+    def use(configs):
+        sources = load_sources(configs)
+        monkeypatch.setattr(secure_db_connection, 'get_flow_sources', lambda: sources)
+        return cache
+    return use
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="query cache needs pyarrow")
+def test_cached_result_keeps_source_statuses(sqlite_source_config, sources_backend):
+    sources_backend([sqlite_source_config('prod', seed=1), sqlite_source_config('dev', seed=2)])
+
+    fetched = secure_db_connection.get_flow_data(refresh=True)
+    cached = secure_db_connection.get_flow_data()
+
+    assert len(cached) == len(fetched)
+    assert [status['source'] for status in secure_db_connection.get_source_status(cached)] == ['prod', 'dev']
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="query cache needs pyarrow")
+def test_partial_result_is_cached_briefly(sqlite_source_config, sources_backend):
+    cache = sources_backend([sqlite_source_config('prod', seed=1),
+                             sqlite_source_config('broken', seed=2, table='missing_table')])
+
+    fetched = secure_db_connection.get_flow_data(refresh=True)
+    cached = secure_db_connection.get_flow_data()
+
+    assert set(fetched[SOURCE_COLUMN].unique()) == {'prod'}
+    statuses = secure_db_connection.get_source_status(cached)
+    assert [status['ok'] for status in statuses] == [True, False]
+    meta = [pd.read_json(path, typ='series') for path in cache.cache_dir.glob('*.json')]
+    assert [entry['ttl'] for entry in meta] == [FAILED_SOURCE_TTL_SECONDS]